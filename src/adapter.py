@@ -1,5 +1,7 @@
 from abc import ABCMeta, abstractmethod
 
+import numpy as np
+
 from .algorithm import AlgorithmData
 from .algorithm.interface import AlgorithmFactory
 
@@ -14,6 +16,43 @@ class Adapter(metaclass=ABCMeta):
         pass
 
 
+class AdapterRegistry:
+    __adapter_types: dict[str, type[Adapter]] = {}
+    __adapters: dict[str, Adapter] = {}
+    __factories: dict[str, AlgorithmFactory] = {}
+
+    @staticmethod
+    def register(device_type: str):
+        def decorator(adapter_type: type[Adapter]) -> type[Adapter]:
+            AdapterRegistry.__adapter_types[device_type] = adapter_type
+            AdapterRegistry.__adapters.pop(device_type, None)
+            AdapterRegistry.__factories.pop(device_type, None)
+            return adapter_type
+
+        return decorator
+
+    @staticmethod
+    def get_adapter(device_type: str) -> Adapter:
+        if device_type not in AdapterRegistry.__adapters:
+            if device_type not in AdapterRegistry.__adapter_types:
+                raise ValueError("Unknown device type")
+            adapter = AdapterRegistry.__adapter_types[device_type]()
+            AdapterRegistry.__adapters[device_type] = adapter
+        return AdapterRegistry.__adapters[device_type]
+
+    @staticmethod
+    def get_algorithm_factory(device_type: str) -> AlgorithmFactory:
+        if device_type not in AdapterRegistry.__factories:
+            adapter = AdapterRegistry.get_adapter(device_type)
+            AdapterRegistry.__factories[device_type] = adapter.get_algorithm_factory()
+        return AdapterRegistry.__factories[device_type]
+
+    @staticmethod
+    def get_device_types() -> list[str]:
+        return list(AdapterRegistry.__adapter_types.keys())
+
+
+@AdapterRegistry.register("Test")
 class TestAdapter(Adapter):
     def get_algorithm_data(self, msg: dict) -> AlgorithmData:
         return AlgorithmData(cfg=msg["cfg"], data=msg["data"])
@@ -24,23 +63,30 @@ class TestAdapter(Adapter):
         return TestDeviceAlgorithmFactory()
 
 
+@AdapterRegistry.register("ICM20948")
 class ICM20948Adapter(Adapter):
-    def get_algorithm_data(self, msg: dict) -> AlgorithmData:
-        def convert_from_hex(hex_str: str) -> list[int]:
-            byte_array = bytearray.fromhex(hex_str)
-            return [
-                int.from_bytes(byte_array[i : i + 4], "little")
-                for i in range(0, len(byte_array), 4)
-            ]
+    __dtype: np.dtype
+
+    def __init__(self, word_size: int = 4, signed: bool = False):
+        kind = "i" if signed else "u"
+        self.__dtype = np.dtype(f"<{kind}{word_size}")
 
+    def get_algorithm_data(self, msg: dict) -> AlgorithmData:
         cfg = {
             "accelerate_range": msg["acc_range"],
             "sample_rate": msg["acc_sample_rate"],
             "sample_dots": msg["acc_sample_dots"],
         }
-        data = {"data": convert_from_hex(msg["data"])}
+        data = {"data": self.convert_data(msg["data"])}
         return AlgorithmData(cfg=cfg, data=data)
 
+    def convert_data(self, data: str | bytes | np.ndarray) -> np.ndarray:
+        if isinstance(data, np.ndarray):
+            return data
+        if isinstance(data, str):
+            data = bytes.fromhex(data)
+        return np.frombuffer(data, dtype=self.__dtype)
+
     def get_algorithm_factory(self) -> AlgorithmFactory:
         from .algorithm.device.icm20948 import ICM20948AlgorithmFactory
 
@@ -50,9 +96,8 @@ class ICM20948Adapter(Adapter):
 class AdapterFactory:
     @staticmethod
     def get_adapter(device_type: str) -> Adapter:
-        if device_type == "Test":
-            return TestAdapter()
-        if device_type == "ICM20948":
-            return ICM20948Adapter()
-        else:
-            raise ValueError("Unknown device type")
+        return AdapterRegistry.get_adapter(device_type)
+
+    @staticmethod
+    def get_algorithm_factory(device_type: str) -> AlgorithmFactory:
+        return AdapterRegistry.get_algorithm_factory(device_type)
@@ -1,4 +1,25 @@
-from .interface import Algorithm
-from .algorithm_data import AlgorithmData, AlgorithmResult
+from .interface import Algorithm, IncrementalAlgorithm, SolverBackend
+from .composite import CompositeAlgorithm
+from .pipeline import Pipeline, PipelineAlgorithm, PipelineFrame
+from .algorithm_data import (
+    AlgorithmData,
+    AlgorithmResult,
+    PlotData,
+    PlotLayout,
+    RasterFigure,
+)
 
-__all__ = ["Algorithm", "AlgorithmData", "AlgorithmResult"]
+__all__ = [
+    "Algorithm",
+    "AlgorithmData",
+    "AlgorithmResult",
+    "CompositeAlgorithm",
+    "IncrementalAlgorithm",
+    "Pipeline",
+    "PipelineAlgorithm",
+    "PipelineFrame",
+    "PlotData",
+    "PlotLayout",
+    "RasterFigure",
+    "SolverBackend",
+]
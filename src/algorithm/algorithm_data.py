@@ -1,4 +1,6 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+import numpy as np
 from matplotlib.figure import Figure
 
 
@@ -6,9 +8,39 @@ from matplotlib.figure import Figure
 class AlgorithmData:
     cfg: dict
     data: dict
+    # samples received before the end of this window, for streamed data
+    sequence: int | None = None
+
+
+@dataclass
+class RasterFigure:
+    format: str
+    width: int
+    height: int
+    data: bytes
+
+
+@dataclass(frozen=True)
+class PlotLayout:
+    title: str = ""
+    xlabel: str = ""
+    ylabel: str = ""
+    xlim: tuple[float, float] | None = None
+    ylim: tuple[float, float] | None = None
+    lines: tuple[str, ...] = ()
+    image: bool = False
+    image_extent: tuple[float, float, float, float] | None = None
+    image_clim: tuple[float, float] | None = None
+    image_cmap: str = "viridis"
+
+
+@dataclass
+class PlotData:
+    lines: list[tuple[np.ndarray, np.ndarray]] = field(default_factory=list)
+    image: np.ndarray | None = None
 
 
 @dataclass
 class AlgorithmResult:
-    figure_map: dict[str, Figure]
+    figure_map: dict[str, Figure | RasterFigure | PlotData]
     text: str
@@ -0,0 +1,70 @@
+from .algorithm_data import AlgorithmData, AlgorithmResult, PlotLayout
+from .interface import Algorithm, IncrementalAlgorithm, SolverBackend
+from .param import Param
+from .pipeline import PipelineAlgorithm, PipelineFrame
+
+
+class CompositeAlgorithm(Algorithm):
+    # params and figures of each algorithm are prefixed with "<name>."
+    __algorithms: dict[str, Algorithm]
+
+    def __init__(self, algorithms: dict[str, Algorithm]):
+        for name, algorithm in algorithms.items():
+            if isinstance(algorithm, IncrementalAlgorithm):
+                raise ValueError(f"Incremental algorithm {name} cannot be composed")
+        self.__algorithms = dict(algorithms)
+
+    def solve(self, data: AlgorithmData, params: dict[str, Param]) -> AlgorithmResult:
+        # algorithms on the same pipeline share the stage outputs of this frame
+        frames: dict[int, PipelineFrame] = {}
+        figure_map = {}
+        texts = []
+        for name, algorithm in self.__algorithms.items():
+            algorithm_params = self.__get_params(name, params)
+            if isinstance(algorithm, PipelineAlgorithm):
+                pipeline = algorithm.get_pipeline()
+                if id(pipeline) not in frames:
+                    frames[id(pipeline)] = pipeline.get_frame(data)
+                frame = frames[id(pipeline)].restrict(algorithm.get_stages())
+                result = algorithm.solve_frame(frame, algorithm_params)
+            else:
+                result = algorithm.solve(data, algorithm_params)
+            for figure_name, figure in result.figure_map.items():
+                figure_map[f"{name}.{figure_name}"] = figure
+            if result.text:
+                texts.append(f"{name}: {result.text}")
+        return AlgorithmResult(figure_map, "\n".join(texts))
+
+    def get_default_params(self) -> dict[str, Param]:
+        return {
+            f"{name}.{param_name}": param
+            for name, algorithm in self.__algorithms.items()
+            for param_name, param in algorithm.get_default_params().items()
+        }
+
+    def get_backend(self) -> SolverBackend | None:
+        backends = {algorithm.get_backend() for algorithm in self.__algorithms.values()}
+        if SolverBackend.PROCESS in backends:
+            return SolverBackend.PROCESS
+        if SolverBackend.THREAD in backends:
+            return SolverBackend.THREAD
+        return None
+
+    def get_plot_layouts(self) -> dict[str, PlotLayout]:
+        return {
+            f"{name}.{figure_name}": layout
+            for name, algorithm in self.__algorithms.items()
+            for figure_name, layout in algorithm.get_plot_layouts().items()
+        }
+
+    def get_algorithms(self) -> dict[str, Algorithm]:
+        return dict(self.__algorithms)
+
+    @staticmethod
+    def __get_params(name: str, params: dict[str, Param]) -> dict[str, Param]:
+        prefix = f"{name}."
+        return {
+            param_name[len(prefix) :]: param
+            for param_name, param in params.items()
+            if param_name.startswith(prefix)
+        }
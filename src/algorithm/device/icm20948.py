@@ -1,7 +1,35 @@
 from dataclasses import asdict
 
-from ..algorithm_data import AlgorithmData, AlgorithmResult
-from ..interface import Algorithm, AlgorithmError, AlgorithmFactory
+import numpy as np
+
+from ..algorithm_data import AlgorithmData, AlgorithmResult, PlotData, PlotLayout
+from ..composite import CompositeAlgorithm
+from ..dsp import (
+    FAULTS,
+    WINDOWS,
+    BearingGeometry,
+    RunningMoments,
+    SignalStatistics,
+    get_amplitude_spectrum,
+    get_band_energy,
+    get_envelope,
+    get_fault_band_index,
+    get_frequencies,
+    get_magnitude,
+    get_moment_statistics,
+    get_power_spectrum,
+    get_running_moments,
+    get_spectrum_scale,
+    get_statistics,
+    merge_running_moments,
+)
+from ..interface import (
+    Algorithm,
+    AlgorithmError,
+    AlgorithmFactory,
+    IncrementalAlgorithm,
+)
+from ..pipeline import Pipeline, PipelineAlgorithm, PipelineFrame
 from ..param import (
     FloatType,
     IntType,
@@ -45,14 +73,457 @@ class ICM20948TestAlgorithm(Algorithm):
         }
 
 
+# full scale of the 16 bit accelerometer output
+ADC_FULL_SCALE = 2**15
+
+
+def get_acceleration(data: AlgorithmData, min_samples: int = 2) -> np.ndarray:
+    samples = data.data["data"]
+    if samples.ndim != 1 or len(samples) < min_samples:
+        raise AlgorithmError(f"At least {min_samples} samples are required")
+    if samples.dtype.kind == "u":
+        # the sensor outputs 16 bit two's complement, keep the low half word
+        samples = samples.astype(np.uint16).view(np.int16)
+    acceleration = samples.astype(np.float64)
+    accelerate_range = data.cfg.get("accelerate_range")
+    if isinstance(accelerate_range, (int, float)) and accelerate_range > 0:
+        acceleration *= accelerate_range / ADC_FULL_SCALE
+    return acceleration
+
+
+def get_sample_rate(data: AlgorithmData) -> float:
+    sample_rate = float(data.cfg.get("sample_rate") or 0)
+    if sample_rate <= 0:
+        raise AlgorithmError("Invalid sample rate")
+    return sample_rate
+
+
+def get_frequency_param(value: float) -> Param:
+    return Param(
+        type=FloatType(),
+        value=value,
+        checkers=[RangeChecker(min=0, max=100_000, left_open=True)],
+    )
+
+
+def get_window_param() -> Param:
+    return Param(type=StrType(), value="hann", checkers=[SpecificChecker(WINDOWS)])
+
+
+PIPELINE = Pipeline()
+
+
+@PIPELINE.stage("acceleration")
+def _acceleration_stage(frame: PipelineFrame) -> np.ndarray:
+    return get_acceleration(frame.data)
+
+
+@PIPELINE.stage("sample_rate")
+def _sample_rate_stage(frame: PipelineFrame) -> float:
+    return get_sample_rate(frame.data)
+
+
+@PIPELINE.stage("magnitude")
+def _magnitude_stage(frame: PipelineFrame, window: str) -> np.ndarray:
+    return get_magnitude(frame.get("acceleration"), window)
+
+
+@PIPELINE.stage("amplitude_spectrum")
+def _amplitude_spectrum_stage(
+    frame: PipelineFrame, window: str
+) -> tuple[np.ndarray, np.ndarray]:
+    magnitude = frame.get("magnitude", window=window)
+    length = len(frame.get("acceleration"))
+    return (
+        get_frequencies(length, frame.get("sample_rate")),
+        magnitude * get_spectrum_scale(window, length),
+    )
+
+
+@PIPELINE.stage("power_spectrum")
+def _power_spectrum_stage(
+    frame: PipelineFrame, window: str
+) -> tuple[np.ndarray, np.ndarray]:
+    magnitude = frame.get("magnitude", window=window)
+    length = len(frame.get("acceleration"))
+    return (
+        get_frequencies(length, frame.get("sample_rate")),
+        np.square(magnitude) * get_spectrum_scale(window, length, power=True),
+    )
+
+
+@PIPELINE.stage("envelope")
+def _envelope_stage(frame: PipelineFrame, band: tuple[float, float]) -> np.ndarray:
+    acceleration = frame.get("acceleration")
+    return get_envelope(
+        acceleration - acceleration.mean(), frame.get("sample_rate"), band
+    )
+
+
+@PIPELINE.stage("envelope_amplitude_spectrum")
+def _envelope_amplitude_spectrum_stage(
+    frame: PipelineFrame, band: tuple[float, float], window: str
+) -> tuple[np.ndarray, np.ndarray]:
+    return get_amplitude_spectrum(
+        frame.get("envelope", band=band), frame.get("sample_rate"), window
+    )
+
+
+@PIPELINE.stage("envelope_power_spectrum")
+def _envelope_power_spectrum_stage(
+    frame: PipelineFrame, band: tuple[float, float], window: str
+) -> tuple[np.ndarray, np.ndarray]:
+    return get_power_spectrum(
+        frame.get("envelope", band=band), frame.get("sample_rate"), window
+    )
+
+
+@PIPELINE.stage("statistics")
+def _statistics_stage(frame: PipelineFrame) -> SignalStatistics:
+    return get_statistics(frame.get("acceleration"))
+
+
+def get_band_param(params: dict[str, Param]) -> tuple[float, float]:
+    band = (params["band_low"].get_value(), params["band_high"].get_value())
+    if band[0] >= band[1]:
+        raise AlgorithmError("band_low must be lower than band_high")
+    return band
+
+
+class ICM20948PipelineAlgorithm(PipelineAlgorithm):
+    def get_pipeline(self) -> Pipeline:
+        return PIPELINE
+
+
+class ICM20948SpectrumAlgorithm(ICM20948PipelineAlgorithm):
+    def get_stages(self) -> set[str]:
+        return {"amplitude_spectrum"}
+
+    def solve_frame(
+        self, frame: PipelineFrame, params: dict[str, Param]
+    ) -> AlgorithmResult:
+        frequencies, amplitude = frame.get(
+            "amplitude_spectrum", window=params["window"].get_value()
+        )
+        end = np.searchsorted(frequencies, params["max_frequency"].get_value(), "right")
+        frequencies, amplitude = frequencies[:end], amplitude[:end]
+        peak = amplitude[1:].argmax() + 1 if end > 1 else 0
+        return AlgorithmResult(
+            {"spectrum": PlotData(lines=[(frequencies, amplitude)])},
+            f"Peak: {amplitude[peak]:.4g} g at {frequencies[peak]:.1f} Hz",
+        )
+
+    def get_default_params(self) -> dict[str, Param]:
+        return {
+            "window": get_window_param(),
+            "max_frequency": get_frequency_param(2000.0),
+        }
+
+    def get_plot_layouts(self) -> dict[str, PlotLayout]:
+        return {
+            "spectrum": PlotLayout(
+                title="Amplitude spectrum",
+                xlabel="Frequency (Hz)",
+                ylabel="Amplitude (g)",
+                lines=("amplitude",),
+            )
+        }
+
+
+class ICM20948EnvelopeAlgorithm(ICM20948PipelineAlgorithm):
+    def get_stages(self) -> set[str]:
+        return {"envelope_amplitude_spectrum"}
+
+    def solve_frame(
+        self, frame: PipelineFrame, params: dict[str, Param]
+    ) -> AlgorithmResult:
+        frequencies, amplitude = frame.get(
+            "envelope_amplitude_spectrum",
+            band=get_band_param(params),
+            window=params["window"].get_value(),
+        )
+        end = np.searchsorted(frequencies, params["max_frequency"].get_value(), "right")
+        frequencies, amplitude = frequencies[:end], amplitude[:end]
+        peak = amplitude[1:].argmax() + 1 if end > 1 else 0
+        return AlgorithmResult(
+            {"envelope_spectrum": PlotData(lines=[(frequencies, amplitude)])},
+            f"Envelope peak: {amplitude[peak]:.4g} g at {frequencies[peak]:.1f} Hz",
+        )
+
+    def get_default_params(self) -> dict[str, Param]:
+        return {
+            "band_low": get_frequency_param(500.0),
+            "band_high": get_frequency_param(2000.0),
+            "window": get_window_param(),
+            "max_frequency": get_frequency_param(500.0),
+        }
+
+    def get_plot_layouts(self) -> dict[str, PlotLayout]:
+        return {
+            "envelope_spectrum": PlotLayout(
+                title="Envelope spectrum",
+                xlabel="Frequency (Hz)",
+                ylabel="Amplitude (g)",
+                lines=("envelope",),
+            )
+        }
+
+
+class ICM20948StatisticsAlgorithm(ICM20948PipelineAlgorithm):
+    def get_stages(self) -> set[str]:
+        return {"statistics"}
+
+    def solve_frame(
+        self, frame: PipelineFrame, params: dict[str, Param]
+    ) -> AlgorithmResult:
+        return self.__get_result(frame.get("statistics"), 0)
+
+    def solve_batch(
+        self, data: list[AlgorithmData], params: dict[str, Param]
+    ) -> list[AlgorithmResult]:
+        statistics = get_statistics(np.stack([get_acceleration(item) for item in data]))
+        return [self.__get_result(statistics, i) for i in range(len(data))]
+
+    def get_default_params(self) -> dict[str, Param]:
+        return {}
+
+    def get_batch_size(self) -> int:
+        return 64
+
+    @staticmethod
+    def __get_result(statistics: SignalStatistics, i: int) -> AlgorithmResult:
+        return AlgorithmResult({}, _get_statistics_text(statistics, i))
+
+
+class ICM20948RunningStatisticsAlgorithm(IncrementalAlgorithm):
+    # statistics of every sample since the state was reset, not only the window
+    def init_state(self, params: dict[str, Param]) -> RunningMoments | None:
+        return None
+
+    def update(
+        self,
+        state: RunningMoments | None,
+        chunk: AlgorithmData,
+        params: dict[str, Param],
+    ) -> RunningMoments | None:
+        if len(chunk.data["data"]) == 0:
+            return state
+        moments = get_running_moments(get_acceleration(chunk, min_samples=1))
+        return moments if state is None else merge_running_moments(state, moments)
+
+    def render(
+        self, state: RunningMoments | None, params: dict[str, Param]
+    ) -> AlgorithmResult:
+        if state is None or state.count < 2:
+            raise AlgorithmError("At least 2 samples are required")
+        text = _get_statistics_text(get_moment_statistics(state), 0)
+        return AlgorithmResult({}, f"Samples: {state.count}, {text}")
+
+    def get_default_params(self) -> dict[str, Param]:
+        return {}
+
+
+def _get_statistics_text(statistics: SignalStatistics, i: int) -> str:
+    # a single frame has scalar statistics
+    rms, peak, crest_factor, kurtosis = (
+        np.atleast_1d(value)[i]
+        for value in (
+            statistics.rms,
+            statistics.peak,
+            statistics.crest_factor,
+            statistics.kurtosis,
+        )
+    )
+    return (
+        f"RMS: {rms:.4g} g, peak: {peak:.4g} g, "
+        f"crest factor: {crest_factor:.3f}, kurtosis: {kurtosis:.3f}"
+    )
+
+
+class ICM20948BandEnergyAlgorithm(ICM20948PipelineAlgorithm):
+    def get_stages(self) -> set[str]:
+        return {"power_spectrum"}
+
+    def solve_frame(
+        self, frame: PipelineFrame, params: dict[str, Param]
+    ) -> AlgorithmResult:
+        frequencies, power = frame.get(
+            "power_spectrum", window=params["window"].get_value()
+        )
+        max_frequency = min(params["max_frequency"].get_value(), frequencies[-1])
+        edges = np.linspace(0, max_frequency, params["bands"].get_value() + 1)
+        band_rms = np.sqrt(get_band_energy(frequencies, power, edges))
+        centers = (edges[:-1] + edges[1:]) / 2
+        text = ", ".join(
+            f"{low:.0f}-{high:.0f} Hz: {rms:.4g} g"
+            for low, high, rms in zip(edges[:-1], edges[1:], band_rms)
+        )
+        return AlgorithmResult(
+            {"band_rms": PlotData(lines=[(centers, band_rms)])}, f"Band RMS: {text}"
+        )
+
+    def get_default_params(self) -> dict[str, Param]:
+        return {
+            "bands": Param(
+                type=IntType(),
+                value=8,
+                checkers=[RangeChecker(min=1, max=64)],
+            ),
+            "window": get_window_param(),
+            "max_frequency": get_frequency_param(2000.0),
+        }
+
+    def get_plot_layouts(self) -> dict[str, PlotLayout]:
+        return {
+            "band_rms": PlotLayout(
+                title="Band RMS",
+                xlabel="Band center (Hz)",
+                ylabel="RMS (g)",
+                lines=("rms",),
+            )
+        }
+
+
+class ICM20948BearingAlgorithm(ICM20948PipelineAlgorithm):
+    def get_stages(self) -> set[str]:
+        return {"acceleration", "sample_rate", "envelope_power_spectrum"}
+
+    def solve_frame(
+        self, frame: PipelineFrame, params: dict[str, Param]
+    ) -> AlgorithmResult:
+        geometry = BearingGeometry(
+            ball_count=params["ball_count"].get_value(),
+            ball_diameter=params["ball_diameter"].get_value(),
+            pitch_diameter=params["pitch_diameter"].get_value(),
+            contact_angle=params["contact_angle"].get_value(),
+        )
+        if geometry.ball_diameter >= geometry.pitch_diameter:
+            raise AlgorithmError("ball_diameter must be smaller than pitch_diameter")
+
+        frequencies, power = frame.get(
+            "envelope_power_spectrum", band=get_band_param(params), window="hann"
+        )
+        index = get_fault_band_index(
+            geometry,
+            params["rpm"].get_value(),
+            frame.get("sample_rate"),
+            len(frame.get("acceleration")),
+            params["harmonics"].get_value(),
+            params["sidebands"].get_value(),
+            params["bandwidth"].get_value(),
+        )
+        fault_rms = np.sqrt(index.get_fault_energy(power))
+
+        end = np.searchsorted(frequencies, params["max_frequency"].get_value(), "right")
+        text = ", ".join(
+            f"{fault} {index.frequencies.get(fault):.1f} Hz: {rms:.4g} g"
+            for fault, rms in zip(FAULTS, fault_rms)
+        )
+        return AlgorithmResult(
+            {
+                "envelope_spectrum": PlotData(
+                    lines=[(frequencies[:end], np.sqrt(power[:end]))]
+                )
+            },
+            f"Fault band RMS: {text}",
+        )
+
+    def get_default_params(self) -> dict[str, Param]:
+        # a 6205 deep groove ball bearing at 1800 rpm
+        return {
+            "rpm": get_frequency_param(1800.0),
+            "ball_count": Param(
+                type=IntType(),
+                value=9,
+                checkers=[RangeChecker(min=3, max=100)],
+            ),
+            "ball_diameter": Param(
+                type=FloatType(),
+                value=7.94,
+                checkers=[RangeChecker(min=0, max=1000, left_open=True)],
+            ),
+            "pitch_diameter": Param(
+                type=FloatType(),
+                value=39.04,
+                checkers=[RangeChecker(min=0, max=10_000, left_open=True)],
+            ),
+            "contact_angle": Param(
+                type=FloatType(),
+                value=0.0,
+                checkers=[RangeChecker(min=0, max=90, right_open=True)],
+            ),
+            "harmonics": Param(
+                type=IntType(),
+                value=3,
+                checkers=[RangeChecker(min=1, max=20)],
+            ),
+            "sidebands": Param(
+                type=IntType(),
+                value=1,
+                checkers=[RangeChecker(min=0, max=10)],
+            ),
+            "bandwidth": get_frequency_param(2.0),
+            "band_low": get_frequency_param(500.0),
+            "band_high": get_frequency_param(2000.0),
+            "max_frequency": get_frequency_param(500.0),
+        }
+
+    def get_plot_layouts(self) -> dict[str, PlotLayout]:
+        return {
+            "envelope_spectrum": PlotLayout(
+                title="Envelope spectrum",
+                xlabel="Frequency (Hz)",
+                ylabel="RMS (g)",
+                lines=("envelope",),
+            )
+        }
+
+
+class ICM20948DiagnosticsAlgorithm(CompositeAlgorithm):
+    def __init__(self):
+        super().__init__(
+            {
+                "spectrum": ICM20948SpectrumAlgorithm(),
+                "envelope": ICM20948EnvelopeAlgorithm(),
+                "statistics": ICM20948StatisticsAlgorithm(),
+                "band_energy": ICM20948BandEnergyAlgorithm(),
+                "bearing": ICM20948BearingAlgorithm(),
+            }
+        )
+
+
 class ICM20948AlgorithmFactory(AlgorithmFactory):
     @staticmethod
     def get_algorithm(algorithm_name: str) -> Algorithm:
         if algorithm_name == "Test":
             return ICM20948TestAlgorithm()
+        if algorithm_name == "Spectrum":
+            return ICM20948SpectrumAlgorithm()
+        if algorithm_name == "Envelope":
+            return ICM20948EnvelopeAlgorithm()
+        if algorithm_name == "Statistics":
+            return ICM20948StatisticsAlgorithm()
+        if algorithm_name == "Running Statistics":
+            return ICM20948RunningStatisticsAlgorithm()
+        if algorithm_name == "Band Energy":
+            return ICM20948BandEnergyAlgorithm()
+        if algorithm_name == "Bearing Faults":
+            return ICM20948BearingAlgorithm()
+        if algorithm_name == "Diagnostics":
+            return ICM20948DiagnosticsAlgorithm()
         else:
             raise ValueError("Unknown algorithm name")
 
     @staticmethod
     def get_algorithm_names() -> list[str]:
-        return ["Test"]
+        # the first name is the default of new clients
+        return [
+            "Spectrum",
+            "Envelope",
+            "Statistics",
+            "Running Statistics",
+            "Band Energy",
+            "Bearing Faults",
+            "Diagnostics",
+            "Test",
+        ]
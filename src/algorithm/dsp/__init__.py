@@ -0,0 +1,63 @@
+from .bearing import (
+    FAULTS,
+    BearingGeometry,
+    FaultBandIndex,
+    FaultFrequencies,
+    get_fault_band_index,
+    get_fault_frequencies,
+)
+from .cache import DSPCache, DSPCacheStats, dsp_cache
+from .spectrum import (
+    WINDOWS,
+    get_amplitude_spectrum,
+    get_analytic_gains,
+    get_analytic_signal,
+    get_band_energy,
+    get_band_rms,
+    get_envelope,
+    get_envelope_spectrum,
+    get_frequencies,
+    get_magnitude,
+    get_power_spectrum,
+    get_spectrum_scale,
+    get_window,
+)
+from .statistics import (
+    RunningMoments,
+    SignalStatistics,
+    get_moment_statistics,
+    get_running_moments,
+    get_statistics,
+    merge_running_moments,
+)
+
+__all__ = [
+    "FAULTS",
+    "WINDOWS",
+    "BearingGeometry",
+    "DSPCache",
+    "DSPCacheStats",
+    "FaultBandIndex",
+    "FaultFrequencies",
+    "RunningMoments",
+    "SignalStatistics",
+    "dsp_cache",
+    "get_amplitude_spectrum",
+    "get_analytic_gains",
+    "get_analytic_signal",
+    "get_band_energy",
+    "get_band_rms",
+    "get_envelope",
+    "get_envelope_spectrum",
+    "get_fault_band_index",
+    "get_fault_frequencies",
+    "get_frequencies",
+    "get_magnitude",
+    "get_moment_statistics",
+    "get_power_spectrum",
+    "get_running_moments",
+    "get_spectrum_scale",
+    "get_statistics",
+    "get_window",
+    "merge_running_moments",
+]
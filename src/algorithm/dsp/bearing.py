@@ -0,0 +1,157 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .cache import dsp_cache
+from .spectrum import get_frequencies
+
+FAULTS = ("BPFO", "BPFI", "BSF", "FTF")
+
+
+@dataclass(frozen=True)
+class BearingGeometry:
+    ball_count: int
+    ball_diameter: float
+    pitch_diameter: float
+    contact_angle: float = 0  # degrees
+
+
+@dataclass(frozen=True)
+class FaultFrequencies:
+    shaft: float
+    bpfo: float
+    bpfi: float
+    bsf: float
+    ftf: float
+
+    def get(self, fault: str) -> float:
+        return getattr(self, fault.lower())
+
+    def get_sideband_spacing(self, fault: str) -> float:
+        # inner race and outer race defects are modulated by the shaft, the
+        # balls by the cage
+        return self.ftf if fault == "BSF" else self.shaft
+
+
+def get_fault_frequencies(geometry: BearingGeometry, rpm: float) -> FaultFrequencies:
+    shaft = rpm / 60
+    ratio = (
+        geometry.ball_diameter
+        / geometry.pitch_diameter
+        * float(np.cos(np.radians(geometry.contact_angle)))
+    )
+    return FaultFrequencies(
+        shaft=shaft,
+        bpfo=geometry.ball_count / 2 * shaft * (1 - ratio),
+        bpfi=geometry.ball_count / 2 * shaft * (1 + ratio),
+        bsf=geometry.pitch_diameter
+        / (2 * geometry.ball_diameter)
+        * shaft
+        * (1 - ratio**2),
+        ftf=shaft / 2 * (1 - ratio),
+    )
+
+
+@dataclass(frozen=True)
+class FaultBandIndex:
+    frequencies: FaultFrequencies
+    faults: np.ndarray  # index into FAULTS per band
+    harmonics: np.ndarray
+    sidebands: np.ndarray
+    centers: np.ndarray
+    # (bands, width) spectrum bins, padding bins have a weight of 0
+    bins: np.ndarray
+    weights: np.ndarray
+
+    @property
+    def nbytes(self) -> int:
+        arrays = (self.faults, self.harmonics, self.sidebands, self.centers)
+        return sum(array.nbytes for array in arrays + (self.bins, self.weights))
+
+    def get_band_energy(self, power: np.ndarray) -> np.ndarray:
+        # one gather and sum per frame, works on batches of spectra too
+        return (power[..., self.bins] * self.weights).sum(axis=-1)
+
+    def get_fault_energy(self, power: np.ndarray) -> np.ndarray:
+        # bands are ordered by fault, then harmonic, then sideband
+        energy = self.get_band_energy(power)
+        return energy.reshape(energy.shape[:-1] + (len(FAULTS), -1)).sum(axis=-1)
+
+    def get_band_names(self) -> list[str]:
+        return [
+            (
+                f"{FAULTS[fault]} {harmonic}x{sideband:+d}"
+                if sideband
+                else f"{FAULTS[fault]} {harmonic}x"
+            )
+            for fault, harmonic, sideband in zip(
+                self.faults, self.harmonics, self.sidebands
+            )
+        ]
+
+
+def get_fault_band_index(
+    geometry: BearingGeometry,
+    rpm: float,
+    sample_rate: float,
+    length: int,
+    harmonics: int = 3,
+    sidebands: int = 1,
+    bandwidth: float = 2.0,
+) -> FaultBandIndex:
+    args = (geometry, rpm, sample_rate, length, harmonics, sidebands, bandwidth)
+    return dsp_cache.get(
+        ("fault_band_index",) + args, lambda: _make_fault_band_index(*args)
+    )
+
+
+def _make_fault_band_index(
+    geometry: BearingGeometry,
+    rpm: float,
+    sample_rate: float,
+    length: int,
+    harmonics: int,
+    sidebands: int,
+    bandwidth: float,
+) -> FaultBandIndex:
+    frequencies = get_fault_frequencies(geometry, rpm)
+    fault_ids, harmonic_ids, sideband_ids = np.meshgrid(
+        np.arange(len(FAULTS)),
+        np.arange(1, harmonics + 1),
+        np.arange(-sidebands, sidebands + 1),
+        indexing="ij",
+    )
+    fault_ids = fault_ids.ravel()
+    harmonic_ids = harmonic_ids.ravel()
+    sideband_ids = sideband_ids.ravel()
+    fundamentals = np.array([frequencies.get(fault) for fault in FAULTS])
+    spacings = np.array([frequencies.get_sideband_spacing(fault) for fault in FAULTS])
+    centers = (
+        harmonic_ids * fundamentals[fault_ids] + sideband_ids * spacings[fault_ids]
+    )
+
+    # every band covers at least its nearest bin, bands outside the spectrum
+    # are empty
+    bin_frequencies = get_frequencies(length, sample_rate)
+    resolution = sample_rate / length
+    count = len(bin_frequencies)
+    starts = np.searchsorted(bin_frequencies, centers - bandwidth / 2)
+    stops = np.searchsorted(bin_frequencies, centers + bandwidth / 2, "right")
+    nearest = np.rint(centers / resolution).astype(np.int64)
+    empty = stops <= starts
+    starts = np.where(empty, nearest, starts)
+    stops = np.where(empty, nearest + 1, stops)
+    outside = (centers < 0) | (nearest >= count)
+    starts[outside] = 0
+    stops[outside] = 0
+
+    width = max(int((stops - starts).max()), 1)
+    bins = starts[:, None] + np.arange(width)
+    inside = bins < stops[:, None]
+    bins = np.where(inside, bins, 0)
+    weights = inside.astype(np.float64)
+    for array in (fault_ids, harmonic_ids, sideband_ids, centers, bins, weights):
+        array.flags.writeable = False
+    return FaultBandIndex(
+        frequencies, fault_ids, harmonic_ids, sideband_ids, centers, bins, weights
+    )
@@ -0,0 +1,98 @@
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from threading import Lock
+from typing import Any, Callable, Hashable, TypeVar
+
+import numpy as np
+
+T = TypeVar("T")
+
+
+@dataclass
+class DSPCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    nbytes: int = 0
+
+
+class DSPCache:
+    __max_bytes: int
+    __entries: OrderedDict[Hashable, tuple[Any, int]]
+    __nbytes: int
+    __stats: DSPCacheStats
+    __lock: Lock
+
+    def __init__(self, max_bytes: int = 2**26):
+        self.__max_bytes = max_bytes
+        self.__entries = OrderedDict()
+        self.__nbytes = 0
+        self.__stats = DSPCacheStats()
+        self.__lock = Lock()
+
+    def get(self, key: Hashable, factory: Callable[[], T]) -> T:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                self.__entries.move_to_end(key)
+                self.__stats.hits += 1
+                return entry[0]
+            self.__stats.misses += 1
+
+        # computed outside the lock, concurrent misses of one key keep the first
+        value = self.__freeze(factory())
+        nbytes = self.get_nbytes(value)
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is not None:
+                return entry[0]
+            if nbytes <= self.__max_bytes:
+                self.__entries[key] = (value, nbytes)
+                self.__nbytes += nbytes
+                self.__evict()
+        return value
+
+    def resize(self, max_bytes: int):
+        with self.__lock:
+            self.__max_bytes = max_bytes
+            self.__evict()
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__nbytes = 0
+
+    def get_stats(self) -> DSPCacheStats:
+        with self.__lock:
+            return replace(
+                self.__stats, entries=len(self.__entries), nbytes=self.__nbytes
+            )
+
+    def __evict(self):
+        while self.__nbytes > self.__max_bytes:
+            _, (_, nbytes) = self.__entries.popitem(last=False)
+            self.__nbytes -= nbytes
+            self.__stats.evictions += 1
+
+    @staticmethod
+    def get_nbytes(value: Any) -> int:
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, tuple):
+            return sum(DSPCache.get_nbytes(item) for item in value)
+        return getattr(value, "nbytes", 0)
+
+    @staticmethod
+    def __freeze(value: T) -> T:
+        # entries are shared by every algorithm, nobody may write into them
+        if isinstance(value, np.ndarray):
+            value.flags.writeable = False
+        elif isinstance(value, tuple):
+            for item in value:
+                DSPCache.__freeze(item)
+        return value
+
+
+# shared by all algorithms of the process
+dsp_cache = DSPCache()
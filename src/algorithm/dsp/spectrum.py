@@ -0,0 +1,144 @@
+import numpy as np
+
+from .cache import dsp_cache
+
+WINDOWS = {"hann", "hamming", "blackman", "rect"}
+
+
+def get_window(name: str, length: int) -> np.ndarray:
+    return dsp_cache.get(("window", name, length), lambda: _make_window(name, length))
+
+
+def get_frequencies(length: int, sample_rate: float) -> np.ndarray:
+    return dsp_cache.get(
+        ("frequencies", length, sample_rate),
+        lambda: np.fft.rfftfreq(length, 1 / sample_rate),
+    )
+
+
+def get_spectrum_scale(name: str, length: int, power: bool = False) -> np.ndarray:
+    # per bin factor turning the windowed rfft into single-sided peak
+    # amplitude, or into mean square when power is set
+    def make_scale() -> np.ndarray:
+        weights = get_window(name, length)
+        if power:
+            scale = np.full(length // 2 + 1, 2 / (length * np.square(weights).sum()))
+        else:
+            scale = np.full(length // 2 + 1, 2 / weights.sum())
+        scale[0] /= 2
+        if length % 2 == 0:
+            scale[-1] /= 2
+        return scale
+
+    return dsp_cache.get(("spectrum_scale", name, length, power), make_scale)
+
+
+def get_analytic_gains(
+    length: int, sample_rate: float, band: tuple[float, float] | None = None
+) -> np.ndarray:
+    # rfft bin gains of the analytic signal, zero outside the pass band
+    def make_gains() -> np.ndarray:
+        gains = np.full(length // 2 + 1, 2.0)
+        gains[0] = 1
+        if length % 2 == 0:
+            gains[-1] = 1
+        if band is not None:
+            frequencies = get_frequencies(length, sample_rate)
+            gains[(frequencies < band[0]) | (frequencies > band[1])] = 0
+        return gains
+
+    return dsp_cache.get(("analytic_gains", length, sample_rate, band), make_gains)
+
+
+def get_magnitude(signal: np.ndarray, window: str = "hann") -> np.ndarray:
+    # unscaled rfft magnitude along the last axis, the mean is removed
+    length = signal.shape[-1]
+    centered = signal - signal.mean(axis=-1, keepdims=True)
+    return np.abs(np.fft.rfft(centered * get_window(window, length), axis=-1))
+
+
+def get_amplitude_spectrum(
+    signal: np.ndarray, sample_rate: float, window: str = "hann"
+) -> tuple[np.ndarray, np.ndarray]:
+    # single-sided peak amplitude
+    length = signal.shape[-1]
+    amplitude = get_magnitude(signal, window)
+    amplitude *= get_spectrum_scale(window, length)
+    return get_frequencies(length, sample_rate), amplitude
+
+
+def get_power_spectrum(
+    signal: np.ndarray, sample_rate: float, window: str = "hann"
+) -> tuple[np.ndarray, np.ndarray]:
+    # single-sided mean square per bin, the bins add up to the signal variance
+    length = signal.shape[-1]
+    power = np.square(get_magnitude(signal, window))
+    power *= get_spectrum_scale(window, length, power=True)
+    return get_frequencies(length, sample_rate), power
+
+
+def get_band_rms(
+    signal: np.ndarray, sample_rate: float, edges: np.ndarray, window: str = "hann"
+) -> np.ndarray:
+    # rms of the signal in each band [edges[i], edges[i + 1])
+    frequencies, power = get_power_spectrum(signal, sample_rate, window)
+    return np.sqrt(get_band_energy(frequencies, power, edges))
+
+
+def get_band_energy(
+    frequencies: np.ndarray, power: np.ndarray, edges: np.ndarray
+) -> np.ndarray:
+    indices = np.searchsorted(frequencies, edges)
+    cumulative = np.concatenate(
+        [np.zeros(power.shape[:-1] + (1,)), np.cumsum(power, axis=-1)], axis=-1
+    )
+    energies = cumulative[..., indices[1:]] - cumulative[..., indices[:-1]]
+    return np.maximum(energies, 0)
+
+
+def get_analytic_signal(
+    signal: np.ndarray,
+    sample_rate: float,
+    band: tuple[float, float] | None = None,
+) -> np.ndarray:
+    # hilbert transform through the fft, optionally band-passed in the same pass
+    length = signal.shape[-1]
+    spectrum = np.fft.rfft(signal, axis=-1)
+    analytic = np.zeros(signal.shape[:-1] + (length,), dtype=np.complex128)
+    np.multiply(
+        spectrum,
+        get_analytic_gains(length, sample_rate, band),
+        out=analytic[..., : spectrum.shape[-1]],
+    )
+    return np.fft.ifft(analytic, axis=-1)
+
+
+def get_envelope(
+    signal: np.ndarray,
+    sample_rate: float,
+    band: tuple[float, float] | None = None,
+) -> np.ndarray:
+    return np.abs(get_analytic_signal(signal, sample_rate, band))
+
+
+def get_envelope_spectrum(
+    signal: np.ndarray,
+    sample_rate: float,
+    band: tuple[float, float] | None = None,
+    window: str = "hann",
+) -> tuple[np.ndarray, np.ndarray]:
+    centered = signal - signal.mean(axis=-1, keepdims=True)
+    envelope = get_envelope(centered, sample_rate, band)
+    return get_amplitude_spectrum(envelope, sample_rate, window)
+
+
+def _make_window(name: str, length: int) -> np.ndarray:
+    if name == "hann":
+        return np.hanning(length)
+    if name == "hamming":
+        return np.hamming(length)
+    if name == "blackman":
+        return np.blackman(length)
+    if name == "rect":
+        return np.ones(length)
+    raise ValueError(f"Unknown window {name}")
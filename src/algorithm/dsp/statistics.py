@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SignalStatistics:
+    mean: np.ndarray
+    rms: np.ndarray
+    peak: np.ndarray
+    crest_factor: np.ndarray
+    kurtosis: np.ndarray
+
+
+def get_statistics(signal: np.ndarray) -> SignalStatistics:
+    # statistics of the ac part along the last axis, kurtosis is 3 for noise
+    mean = signal.mean(axis=-1)
+    centered = signal - mean[..., None]
+    power = np.square(centered)
+    variance = power.mean(axis=-1)
+    rms = np.sqrt(variance)
+    peak = np.abs(centered).max(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crest_factor = np.where(rms > 0, peak / rms, 0)
+        kurtosis = np.where(
+            variance > 0, np.square(power).mean(axis=-1) / np.square(variance), 0
+        )
+    return SignalStatistics(mean, rms, peak, crest_factor, kurtosis)
+
+
+@dataclass(frozen=True)
+class RunningMoments:
+    # sums of the centered powers, merged without keeping the samples
+    count: int
+    mean: float
+    m2: float
+    m3: float
+    m4: float
+    minimum: float
+    maximum: float
+
+
+def get_running_moments(signal: np.ndarray) -> RunningMoments:
+    if len(signal) == 0:
+        raise ValueError("At least one sample is required")
+    mean = float(signal.mean())
+    centered = signal - mean
+    power = np.square(centered)
+    return RunningMoments(
+        len(signal),
+        mean,
+        float(power.sum()),
+        float((power * centered).sum()),
+        float(np.square(power).sum()),
+        float(signal.min()),
+        float(signal.max()),
+    )
+
+
+def merge_running_moments(a: RunningMoments, b: RunningMoments) -> RunningMoments:
+    # pairwise update of Chan et al., exact up to rounding
+    count = a.count + b.count
+    delta = b.mean - a.mean
+    delta_n = delta / count
+    ab = a.count * b.count
+    m2 = a.m2 + b.m2 + delta * delta_n * ab
+    m3 = (
+        a.m3
+        + b.m3
+        + delta * delta_n**2 * ab * (a.count - b.count)
+        + 3 * delta_n * (a.count * b.m2 - b.count * a.m2)
+    )
+    m4 = (
+        a.m4
+        + b.m4
+        + delta * delta_n**3 * ab * (a.count**2 - ab + b.count**2)
+        + 6 * delta_n**2 * (a.count**2 * b.m2 + b.count**2 * a.m2)
+        + 4 * delta_n * (a.count * b.m3 - b.count * a.m3)
+    )
+    return RunningMoments(
+        count,
+        a.mean + delta_n * b.count,
+        m2,
+        m3,
+        m4,
+        min(a.minimum, b.minimum),
+        max(a.maximum, b.maximum),
+    )
+
+
+def get_moment_statistics(moments: RunningMoments) -> SignalStatistics:
+    variance = moments.m2 / moments.count
+    rms = np.sqrt(variance)
+    peak = max(moments.maximum - moments.mean, moments.mean - moments.minimum)
+    crest_factor = peak / rms if rms > 0 else 0.0
+    kurtosis = moments.m4 / moments.count / variance**2 if variance > 0 else 0.0
+    return SignalStatistics(
+        *(
+            np.float64(value)
+            for value in (moments.mean, rms, peak, crest_factor, kurtosis)
+        )
+    )
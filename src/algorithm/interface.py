@@ -1,9 +1,16 @@
 from abc import ABCMeta, abstractmethod
+from enum import Enum
+from typing import Any
 
-from .algorithm_data import AlgorithmData, AlgorithmResult
+from .algorithm_data import AlgorithmData, AlgorithmResult, PlotLayout
 from .param import Param
 
 
+class SolverBackend(Enum):
+    THREAD = "thread"
+    PROCESS = "process"
+
+
 class Algorithm(metaclass=ABCMeta):
     @abstractmethod
     def solve(self, data: AlgorithmData, params: dict[str, Param]) -> AlgorithmResult:
@@ -13,6 +20,38 @@ class Algorithm(metaclass=ABCMeta):
     def get_default_params(self) -> dict[str, Param]:
         pass
 
+    def get_backend(self) -> SolverBackend | None:
+        return None
+
+    def get_plot_layouts(self) -> dict[str, PlotLayout]:
+        return {}
+
+    def get_batch_size(self) -> int:
+        return 1
+
+    def solve_batch(
+        self, data: list[AlgorithmData], params: dict[str, Param]
+    ) -> list[AlgorithmResult]:
+        return [self.solve(item, params) for item in data]
+
+
+class IncrementalAlgorithm(Algorithm):
+    @abstractmethod
+    def init_state(self, params: dict[str, Param]) -> Any:
+        pass
+
+    @abstractmethod
+    def update(self, state: Any, chunk: AlgorithmData, params: dict[str, Param]) -> Any:
+        pass
+
+    @abstractmethod
+    def render(self, state: Any, params: dict[str, Param]) -> AlgorithmResult:
+        pass
+
+    def solve(self, data: AlgorithmData, params: dict[str, Param]) -> AlgorithmResult:
+        state = self.update(self.init_state(params), data, params)
+        return self.render(state, params)
+
 
 class AlgorithmError(Exception):
     pass
@@ -28,3 +67,7 @@ class AlgorithmFactory(metaclass=ABCMeta):
     @abstractmethod
     def get_algorithm_names() -> list[str]:
         pass
+
+    @staticmethod
+    def get_backend() -> SolverBackend:
+        return SolverBackend.THREAD
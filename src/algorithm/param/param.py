@@ -16,12 +16,15 @@ class Param:
     ):
         self.__checkers = checkers
         self.__type = type
-        if value:
+        if value is not None:
             self.set_value(value)
 
     def add_check_func(self, check_func):
         self.__checkers.append(check_func)
 
+    def get_checkers(self) -> list[ParamChecker]:
+        return self.__checkers
+
     def get_value(self) -> Any:
         return self.__value
 
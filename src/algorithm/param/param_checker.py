@@ -39,6 +39,9 @@ class RangeChecker(ParamChecker):
         except ValueError:
             raise ParamError("Invalid range values")
 
+    def get_args(self) -> tuple:
+        return self.__min, self.__max, self.__left_open, self.__right_open
+
 
 class StepChecker(ParamChecker):
 
@@ -53,6 +56,9 @@ class StepChecker(ParamChecker):
         except ValueError:
             raise ParamError("Invalid step value")
 
+    def get_args(self) -> tuple:
+        return (self.__step,)
+
 
 class SpecificChecker(ParamChecker):
     def __init__(self, specific: set):
@@ -66,6 +72,9 @@ class SpecificChecker(ParamChecker):
         except ValueError:
             raise ParamError("Invalid specific value")
 
+    def get_args(self) -> tuple:
+        return (self.__specific,)
+
 
 class NotSpecificChecker(ParamChecker):
     def __init__(self, specific: set):
@@ -78,3 +87,6 @@ class NotSpecificChecker(ParamChecker):
                 raise ParamError(f"Value must not be one of {specific}")
         except ValueError:
             raise ParamError("Invalid specific value")
+
+    def get_args(self) -> tuple:
+        return (self.__specific,)
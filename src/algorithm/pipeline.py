@@ -0,0 +1,122 @@
+from abc import abstractmethod
+from threading import RLock
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+from .algorithm_data import AlgorithmData, AlgorithmResult
+from .interface import Algorithm, AlgorithmError
+from .param import Param
+
+
+class Pipeline:
+    __stages: dict[str, Callable[..., Any]]
+
+    def __init__(self):
+        self.__stages = {}
+
+    def stage(self, name: str):
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            self.__stages[name] = func
+            return func
+
+        return decorator
+
+    def get_stage_names(self) -> list[str]:
+        return list(self.__stages.keys())
+
+    def get_frame(self, data: AlgorithmData) -> "PipelineFrame":
+        return PipelineFrame(self, data)
+
+    def run_stage(self, frame: "PipelineFrame", name: str, kwargs: dict) -> Any:
+        if name not in self.__stages:
+            raise AlgorithmError(f"Unknown pipeline stage {name}")
+        return self.__stages[name](frame, **kwargs)
+
+
+class _FrameState:
+    outputs: dict[tuple[str, Hashable], Any]
+    hits: int
+    misses: int
+
+    def __init__(self):
+        self.outputs = {}
+        self.hits = 0
+        self.misses = 0
+        self.lock = RLock()
+
+
+class PipelineFrame:
+    data: AlgorithmData
+
+    __pipeline: Pipeline
+    __stages: set[str] | None
+    __state: _FrameState
+
+    def __init__(
+        self,
+        pipeline: Pipeline,
+        data: AlgorithmData,
+        stages: set[str] | None = None,
+        state: _FrameState | None = None,
+    ):
+        self.data = data
+        self.__pipeline = pipeline
+        self.__stages = stages
+        self.__state = _FrameState() if state is None else state
+
+    def get(self, stage: str, **kwargs) -> Any:
+        if self.__stages is not None and stage not in self.__stages:
+            raise AlgorithmError(f"Stage {stage} is not declared by the algorithm")
+        key = (stage, tuple(sorted(kwargs.items())))
+        state = self.__state
+        with state.lock:
+            if key in state.outputs:
+                state.hits += 1
+                return state.outputs[key]
+            state.misses += 1
+            # stages read their inputs from the unrestricted frame
+            root = PipelineFrame(self.__pipeline, self.data, None, state)
+            value = _freeze(self.__pipeline.run_stage(root, stage, kwargs))
+            state.outputs[key] = value
+            return value
+
+    def restrict(self, stages: set[str]) -> "PipelineFrame":
+        # a view sharing the outputs that only allows the declared stages
+        return PipelineFrame(self.__pipeline, self.data, stages, self.__state)
+
+    def get_hits(self) -> int:
+        return self.__state.hits
+
+    def get_misses(self) -> int:
+        return self.__state.misses
+
+
+class PipelineAlgorithm(Algorithm):
+    @abstractmethod
+    def get_pipeline(self) -> Pipeline:
+        pass
+
+    @abstractmethod
+    def get_stages(self) -> set[str]:
+        pass
+
+    @abstractmethod
+    def solve_frame(
+        self, frame: PipelineFrame, params: dict[str, Param]
+    ) -> AlgorithmResult:
+        pass
+
+    def solve(self, data: AlgorithmData, params: dict[str, Param]) -> AlgorithmResult:
+        frame = self.get_pipeline().get_frame(data)
+        return self.solve_frame(frame.restrict(self.get_stages()), params)
+
+
+def _freeze(value: Any) -> Any:
+    # stage outputs are shared by every algorithm of the frame
+    if isinstance(value, np.ndarray):
+        value.flags.writeable = False
+    elif isinstance(value, tuple):
+        for item in value:
+            _freeze(item)
+    return value
@@ -1,3 +1,15 @@
-from .app import App
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .app import App
 
 __all__ = ["App"]
+
+
+def __getattr__(name: str):
+    # process workers import src.app.solver, App loads the gui and Qt
+    if name == "App":
+        from .app import App
+
+        return App
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,44 +1,101 @@
 import asyncio
-from concurrent.futures import Future, ThreadPoolExecutor
+import sys
+from concurrent.futures import Future
 from datetime import datetime
-from threading import Lock
-from typing import Any, Callable
-
-from ...adapter import AdapterFactory
-from ...algorithm import AlgorithmResult
+from typing import Callable
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from ...adapter import Adapter, AdapterFactory, AdapterRegistry
+from ...algorithm import (
+    AlgorithmData,
+    AlgorithmResult,
+    PlotData,
+    RasterFigure,
+    SolverBackend,
+)
+from ...algorithm.dsp import DSPCacheStats, dsp_cache
 from ...clients import (
     Client,
     ClientExistError,
     ClientManager,
     ConditionalObserver,
+    Message,
     MessageManager,
+    SampleRingBuffer,
 )
+from ...clients.message_manager import MessageLevel
 from ...websocket import (
-    JSONWebSocketCallback,
+    FrameWebSocketCallback,
     WebSocket,
     WebSocketData,
     WebSocketServer,
 )
-from ..utils import AsyncConnection, AsyncQueue, FuncData
+from ..solver import (
+    AlgorithmSolver,
+    RasterOptions,
+    ResultCacheStats,
+    SchedulerStats,
+    SolverStats,
+)
+from ..utils import AsyncConnection, AsyncQueue, BatchSender, FuncCodec, FuncData
 
 
-class BearingWebSocketCallback(JSONWebSocketCallback):
+class BearingWebSocketCallback(FrameWebSocketCallback):
     __client_manager: ClientManager
-
-    def __init__(self, client_manager: ClientManager):
+    __message_manager: MessageManager | None
+    __adapters: dict[int, Adapter]
+    __buffers: dict[int, SampleRingBuffer]
+    __buffer_keys: dict[int, tuple]
+    __window_frames: int
+    __hop_frames: int
+
+    def __init__(
+        self,
+        client_manager: ClientManager,
+        window_frames: int = 1,
+        hop_frames: int = 1,
+        message_manager: MessageManager | None = None,
+    ):
         self.__client_manager = client_manager
+        self.__message_manager = message_manager
+        self.__adapters = {}
+        self.__buffers = {}
+        self.__buffer_keys = {}
+        self.__window_frames = window_frames
+        self.__hop_frames = hop_frames
 
     async def on_receive(self, websocket: WebSocket, data: WebSocketData):
-        json_data = self._parse_json(data)
-        if not self.__check_data(json_data):
-            raise ValueError("Invalid data format")
-        if not self.__client_manager.is_client_exists(hash(websocket)):
-            self.__add_client(websocket, json_data)
-        else:
-            self.__set_client_data(websocket, json_data)
+        try:
+            json_data = self._parse_frame(data)
+            if not self.__check_data(json_data):
+                raise ValueError("Invalid data format")
+            if not self.__client_manager.is_client_exists(hash(websocket)):
+                self.__add_client(websocket, json_data)
+            else:
+                self.__set_client_data(websocket, json_data)
+        except (ValueError, KeyError) as e:
+            # a malformed frame is dropped, the connection stays open
+            self.__log_invalid_data(websocket, e)
 
     async def on_close(self, websocket: WebSocket):
-        self.__client_manager.remove_client(hash(websocket))
+        self.__adapters.pop(hash(websocket), None)
+        self.__buffers.pop(hash(websocket), None)
+        self.__buffer_keys.pop(hash(websocket), None)
+        # a connection whose first frame was invalid never became a client
+        if self.__client_manager.is_client_exists(hash(websocket)):
+            self.__client_manager.remove_client(hash(websocket))
+
+    def __log_invalid_data(self, websocket: WebSocket, error: Exception):
+        text = f"Invalid data dropped: {error!r}"
+        client_hash = hash(websocket)
+        manager = self.__message_manager
+        if manager is None or not self.__client_manager.is_client_exists(client_hash):
+            # no client to show the message for yet
+            print(f"{websocket.remote_address}: {text}", file=sys.stderr)
+            return
+        manager.add_message(client_hash, text, MessageLevel.ERROR)
 
     @staticmethod
     def __check_data(data) -> bool:
@@ -55,9 +112,10 @@ class BearingWebSocketCallback(JSONWebSocketCallback):
             return str(hash(websocket))
 
         adapter = AdapterFactory.get_adapter(data["device_type"])
-        factory = adapter.get_algorithm_factory()
+        factory = AdapterFactory.get_algorithm_factory(data["device_type"])
 
         client_hash = hash(websocket)
+        self.__adapters[client_hash] = adapter
         algorithm_data = adapter.get_algorithm_data(data)
         algorithm_name = factory.get_algorithm_names()[0]
         algorithm = factory.get_algorithm(algorithm_name)
@@ -70,56 +128,108 @@ class BearingWebSocketCallback(JSONWebSocketCallback):
             algorithm_params=algorithm.get_default_params(),
         )
         self.__client_manager.add_client(new_client)
-        self.__client_manager.set_client_data(
-            client_hash, {"algorithm_data": algorithm_data}
-        )
+        self.__set_algorithm_data(client_hash, algorithm_data)
 
     def __set_client_data(self, websocket: WebSocket, data: dict):
-        adapter = AdapterFactory.get_adapter(data["device_type"])
+        adapter = self.__adapters[hash(websocket)]
+        self.__set_algorithm_data(hash(websocket), adapter.get_algorithm_data(data))
+
+    def __set_algorithm_data(self, client_hash: int, data: AlgorithmData):
+        window_data = self.__stream_algorithm_data(client_hash, data)
+        if window_data is None:
+            return
         self.__client_manager.set_client_data(
-            hash(websocket), {"algorithm_data": adapter.get_algorithm_data(data)}
+            client_hash, {"algorithm_data": window_data}
         )
 
-
-class AlgorithmSolver:
-    __pool: ThreadPoolExecutor
-    __locks: dict[int, Lock]
-
-    def __init__(self):
-        self.__pool = ThreadPoolExecutor()
-        self.__locks = {}
-
-    def solve(self, client: Client, callback: Callable[[Future], Any]):
-        self.__pool.submit(self.__run, client).add_done_callback(callback)
-
-    def __run(self, client: Client):
-        lock = self.__get_lock(client.client_id)
-        with lock:
-            return client.algorithm.solve(
-                data=client.algorithm_data,
-                params=client.algorithm_params,
+    def __stream_algorithm_data(
+        self, client_hash: int, data: AlgorithmData
+    ) -> AlgorithmData | None:
+        if not isinstance(data.data, dict) or "sample_dots" not in data.cfg:
+            return data
+        samples = data.data.get("data")
+        if not isinstance(samples, np.ndarray):
+            return data
+        if len(samples) != data.cfg["sample_dots"]:
+            raise ValueError(
+                f"Frame has {len(samples)} samples, "
+                f"sample_dots is {data.cfg['sample_dots']}"
             )
 
-    def __get_lock(self, client_hash: int):
-        if client_hash not in self.__locks:
-            self.__locks[client_hash] = Lock()
-        return self.__locks[client_hash]
+        buffer = self.__get_buffer(client_hash, data.cfg, samples.dtype)
+        if not buffer.append(samples):
+            return None
+        return AlgorithmData(
+            cfg=data.cfg,
+            data={**data.data, "data": buffer.get_window()},
+            sequence=buffer.get_total(),
+        )
+
+    def __get_buffer(
+        self, client_hash: int, cfg: dict, dtype: np.dtype
+    ) -> SampleRingBuffer:
+        key = (cfg.get("sample_rate"), cfg["sample_dots"], dtype)
+        window_length = self.__window_frames * cfg["sample_dots"]
+        hop = self.__hop_frames * cfg["sample_dots"]
+        if client_hash not in self.__buffers:
+            self.__buffers[client_hash] = SampleRingBuffer(window_length, hop, dtype)
+        elif self.__buffer_keys[client_hash] != key:
+            self.__buffers[client_hash].resize(window_length, hop, dtype)
+        self.__buffer_keys[client_hash] = key
+        return self.__buffers[client_hash]
 
 
 class DataProcess:
     client_manager: ClientManager = ClientManager()
     algorithm_result_queue: AsyncQueue = AsyncQueue()
+    window_frames: int = 1
+    hop_frames: int = 1
+    process_workers: int | None = None
+    raster_format: str | None = "png"
+    result_cache_size: int = 2**28
+    batch_delay: float = 0.005
+    batch_max_samples: int = 2048
+    dsp_cache_size: int = 2**26
 
     __algorithm_solver: AlgorithmSolver = AlgorithmSolver()
     __message_manager: MessageManager = MessageManager()
 
     __current_client: int | None = None
     __conn: AsyncConnection
-    __algorithm_changing: bool = False
+    __sender: BatchSender
+    __codec: FuncCodec
 
     @staticmethod
     def __setup_message_manager():
+        from .process_func import UIFunc
+
+        def add_message_callback(client_id: int, message: Message):
+            if client_id == DataProcess.__current_client:
+                DataProcess.send_data(FuncData(UIFunc.append_msg, ([message],)))
+
         DataProcess.__message_manager.set_client_manager(DataProcess.client_manager)
+        DataProcess.__message_manager.set_add_message_hook(add_message_callback)
+
+    @staticmethod
+    def __setup_algorithm_solver():
+        DataProcess.__algorithm_solver.set_cache_size(DataProcess.result_cache_size)
+        DataProcess.__algorithm_solver.set_batch_delay(DataProcess.batch_delay)
+        DataProcess.__algorithm_solver.set_batch_max_samples(
+            DataProcess.batch_max_samples
+        )
+        dsp_cache.resize(DataProcess.dsp_cache_size)
+        modules = set()
+        for device_type in AdapterRegistry.get_device_types():
+            factory = AdapterFactory.get_algorithm_factory(device_type)
+            for name in factory.get_algorithm_names():
+                algorithm = factory.get_algorithm(name)
+                backend = AlgorithmSolver.get_backend(algorithm, factory)
+                if backend == SolverBackend.PROCESS:
+                    modules.add(type(algorithm).__module__)
+        if modules:
+            DataProcess.__algorithm_solver.start_process_pool(
+                DataProcess.process_workers, sorted(modules)
+            )
 
     @staticmethod
     def __setup_client_manager():
@@ -133,63 +243,77 @@ class DataProcess:
 
         def update_figures_and_label(client: Client):
             figures = client.algorithm_result.figure_map
-            if not client.above_figure_name or client.above_figure_name not in figures:
-                name = list(figures.keys())[0]
+            above_name = client.above_figure_name
+            below_name = client.below_figure_name
+            if figures and (not above_name or above_name not in figures):
+                above_name = list(figures.keys())[0]
                 DataProcess.client_manager.set_client_data(
-                    client.client_id, {"above_figure_name": name}
+                    client.client_id, {"above_figure_name": above_name}
                 )
-                client.above_figure_name = name
-            if not client.below_figure_name or client.below_figure_name not in figures:
-                name = list(figures.keys())[0]
+            if figures and (not below_name or below_name not in figures):
+                below_name = list(figures.keys())[0]
                 DataProcess.client_manager.set_client_data(
-                    client.client_id, {"below_figure_name": name}
+                    client.client_id, {"below_figure_name": below_name}
                 )
-                client.below_figure_name = name
             DataProcess.send_data(
                 FuncData(
                     UIFunc.set_figure_combo_box,
-                    (figures, client.above_figure_name, client.below_figure_name),
+                    (
+                        list(figures.keys()),
+                        DataProcess.get_visible_figures(
+                            figures, [above_name, below_name]
+                        ),
+                        above_name or "",
+                        below_name or "",
+                    ),
+                    key=client.client_id,
                 )
             )
             DataProcess.send_data(
-                FuncData(UIFunc.set_result_label, (client.algorithm_result.text,))
+                FuncData(
+                    UIFunc.set_result_label,
+                    (client.algorithm_result.text,),
+                    key=client.client_id,
+                )
             )
 
         def update_algorithm(client: Client):
-            DataProcess.__algorithm_changing = True
             name = client.algorithm_name
             factory = client.algorithm_factory
             algorithm = factory.get_algorithm(name)
             params = algorithm.get_default_params()
             DataProcess.client_manager.set_client_data(
-                client.client_id, {"algorithm_params": params}
+                client.client_id,
+                {"algorithm": algorithm, "algorithm_params": params},
             )
-            DataProcess.__algorithm_changing = False
-            DataProcess.client_manager.set_client_data(
-                client.client_id, {"algorithm": algorithm}
+            DataProcess.send_data(
+                FuncData(UIFunc.set_params, (params,), key=client.client_id)
             )
-            DataProcess.send_data(FuncData(UIFunc.set_params, (params,)))
+            if client.client_id == DataProcess.__current_client:
+                DataProcess.send_data(
+                    FuncData(
+                        UIFunc.set_plot_layouts,
+                        (algorithm.get_plot_layouts(),),
+                        key=client.client_id,
+                    )
+                )
 
         data_observer = ConditionalObserver(
-            lambda _, k: k == "algorithm_data",
+            lambda _, keys: "algorithm_data" in keys,
             lambda c, _: add_date_recv_msg(c),
         )
         solve_observer = ConditionalObserver(
-            lambda _, k: k == "algorithm"
-            or k == "algorithm_data"
-            or k == "algorithm_params",
-            lambda c, _: DataProcess.solve_algorithm(c),
-        )
-        msg_observer = ConditionalObserver(
-            lambda c, k: k == "msg" and c.client_id == DataProcess.__current_client,
-            lambda c, _: DataProcess.send_data(FuncData(UIFunc.set_msg, (c.msg,))),
+            lambda _, keys: bool(
+                keys & {"algorithm", "algorithm_data", "algorithm_params"}
+            ),
+            lambda c, keys: DataProcess.solve_algorithm(c, keys),
         )
         algorithm_observer = ConditionalObserver(
-            lambda _, k: k == "algorithm_name",
+            lambda _, keys: "algorithm_name" in keys,
             lambda c, _: update_algorithm(c),
         )
         result_observer = ConditionalObserver(
-            lambda c, k: k == "algorithm_result"
+            lambda c, keys: "algorithm_result" in keys
             and DataProcess.__current_client == c.client_id,
             lambda c, _: update_figures_and_label(c),
         )
@@ -198,7 +322,6 @@ class DataProcess:
             [
                 data_observer,
                 solve_observer,
-                msg_observer,
                 algorithm_observer,
                 result_observer,
             ]
@@ -212,21 +335,31 @@ class DataProcess:
             DataProcess.__message_manager.add_message(id, f"Client {name} connected.")
 
         def remove_callback(client_id: int):
-
+            DataProcess.__message_manager.remove_client(client_id)
+            DataProcess.__algorithm_solver.remove_client(client_id)
             DataProcess.send_data(FuncData(UIFunc.remove_client, (client_id,)))
 
         DataProcess.client_manager.set_add_client_hook(add_callback)
         DataProcess.client_manager.set_remove_client_hook(remove_callback)
 
     @staticmethod
-    def solve_algorithm(client: Client):
-        if DataProcess.__algorithm_changing:
-            return
+    def solve_algorithm(client: Client, keys: frozenset[str] = frozenset()):
+        def put_result(future: Future):
+            DataProcess.algorithm_result_queue.put(
+                {"client_id": client.client_id, "result": future.result()}
+            )
+
         if (
             client.stop_calculation
             or DataProcess.__current_client != client.client_id
             and not client.backend_calculation
         ):
+            # results already computed for the last solved data cost nothing,
+            # new data waits until the client is solved again
+            if keys & {"algorithm", "algorithm_params"}:
+                DataProcess.__algorithm_solver.solve_cached(
+                    client, put_result, reuse_data=True
+                )
             if not client.need_update:
                 DataProcess.client_manager.set_client_data(
                     client.client_id, {"need_update": True}
@@ -238,35 +371,40 @@ class DataProcess:
                 client.client_id, {"need_update": False}
             )
 
-        DataProcess.__algorithm_solver.solve(
-            client,
-            lambda f: DataProcess.algorithm_result_queue.put(
-                {"client_id": client.client_id, "result": f.result()}
-            ),
-        )
+        DataProcess.__algorithm_solver.solve(client, put_result)
 
     @staticmethod
     async def __websocket_run(path: str, port: int):
-        callback = BearingWebSocketCallback(DataProcess.client_manager)
+        callback = BearingWebSocketCallback(
+            DataProcess.client_manager,
+            window_frames=DataProcess.window_frames,
+            hop_frames=DataProcess.hop_frames,
+            message_manager=DataProcess.__message_manager,
+        )
         server = WebSocketServer(path, port, callback)
         await server.run()
 
     @staticmethod
     async def __recv_data(callback: Callable):
         while True:
-            callback(await DataProcess.__conn.recv())
+            data = await DataProcess.__conn.recv_bytes()
+            for func in DataProcess.__codec.decode(data):
+                callback(func)
 
     @staticmethod
     async def __recv_algorithm_result():
-        def complete_task(client: Client, result: AlgorithmResult):
+        def complete_task(client_id: int, result: AlgorithmResult):
             try:
                 DataProcess.client_manager.set_client_data(
-                    client.client_id,
+                    client_id,
                     {"algorithm_result": result},
                 )
+                fields = DataProcess.client_manager.get_client_fields(
+                    client_id, ["algorithm_name"]
+                )
                 DataProcess.__message_manager.add_message(
-                    client.client_id,
-                    f"{client.algorithm_name} calculated.",
+                    client_id,
+                    f"{fields['algorithm_name']} calculated.",
                 )
             except ClientExistError:
                 # ignore exist error because client
@@ -275,24 +413,62 @@ class DataProcess:
 
         while True:
             r = await DataProcess.algorithm_result_queue.get()
-            client = DataProcess.client_manager.get_client(r["client_id"])
-            complete_task(client, r["result"])
+            complete_task(r["client_id"], r["result"])
 
     @staticmethod
     def __run_func(func: FuncData):
         func(DataProcess, *func.args, **func.kwargs)
 
     @staticmethod
-    def send_data(data):
-        DataProcess.__conn.send(data)
+    def send_data(data: FuncData):
+        DataProcess.__sender.send(data)
 
     @staticmethod
     def set_pipe(conn: AsyncConnection):
+        from .process_func import FUNC_CODEC
+
         DataProcess.__conn = conn
+        DataProcess.__codec = FUNC_CODEC
+        DataProcess.__sender = BatchSender(conn, FUNC_CODEC)
+
+    @staticmethod
+    def get_messages(client_id: int) -> list[Message]:
+        return DataProcess.__message_manager.get_messages(client_id)
+
+    @staticmethod
+    def get_solver_stats() -> SolverStats:
+        return DataProcess.__algorithm_solver.get_stats()
+
+    @staticmethod
+    def get_cache_stats() -> ResultCacheStats:
+        return DataProcess.__algorithm_solver.get_cache_stats()
+
+    @staticmethod
+    def get_scheduler_stats() -> SchedulerStats:
+        return DataProcess.__algorithm_solver.get_scheduler_stats()
+
+    @staticmethod
+    def get_dsp_cache_stats() -> DSPCacheStats:
+        return dsp_cache.get_stats()
+
+    @staticmethod
+    def get_visible_figures(
+        figures: dict[str, Figure | RasterFigure | PlotData], names: list[str | None]
+    ) -> dict[str, Figure | RasterFigure | PlotData]:
+        return {name: figures[name] for name in names if name in figures}
+
+    @staticmethod
+    def set_figure_size(width: int, height: int, dpi: float):
+        if DataProcess.raster_format is None or width <= 0 or height <= 0:
+            return
+        DataProcess.__algorithm_solver.set_raster_options(
+            RasterOptions(width, height, dpi, DataProcess.raster_format)
+        )
 
     @staticmethod
     def set_current_client(client_id: int | None):
         DataProcess.__current_client = client_id
+        DataProcess.__algorithm_solver.set_foreground_client(client_id)
 
     @staticmethod
     def get_current_client() -> int | None:
@@ -302,6 +478,7 @@ class DataProcess:
     def run(path: str, port: int):
         DataProcess.__setup_message_manager()
         DataProcess.__setup_client_manager()
+        DataProcess.__setup_algorithm_solver()
 
         loop = asyncio.get_event_loop()
         loop.create_task(DataProcess.__recv_data(DataProcess.__run_func))
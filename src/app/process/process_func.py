@@ -2,7 +2,9 @@ from typing import Any, Callable
 
 from matplotlib.figure import Figure
 
-from ..utils import FuncData
+from ...algorithm import PlotData, PlotLayout, RasterFigure
+from ...clients import Message
+from ..utils import FuncCodec, FuncData
 from .data_process import DataProcess
 from .ui_process import UIProcess
 
@@ -18,8 +20,12 @@ class UIFunc:
         process.window.remove_client(client_id)
 
     @staticmethod
-    def set_msg(process: UIProcess, msg: str):
-        process.window.set_msg(msg)
+    def set_msg(process: UIProcess, messages: list[Message]):
+        process.window.set_msg(messages)
+
+    @staticmethod
+    def append_msg(process: UIProcess, messages: list[Message]):
+        process.window.append_msg(messages)
 
     @staticmethod
     def set_stop_calculation_state(process: UIProcess, state: bool):
@@ -32,11 +38,22 @@ class UIFunc:
     @staticmethod
     def set_figure_combo_box(
         process: UIProcess,
-        figures: dict[str, Figure],
+        names: list[str],
+        figures: dict[str, Figure | RasterFigure | PlotData],
         above_name: str,
         below_name: str,
     ):
-        process.window.set_figure_combo_box(figures, above_name, below_name)
+        process.window.set_figure_combo_box(names, figures, above_name, below_name)
+
+    @staticmethod
+    def set_figure(
+        process: UIProcess, name: str, figure: Figure | RasterFigure | PlotData
+    ):
+        process.window.set_figure(name, figure)
+
+    @staticmethod
+    def set_plot_layouts(process: UIProcess, layouts: dict[str, PlotLayout]):
+        process.window.set_plot_layouts(layouts)
 
     @staticmethod
     def set_result_label(process: UIProcess, result: str):
@@ -57,6 +74,10 @@ class DataFunc:
     def set_current_client(process: DataProcess, client_id: int):
         process.set_current_client(client_id)
 
+    @staticmethod
+    def set_figure_size(process: DataProcess, width: int, height: int, dpi: float):
+        process.set_figure_size(width, height, dpi)
+
     @staticmethod
     def get_client_data(
         process: DataProcess,
@@ -64,8 +85,8 @@ class DataFunc:
         key: str,
         callback: Callable,
     ):
-        data = process.client_manager.get_client_data(client_id, key)
-        process.send_data(FuncData(callback, (data,)))
+        data = process.client_manager.get_client_fields(client_id, [key])[key]
+        process.send_data(FuncData(callback, (data,), key=client_id))
 
     @staticmethod
     def set_client_data(process: DataProcess, client_id: int, data: dict[str, Any]):
@@ -80,7 +101,7 @@ class DataFunc:
 
     @staticmethod
     def solve_algorithm(process: DataProcess, client_id: int):
-        client = process.client_manager.get_client(client_id)
+        client = process.client_manager.get_client_snapshot(client_id)
         if client.need_update:
             process.solve_algorithm(client)
 
@@ -93,44 +114,105 @@ class DataFunc:
 
     @staticmethod
     def get_figure_combo_box(process: DataProcess, client_id: int, callback: Callable):
-        client = process.client_manager.get_client(client_id)
+        client = process.client_manager.get_client_snapshot(client_id)
         if len(client.algorithm_result.figure_map) == 0:
             return
         figures = client.algorithm_result.figure_map
-        if not client.above_figure_name:
-            name = list(figures.keys())[0]
+        above_name = client.above_figure_name
+        below_name = client.below_figure_name
+        if not above_name:
+            above_name = list(figures.keys())[0]
             process.client_manager.set_client_data(
-                client.client_id, {"above_figure_name": name}
+                client.client_id, {"above_figure_name": above_name}
             )
-            client.above_figure_name = name
-        if not client.below_figure_name:
-            name = list(figures.keys())[0]
+        if not below_name:
+            below_name = list(figures.keys())[0]
             process.client_manager.set_client_data(
-                client.client_id, {"below_figure_name": name}
+                client.client_id, {"below_figure_name": below_name}
             )
-            client.below_figure_name = name
+        visible_figures = process.get_visible_figures(figures, [above_name, below_name])
         process.send_data(
             FuncData(
                 callback,
-                (
-                    figures,
-                    client.above_figure_name,
-                    client.below_figure_name,
-                ),
+                (list(figures.keys()), visible_figures, above_name, below_name),
+                key=client_id,
             )
         )
 
+    @staticmethod
+    def show_current_client_figure(
+        process: DataProcess, key: str, name: str, callback: Callable
+    ):
+        client_id = process.get_current_client()
+        if not client_id:
+            return
+        process.client_manager.set_client_data(client_id, {key: name})
+        fields = process.client_manager.get_client_fields(
+            client_id, ["algorithm_result"]
+        )
+        figure = fields["algorithm_result"].figure_map.get(name)
+        if figure is None:
+            return
+        process.send_data(FuncData(callback, (name, figure), key=(client_id, name)))
+
+    @staticmethod
+    def get_plot_layouts(process: DataProcess, client_id: int, callback: Callable):
+        fields = process.client_manager.get_client_fields(client_id, ["algorithm"])
+        layouts = fields["algorithm"].get_plot_layouts()
+        process.send_data(FuncData(callback, (layouts,), key=client_id))
+
+    @staticmethod
+    def get_messages(process: DataProcess, client_id: int, callback: Callable):
+        messages = process.get_messages(client_id)
+        process.send_data(FuncData(callback, (messages,), key=client_id))
+
     @staticmethod
     def get_result_text(process: DataProcess, client_id: int, callback: Callable):
-        client = process.client_manager.get_client(client_id)
-        result = client.algorithm_result.text
-        process.send_data(FuncData(callback, (result,)))
+        fields = process.client_manager.get_client_fields(
+            client_id, ["algorithm_result"]
+        )
+        text = fields["algorithm_result"].text
+        process.send_data(FuncData(callback, (text,), key=client_id))
 
     @staticmethod
     def get_algorithm_combo_box(
         process: DataProcess, client_id: int, callback: Callable
     ):
-        client = process.client_manager.get_client(client_id)
-        name = client.algorithm_name
-        factory = client.algorithm_factory
-        process.send_data(FuncData(callback, (factory.get_algorithm_names(), name)))
+        fields = process.client_manager.get_client_fields(
+            client_id, ["algorithm_name", "algorithm_factory"]
+        )
+        names = fields["algorithm_factory"].get_algorithm_names()
+        name = fields["algorithm_name"]
+        process.send_data(FuncData(callback, (names, name), key=client_id))
+
+
+# opcodes are part of the message format, append new ones and never reuse
+FUNC_CODEC = FuncCodec(
+    {
+        1: UIFunc.add_client,
+        2: UIFunc.remove_client,
+        3: UIFunc.set_msg,
+        4: UIFunc.append_msg,
+        5: UIFunc.set_stop_calculation_state,
+        6: UIFunc.set_backend_calculation_state,
+        7: UIFunc.set_figure_combo_box,
+        8: UIFunc.set_figure,
+        9: UIFunc.set_plot_layouts,
+        10: UIFunc.set_result_label,
+        11: UIFunc.set_algorithm_combo_box,
+        12: UIFunc.set_params,
+        256: DataFunc.set_current_client,
+        257: DataFunc.set_figure_size,
+        258: DataFunc.get_client_data,
+        259: DataFunc.set_client_data,
+        260: DataFunc.set_current_client_data,
+        261: DataFunc.solve_algorithm,
+        262: DataFunc.solve_current_client_algorithm,
+        263: DataFunc.get_figure_combo_box,
+        264: DataFunc.show_current_client_figure,
+        265: DataFunc.get_plot_layouts,
+        266: DataFunc.get_messages,
+        267: DataFunc.get_result_text,
+        268: DataFunc.get_algorithm_combo_box,
+    }
+)
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from typing import Callable
@@ -7,18 +8,38 @@ from PySide6.QtWidgets import QApplication
 
 from ...algorithm.param import Param
 from ...gui.window import MainWindow
-from ..utils import AsyncConnection, FuncData
+from ..utils import AsyncConnection, BatchSender, FuncBatch, FuncCodec, FuncData
 
 
 class UIProcess:
     window: MainWindow
+    frame_interval: float = 1 / 60
 
     __conn: AsyncConnection
+    __sender: BatchSender
+    __codec: FuncCodec
+    __pending: FuncBatch = FuncBatch()
+    __frame_scheduled: bool = False
+    __last_frame: float = 0
 
     @staticmethod
     async def __recv_data(callback: Callable):
+        loop = asyncio.get_running_loop()
         while True:
-            callback(await UIProcess.__conn.recv())
+            data = await UIProcess.__conn.recv_bytes()
+            UIProcess.__pending.extend(UIProcess.__codec.decode(data))
+            if UIProcess.__frame_scheduled:
+                continue
+            UIProcess.__frame_scheduled = True
+            delay = UIProcess.__last_frame + UIProcess.frame_interval - loop.time()
+            loop.call_later(max(delay, 0), UIProcess.__apply_frame, callback)
+
+    @staticmethod
+    def __apply_frame(callback: Callable):
+        UIProcess.__frame_scheduled = False
+        UIProcess.__last_frame = asyncio.get_running_loop().time()
+        for func in UIProcess.__pending.pop_all():
+            callback(func)
 
     @staticmethod
     def __run_func(func: FuncData):
@@ -84,10 +105,10 @@ class UIProcess:
 
         def update_msg(client_id: int | None):
             if not client_id:
-                UIProcess.window.set_msg("")
+                UIProcess.window.set_msg([])
                 return
             UIProcess.send_data(
-                FuncData(DataFunc.get_client_data, (client_id, "msg", UIFunc.set_msg))
+                FuncData(DataFunc.get_messages, (client_id, UIFunc.set_msg))
             )
 
         def update_params(client_id: int | None):
@@ -106,6 +127,12 @@ class UIProcess:
                 UIProcess.window.clear_figure_combo_box()
                 UIProcess.window.set_result_label("")
                 return
+            UIProcess.send_data(
+                FuncData(
+                    DataFunc.get_plot_layouts,
+                    (client_id, UIFunc.set_plot_layouts),
+                )
+            )
             UIProcess.send_data(
                 FuncData(
                     DataFunc.get_figure_combo_box,
@@ -145,16 +172,16 @@ class UIProcess:
         def above_figure_change_hook(name: str):
             UIProcess.send_data(
                 FuncData(
-                    DataFunc.set_current_client_data,
-                    ({"above_figure_name": name},),
+                    DataFunc.show_current_client_figure,
+                    ("above_figure_name", name, UIFunc.set_figure),
                 )
             )
 
         def below_figure_change_hook(name: str):
             UIProcess.send_data(
                 FuncData(
-                    DataFunc.set_current_client_data,
-                    ({"below_figure_name": name},),
+                    DataFunc.show_current_client_figure,
+                    ("below_figure_name", name, UIFunc.set_figure),
                 )
             )
 
@@ -166,6 +193,11 @@ class UIProcess:
                 )
             )
 
+        def figure_size_change_hook(width: int, height: int, dpi: float):
+            UIProcess.send_data(
+                FuncData(DataFunc.set_figure_size, (width, height, dpi))
+            )
+
         def params_change_hook(params: dict[str, Param]):
             UIProcess.send_data(
                 FuncData(
@@ -181,18 +213,23 @@ class UIProcess:
         UIProcess.window.set_above_figure_change_hook(above_figure_change_hook)
         UIProcess.window.set_below_figure_change_hook(below_figure_change_hook)
         UIProcess.window.set_params_change_hook(params_change_hook)
+        UIProcess.window.set_figure_size_change_hook(figure_size_change_hook)
 
     @staticmethod
     def __quit_all():
         os._exit(0)
 
     @staticmethod
-    def send_data(data):
-        UIProcess.__conn.send(data)
+    def send_data(data: FuncData):
+        UIProcess.__sender.send(data)
 
     @staticmethod
     def set_pipe(conn: AsyncConnection):
+        from .process_func import FUNC_CODEC
+
         UIProcess.__conn = conn
+        UIProcess.__codec = FUNC_CODEC
+        UIProcess.__sender = BatchSender(conn, FUNC_CODEC)
 
     @staticmethod
     def run():
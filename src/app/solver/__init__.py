@@ -0,0 +1,16 @@
+from .algorithm_solver import AlgorithmSolver, IncrementalState, SolverStats
+from .raster import RasterOptions
+from .result_cache import ResultCache, ResultCacheStats
+from .scheduler import QueueStats, SchedulerStats, SolvePriority
+
+__all__ = [
+    "AlgorithmSolver",
+    "IncrementalState",
+    "QueueStats",
+    "RasterOptions",
+    "ResultCache",
+    "ResultCacheStats",
+    "SchedulerStats",
+    "SolvePriority",
+    "SolverStats",
+]
@@ -0,0 +1,564 @@
+import atexit
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from threading import Lock
+from typing import Any, Callable, Hashable
+
+import numpy as np
+
+from ...algorithm import (
+    Algorithm,
+    AlgorithmData,
+    AlgorithmResult,
+    IncrementalAlgorithm,
+    SolverBackend,
+)
+from ...algorithm.interface import AlgorithmError
+from ...algorithm.interface import AlgorithmFactory
+from ...clients import Client
+from . import process_worker
+from .raster import RasterOptions, rasterize_result
+from .result_cache import ResultCache, ResultCacheStats
+from .scheduler import PriorityScheduler, SchedulerStats
+from .shared_buffer import SharedArrayHandle, SharedBufferPool
+
+
+@dataclass
+class SolverStats:
+    submitted: int = 0
+    completed: int = 0
+    coalesced: int = 0
+    dropped: int = 0
+    batched: int = 0
+    batches: int = 0
+
+
+@dataclass
+class IncrementalState:
+    algorithm: IncrementalAlgorithm
+    params: list[tuple[str, Any]]
+    cfg: dict
+    sequence: int | None
+    state: Any
+
+
+@dataclass
+class SolveTask:
+    client: Client
+    callback: Callable[[Future], Any]
+    backend: SolverBackend
+    data: AlgorithmData
+    raster: RasterOptions | None = None
+    # set on the worker, hashing the data would block the event loop
+    cache_key: bytes | None = None
+    # the client already received the cached result
+    unchanged: bool = False
+    handles: list[SharedArrayHandle] = field(default_factory=list)
+
+
+class AlgorithmSolver:
+    __scheduler: PriorityScheduler
+    __process_pool: ProcessPoolExecutor | None
+    __shared_buffers: SharedBufferPool
+    __raster: RasterOptions | None
+    __cache: ResultCache
+    __data_digests: dict[int, bytes]
+    # cache key of the result each client received last
+    __result_keys: dict[int, bytes | None]
+    __states: dict[int, IncrementalState]
+    __locks: dict[int, Lock]
+    __coalesce: bool
+    __batch_delay: float
+    # stacking larger windows costs more than the calls it saves
+    __batch_max_samples: int
+    __batches: dict[Hashable, list[tuple[SolveTask, Future]]]
+    __batch_flushes: dict[Hashable, Future]
+    __state_lock: Lock
+    __running: set[int]
+    __pending: dict[int, SolveTask]
+    # removed clients with a solve still running, which must not store state
+    __removed: set[int]
+    __stats: SolverStats
+
+    def __init__(
+        self,
+        coalesce: bool = True,
+        cache_size: int = 2**28,
+        batch_delay: float = 0.005,
+        batch_max_samples: int = 2048,
+        max_workers: int | None = None,
+    ):
+        self.__scheduler = PriorityScheduler(max_workers)
+        self.__process_pool = None
+        self.__shared_buffers = SharedBufferPool()
+        self.__raster = None
+        self.__cache = ResultCache(cache_size)
+        self.__data_digests = {}
+        self.__result_keys = {}
+        self.__states = {}
+        self.__locks = {}
+        self.__coalesce = coalesce
+        self.__batch_delay = batch_delay
+        self.__batch_max_samples = batch_max_samples
+        self.__batches = {}
+        self.__batch_flushes = {}
+        self.__state_lock = Lock()
+        self.__running = set()
+        self.__pending = {}
+        self.__removed = set()
+        self.__stats = SolverStats()
+
+    def start_process_pool(
+        self,
+        max_workers: int | None = None,
+        warm_up_modules: list[str] = [],
+    ):
+        workers = max_workers or os.cpu_count() or 1
+        with self.__state_lock:
+            if self.__process_pool is not None:
+                return
+            self.__process_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=process_worker.warm_up,
+                initargs=(warm_up_modules,),
+            )
+            atexit.register(self.__shared_buffers.close)
+        # spawn every worker now instead of on the first solves
+        for _ in range(workers):
+            self.__process_pool.submit(process_worker.ping)
+
+    def solve(self, client: Client, callback: Callable[[Future], Any]):
+        task: SolveTask | None = self.__create_task(client, callback)
+        if not self.__coalesce:
+            self.__submit(task)  # type: ignore
+            return
+        with self.__state_lock:
+            client_id = client.client_id
+            # a new client got the id of a removed one
+            self.__removed.discard(client_id)
+            dropped = self.__pending.pop(client_id, None)
+            if client_id in self.__running:
+                self.__pending[client_id] = task  # type: ignore
+                self.__stats.coalesced += 1
+                if dropped is not None:
+                    self.__stats.dropped += 1
+                task = None
+            else:
+                self.__running.add(client_id)
+        if task is not None:
+            self.__submit(task)
+
+    def solve_cached(
+        self,
+        client: Client,
+        callback: Callable[[Future], Any],
+        reuse_data: bool = False,
+    ) -> bool:
+        # reuse_data looks up the data the client was last solved with,
+        # for clients that keep receiving data while their result is frozen
+        if (
+            isinstance(client.algorithm, IncrementalAlgorithm)
+            or self.__cache.get_max_bytes() <= 0
+        ):
+            return False
+        if reuse_data:
+            with self.__state_lock:
+                data_digest = self.__data_digests.get(client.client_id)
+            if data_digest is None:
+                return False
+        else:
+            data_digest = ResultCache.get_data_digest(client.algorithm_data)
+        cache_key = self.__get_cache_key(client, data_digest, self.__raster)
+        return self.__solve_cached(client, cache_key, callback)
+
+    def set_raster_options(self, options: RasterOptions | None):
+        self.__raster = options
+
+    def set_batch_delay(self, delay: float):
+        self.__batch_delay = delay
+
+    def set_batch_max_samples(self, samples: int):
+        self.__batch_max_samples = samples
+
+    def set_foreground_client(self, client_id: int | None):
+        self.__scheduler.set_foreground(client_id)
+
+    def set_cache_size(self, max_bytes: int):
+        self.__cache.resize(max_bytes)
+
+    def get_cache_stats(self) -> ResultCacheStats:
+        return self.__cache.get_stats()
+
+    def get_scheduler_stats(self) -> SchedulerStats:
+        return self.__scheduler.get_stats()
+
+    def get_stats(self) -> SolverStats:
+        with self.__state_lock:
+            return replace(self.__stats)
+
+    def remove_client(self, client_id: int):
+        # called on the event loop, never waits for a running solve
+        with self.__state_lock:
+            self.__data_digests.pop(client_id, None)
+            self.__result_keys.pop(client_id, None)
+            self.__states.pop(client_id, None)
+            self.__locks.pop(client_id, None)
+            self.__pending.pop(client_id, None)
+            if client_id in self.__running:
+                self.__removed.add(client_id)
+
+    @staticmethod
+    def get_backend(
+        algorithm: Algorithm, algorithm_factory: AlgorithmFactory
+    ) -> SolverBackend:
+        # the state lives in this process, workers cannot update it
+        if isinstance(algorithm, IncrementalAlgorithm):
+            return SolverBackend.THREAD
+        backend = algorithm.get_backend()
+        if backend is None:
+            return algorithm_factory.get_backend()
+        return backend
+
+    def __solve_cached(
+        self, client: Client, cache_key: bytes, callback: Callable[[Future], Any]
+    ) -> bool:
+        with self.__state_lock:
+            # results of queued solves must not overtake this one
+            if client.client_id in self.__running:
+                return False
+            # setting the same result again would only notify the client
+            if self.__result_keys.get(client.client_id) == cache_key:
+                return True
+        result = self.__cache.get(cache_key)
+        if result is None:
+            return False
+        with self.__state_lock:
+            self.__result_keys[client.client_id] = cache_key
+        future = Future()
+        future.set_result(result)
+        callback(future)
+        return True
+
+    def __create_task(
+        self, client: Client, callback: Callable[[Future], Any]
+    ) -> SolveTask:
+        backend = self.get_backend(client.algorithm, client.algorithm_factory)
+        task = SolveTask(
+            client,
+            callback,
+            backend,
+            client.algorithm_data,
+            self.__raster,
+        )
+        # process tasks are copied to shared memory by the worker
+        self.__detach_data(task)
+        return task
+
+    @staticmethod
+    def __get_cache_key(
+        client: Client, data_digest: bytes, raster: RasterOptions | None
+    ) -> bytes:
+        return ResultCache.get_key(
+            client.algorithm,
+            data_digest,
+            client.algorithm_params,
+            raster,
+        )
+
+    def __get_cached(self, task: SolveTask) -> AlgorithmResult | None:
+        # a disabled cache never hits, the data is not hashed at all
+        if self.__cache.get_max_bytes() <= 0:
+            return None
+        client_id = task.client.client_id
+        data_digest = ResultCache.get_data_digest(task.data)
+        task.cache_key = self.__get_cache_key(task.client, data_digest, task.raster)
+        with self.__state_lock:
+            if client_id not in self.__removed:
+                self.__data_digests[client_id] = data_digest
+            unchanged = self.__result_keys.get(client_id) == task.cache_key
+        result = self.__cache.get(task.cache_key)
+        task.unchanged = unchanged and result is not None
+        return result
+
+    @staticmethod
+    def __is_mutable_view(array: np.ndarray) -> bool:
+        base = array.base
+        return isinstance(base, np.ndarray) and base.flags.writeable
+
+    def __detach_data(self, task: SolveTask):
+        # client snapshots share arrays, copy the ones still backed by
+        # buffers the data process keeps writing into (e.g. ring buffers)
+        data = task.data.data
+        if not isinstance(data, dict):
+            return
+        detached_data = {
+            key: (
+                value.copy()
+                if isinstance(value, np.ndarray) and self.__is_mutable_view(value)
+                else value
+            )
+            for key, value in data.items()
+        }
+        task.data = replace(task.data, data=detached_data)
+
+    def __share_data(self, task: SolveTask):
+        data = task.data.data
+        if not isinstance(data, dict):
+            return
+        shared_data = {}
+        for key, value in data.items():
+            if isinstance(value, np.ndarray):
+                handle = self.__shared_buffers.write(value)
+                task.handles.append(handle)
+                value = handle
+            shared_data[key] = value
+        task.data = replace(task.data, data=shared_data)
+
+    def __release_task(self, task: SolveTask):
+        for handle in task.handles:
+            self.__shared_buffers.release(handle)
+        task.handles = []
+
+    def __submit(self, task: SolveTask):
+        with self.__state_lock:
+            self.__stats.submitted += 1
+        batch_key = self.__get_batch_key(task)
+        if batch_key is None:
+            future = self.__scheduler.submit((task.client.client_id,), self.__run, task)
+        else:
+            future = Future()
+            self.__add_to_batch(batch_key, task, future)
+        future.add_done_callback(lambda f: self.__on_done(task, f))
+
+    def __on_done(self, task: SolveTask, future: Future):
+        # setting the same result again would only notify the client
+        if not task.unchanged:
+            task.callback(future)
+        client_id = task.client.client_id
+        with self.__state_lock:
+            self.__stats.completed += 1
+            succeeded = not future.cancelled() and future.exception() is None
+            if succeeded and client_id not in self.__removed:
+                self.__result_keys[client_id] = task.cache_key
+            if not self.__coalesce:
+                return
+            if client_id not in self.__pending:
+                self.__running.discard(client_id)
+                self.__removed.discard(client_id)
+                return
+            task = self.__pending.pop(client_id)
+        self.__submit(task)
+
+    def __run(self, task: SolveTask):
+        client = task.client
+        lock = self.__get_lock(client.client_id)
+        with lock:
+            # incremental results depend on the state, not only on the data
+            if isinstance(client.algorithm, IncrementalAlgorithm):
+                return self.__run_incremental(task)
+            result = self.__get_cached(task)
+            if result is not None:
+                return result
+            if task.backend == SolverBackend.PROCESS:
+                result = self.__run_in_process(task)
+            else:
+                result = rasterize_result(
+                    client.algorithm.solve(
+                        data=task.data,
+                        params=client.algorithm_params,
+                    ),
+                    task.raster,
+                )
+            if task.cache_key is not None:
+                self.__cache.put(task.cache_key, result)
+            return result
+
+    def __run_incremental(self, task: SolveTask) -> AlgorithmResult:
+        client = task.client
+        algorithm: IncrementalAlgorithm = client.algorithm  # type: ignore
+        params = client.algorithm_params
+        data = task.data
+        values = [(name, param.get_value()) for name, param in params.items()]
+        state = self.__states.get(client.client_id)
+        chunk = None
+        if (
+            state is not None
+            and state.algorithm is algorithm
+            and state.params == values
+            and state.cfg == data.cfg
+        ):
+            chunk = self.__get_chunk(data, state.sequence)
+        if state is None or chunk is None:
+            state = IncrementalState(
+                algorithm, values, data.cfg, None, algorithm.init_state(params)
+            )
+            with self.__state_lock:
+                if client.client_id not in self.__removed:
+                    self.__states[client.client_id] = state
+            chunk = data
+        # nothing new when the same window is solved again, e.g. after a pause
+        if data.sequence is None or data.sequence != state.sequence:
+            state.state = algorithm.update(state.state, chunk, params)
+        state.sequence = data.sequence
+        return rasterize_result(algorithm.render(state.state, params), task.raster)
+
+    @staticmethod
+    def __get_chunk(data: AlgorithmData, sequence: int | None) -> AlgorithmData | None:
+        # the samples at the end of the window not seen yet,
+        # None when the state has to be rebuilt from the whole window
+        if data.sequence is None:
+            # every frame of unstreamed data is new
+            return data if sequence is None else None
+        if sequence is None or not isinstance(data.data, dict):
+            return None
+        window = data.data.get("data")
+        count = data.sequence - sequence
+        if not isinstance(window, np.ndarray) or not 0 <= count <= len(window):
+            return None
+        return replace(data, data={**data.data, "data": window[len(window) - count :]})
+
+    def __get_batch_key(self, task: SolveTask) -> Hashable | None:
+        algorithm = task.client.algorithm
+        # the client on screen does not wait for others to join its batch
+        if (
+            task.client.client_id == self.__scheduler.get_foreground()
+            or task.backend != SolverBackend.THREAD
+            or isinstance(algorithm, IncrementalAlgorithm)
+            or algorithm.get_batch_size() <= 1
+            or not isinstance(task.data.data, dict)
+        ):
+            return None
+        # solves can only be stacked when everything but the data is equal
+        shapes = tuple(
+            (name, value.shape, value.dtype.str)
+            for name, value in task.data.data.items()
+            if isinstance(value, np.ndarray)
+        )
+        if any(shape and shape[0] > self.__batch_max_samples for _, shape, _ in shapes):
+            return None
+        params = tuple(
+            (name, param.get_value())
+            for name, param in task.client.algorithm_params.items()
+        )
+        return (
+            type(algorithm),
+            repr(params),
+            repr(sorted(task.data.cfg.items())),
+            shapes,
+        )
+
+    def __add_to_batch(self, batch_key: Hashable, task: SolveTask, future: Future):
+        batch_size = task.client.algorithm.get_batch_size()
+        with self.__state_lock:
+            batch = self.__batches.get(batch_key)
+            if batch is None:
+                batch = self.__batches[batch_key] = []
+                if self.__batch_delay > 0:
+                    # flushed by a scheduler worker, no timer thread per batch
+                    self.__batch_flushes[batch_key] = self.__scheduler.submit_after(
+                        self.__batch_delay,
+                        (task.client.client_id,),
+                        self.__flush_batch,
+                        batch_key,
+                        batch,
+                    )
+            batch.append((task, future))
+            if len(batch) < batch_size and self.__batch_delay > 0:
+                return
+            del self.__batches[batch_key]
+            flush = self.__batch_flushes.pop(batch_key, None)
+        if flush is not None:
+            flush.cancel()
+        self.__submit_batch(batch)
+
+    def __flush_batch(self, batch_key: Hashable, batch: list[tuple[SolveTask, Future]]):
+        with self.__state_lock:
+            # already submitted because it was full
+            if self.__batches.get(batch_key) is not batch:
+                return
+            del self.__batches[batch_key]
+            del self.__batch_flushes[batch_key]
+        # already on a scheduler worker
+        self.__run_batch(batch)
+
+    def __submit_batch(self, batch: list[tuple[SolveTask, Future]]):
+        keys = tuple(task.client.client_id for task, _ in batch)
+        self.__scheduler.submit(keys, self.__run_batch, batch)
+
+    def __run_batch(self, batch: list[tuple[SolveTask, Future]]):
+        if len(batch) == 1:
+            task, future = batch[0]
+            try:
+                future.set_result(self.__run(task))
+            except Exception as e:
+                future.set_exception(e)
+            return
+
+        client_ids = sorted({task.client.client_id for task, _ in batch})
+        locks = [self.__get_lock(client_id) for client_id in client_ids]
+        results: list[tuple[Future, AlgorithmResult]] = []
+        errors: list[tuple[Future, Exception]] = []
+        for lock in locks:
+            lock.acquire()
+        try:
+            pending = []
+            for task, future in batch:
+                result = self.__get_cached(task)
+                if result is None:
+                    pending.append((task, future))
+                else:
+                    results.append((future, result))
+            if pending:
+                # clients in one batch share the algorithm type and params
+                client = pending[0][0].client
+                try:
+                    batch_results = client.algorithm.solve_batch(
+                        [task.data for task, _ in pending], client.algorithm_params
+                    )
+                    if len(batch_results) != len(pending):
+                        raise AlgorithmError(
+                            f"solve_batch returned {len(batch_results)} results "
+                            f"for {len(pending)} data"
+                        )
+                except Exception as e:
+                    errors.extend((future, e) for _, future in pending)
+                else:
+                    for (task, future), result in zip(pending, batch_results):
+                        result = rasterize_result(result, task.raster)
+                        if task.cache_key is not None:
+                            self.__cache.put(task.cache_key, result)
+                        results.append((future, result))
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+        with self.__state_lock:
+            self.__stats.batched += len(batch)
+            self.__stats.batches += 1
+        for future, result in results:
+            future.set_result(result)
+        for future, error in errors:
+            future.set_exception(error)
+
+    def __run_in_process(self, task: SolveTask) -> AlgorithmResult:
+        if self.__process_pool is None:
+            self.start_process_pool()
+        try:
+            self.__share_data(task)
+            future = self.__process_pool.submit(  # type: ignore
+                process_worker.solve,
+                task.client.algorithm,
+                task.data,
+                task.client.algorithm_params,
+                task.raster,
+            )
+            return future.result()
+        finally:
+            self.__release_task(task)
+
+    def __get_lock(self, client_hash: int):
+        with self.__state_lock:
+            return self.__locks.setdefault(client_hash, Lock())
@@ -0,0 +1,38 @@
+from dataclasses import replace
+from importlib import import_module
+
+from ...algorithm import Algorithm, AlgorithmData, AlgorithmResult
+from ...algorithm.param import Param
+from .raster import RasterOptions, rasterize_result
+from .shared_buffer import SharedArrayHandle, open_shared_array
+
+
+def warm_up(modules: list[str]):
+    for module in modules:
+        import_module(module)
+
+
+def ping():
+    pass
+
+
+def solve(
+    algorithm: Algorithm,
+    data: AlgorithmData,
+    params: dict[str, Param],
+    raster: RasterOptions | None = None,
+) -> AlgorithmResult:
+    if isinstance(data.data, dict):
+        data = replace(
+            data,
+            data={
+                key: (
+                    open_shared_array(value)
+                    if isinstance(value, SharedArrayHandle)
+                    else value
+                )
+                for key, value in data.data.items()
+            },
+        )
+    result = algorithm.solve(data=data, params=params)
+    return rasterize_result(result, raster)
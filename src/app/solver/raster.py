@@ -0,0 +1,46 @@
+from dataclasses import dataclass
+from io import BytesIO
+
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from ...algorithm import AlgorithmResult, RasterFigure
+
+
+@dataclass(frozen=True)
+class RasterOptions:
+    width: int
+    height: int
+    dpi: float
+    format: str = "png"
+
+
+def rasterize_figure(figure: Figure, options: RasterOptions) -> RasterFigure:
+    canvas = FigureCanvasAgg(figure)
+    figure.set_dpi(options.dpi)
+    figure.set_size_inches(options.width / options.dpi, options.height / options.dpi)
+    if options.format == "png":
+        buffer = BytesIO()
+        canvas.print_png(buffer)
+        data = buffer.getvalue()
+    elif options.format == "rgba":
+        canvas.draw()
+        data = bytes(canvas.buffer_rgba())
+    else:
+        raise ValueError(f"Unknown raster format {options.format}")
+    width, height = canvas.get_width_height(physical=True)
+    return RasterFigure(options.format, width, height, data)
+
+
+def rasterize_result(
+    result: AlgorithmResult, options: RasterOptions | None
+) -> AlgorithmResult:
+    if options is None:
+        return result
+    figure_map = {
+        name: (
+            rasterize_figure(figure, options) if isinstance(figure, Figure) else figure
+        )
+        for name, figure in result.figure_map.items()
+    }
+    return AlgorithmResult(figure_map, result.text)
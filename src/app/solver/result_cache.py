@@ -0,0 +1,144 @@
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from threading import Lock
+from typing import Any
+
+import numpy as np
+
+from ...algorithm import (
+    Algorithm,
+    AlgorithmData,
+    AlgorithmResult,
+    PlotData,
+    RasterFigure,
+)
+from ...algorithm.param import Param
+
+
+@dataclass
+class ResultCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    entries: int = 0
+    nbytes: int = 0
+
+
+class ResultCache:
+    # matplotlib figures have no cheap size, count them as this many bytes
+    figure_nbytes: int = 2**20
+
+    __max_bytes: int
+    __entries: OrderedDict[bytes, tuple[AlgorithmResult, int]]
+    __nbytes: int
+    __stats: ResultCacheStats
+    __lock: Lock
+
+    def __init__(self, max_bytes: int = 2**28):
+        self.__max_bytes = max_bytes
+        self.__entries = OrderedDict()
+        self.__nbytes = 0
+        self.__stats = ResultCacheStats()
+        self.__lock = Lock()
+
+    def get(self, key: bytes) -> AlgorithmResult | None:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+            self.__entries.move_to_end(key)
+            self.__stats.hits += 1
+            return entry[0]
+
+    def put(self, key: bytes, result: AlgorithmResult):
+        nbytes = self.get_result_nbytes(result)
+        with self.__lock:
+            # every computed result is a miss, lookups alone are not
+            self.__stats.misses += 1
+            if key in self.__entries:
+                self.__nbytes -= self.__entries.pop(key)[1]
+            if nbytes > self.__max_bytes:
+                return
+            self.__entries[key] = (result, nbytes)
+            self.__nbytes += nbytes
+            self.__evict()
+
+    def resize(self, max_bytes: int):
+        with self.__lock:
+            self.__max_bytes = max_bytes
+            self.__evict()
+
+    def get_max_bytes(self) -> int:
+        return self.__max_bytes
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__nbytes = 0
+
+    def get_stats(self) -> ResultCacheStats:
+        with self.__lock:
+            return replace(
+                self.__stats, entries=len(self.__entries), nbytes=self.__nbytes
+            )
+
+    def __evict(self):
+        while self.__nbytes > self.__max_bytes:
+            _, (_, nbytes) = self.__entries.popitem(last=False)
+            self.__nbytes -= nbytes
+            self.__stats.evictions += 1
+
+    @staticmethod
+    def get_data_digest(data: AlgorithmData) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(repr(sorted(data.cfg.items())).encode())
+        if isinstance(data.data, dict):
+            for name in sorted(data.data):
+                digest.update(name.encode())
+                _update_digest(digest, data.data[name])
+        else:
+            _update_digest(digest, data.data)
+        return digest.digest()
+
+    @staticmethod
+    def get_key(
+        algorithm: Algorithm,
+        data_digest: bytes,
+        params: dict[str, Param],
+        extra: Any = None,
+    ) -> bytes:
+        digest = hashlib.blake2b(data_digest, digest_size=16)
+        algorithm_type = type(algorithm)
+        digest.update(
+            f"{algorithm_type.__module__}.{algorithm_type.__qualname__}".encode()
+        )
+        values = [(name, param.get_value()) for name, param in params.items()]
+        digest.update(repr(values).encode())
+        digest.update(repr(extra).encode())
+        return digest.digest()
+
+    @staticmethod
+    def get_result_nbytes(result: AlgorithmResult) -> int:
+        nbytes = len(result.text)
+        for figure in result.figure_map.values():
+            if isinstance(figure, RasterFigure):
+                nbytes += len(figure.data)
+            elif isinstance(figure, PlotData):
+                arrays = [array for line in figure.lines for array in line]
+                if figure.image is not None:
+                    arrays.append(figure.image)
+                nbytes += sum(np.asarray(array).nbytes for array in arrays)
+            else:
+                nbytes += ResultCache.figure_nbytes
+        return nbytes
+
+
+def _update_digest(digest, value: Any):
+    if isinstance(value, np.ndarray):
+        digest.update(f"{value.dtype.str}{value.shape}".encode())
+        digest.update(np.ascontiguousarray(value).data)
+    elif isinstance(value, (bytes, bytearray, memoryview)):
+        digest.update(value)
+    else:
+        digest.update(repr(value).encode())
@@ -0,0 +1,207 @@
+import heapq
+import itertools
+import os
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field, replace
+from enum import Enum
+from threading import Condition, Thread
+from typing import Any, Callable, Hashable
+
+
+class SolvePriority(Enum):
+    FOREGROUND = "foreground"
+    BACKGROUND = "background"
+
+
+@dataclass
+class QueueStats:
+    submitted: int = 0
+    started: int = 0
+    completed: int = 0
+    depth: int = 0
+    max_depth: int = 0
+    mean_wait: float = 0
+    max_wait: float = 0
+
+
+@dataclass
+class SchedulerStats:
+    foreground: QueueStats = field(default_factory=QueueStats)
+    background: QueueStats = field(default_factory=QueueStats)
+
+
+@dataclass
+class _Entry:
+    keys: tuple[Hashable, ...]
+    func: Callable
+    args: tuple
+    future: Future
+    time: float
+
+
+class PriorityScheduler:
+    __max_workers: int
+    __foreground_reserve: int
+    __condition: Condition
+    __foreground_key: Hashable | None
+    __foreground: deque[_Entry]
+    # one queue per key group, served round-robin
+    __background: OrderedDict[tuple[Hashable, ...], deque[_Entry]]
+    # entries waiting for their due time, (due, sequence, entry)
+    __delayed: list[tuple[float, int, _Entry]]
+    __sequence: itertools.count
+    __running_background: int
+    __threads: list[Thread]
+    __idle: int
+    __stats: dict[SolvePriority, QueueStats]
+    __total_wait: dict[SolvePriority, float]
+
+    def __init__(self, max_workers: int | None = None, foreground_reserve: int = 1):
+        self.__max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.__foreground_reserve = foreground_reserve
+        self.__condition = Condition()
+        self.__foreground_key = None
+        self.__foreground = deque()
+        self.__background = OrderedDict()
+        self.__delayed = []
+        self.__sequence = itertools.count()
+        self.__running_background = 0
+        self.__threads = []
+        self.__idle = 0
+        self.__stats = {priority: QueueStats() for priority in SolvePriority}
+        self.__total_wait = {priority: 0.0 for priority in SolvePriority}
+
+    def submit(self, keys: tuple[Hashable, ...], func: Callable, *args: Any) -> Future:
+        future = Future()
+        entry = _Entry(keys, func, args, future, time.monotonic())
+        with self.__condition:
+            priority = self.__enqueue(entry)
+            self.__stats[priority].submitted += 1
+            self.__start_thread()
+            self.__condition.notify()
+        return future
+
+    def submit_after(
+        self, delay: float, keys: tuple[Hashable, ...], func: Callable, *args: Any
+    ) -> Future:
+        # queued once the delay has passed, an idle worker waits for it
+        # instead of a timer thread per call
+        future = Future()
+        due = time.monotonic() + delay
+        entry = _Entry(keys, func, args, future, due)
+        with self.__condition:
+            heapq.heappush(self.__delayed, (due, next(self.__sequence), entry))
+            self.__start_thread()
+            self.__condition.notify()
+        return future
+
+    def set_foreground(self, key: Hashable | None):
+        with self.__condition:
+            if key == self.__foreground_key:
+                return
+            self.__foreground_key = key
+            # queued entries move to their new class in submission order
+            entries = list(self.__foreground)
+            for queue in self.__background.values():
+                entries.extend(queue)
+            entries.sort(key=lambda entry: entry.time)
+            self.__foreground.clear()
+            self.__background.clear()
+            for stats in self.__stats.values():
+                stats.depth = 0
+            for entry in entries:
+                self.__enqueue(entry)
+            self.__condition.notify_all()
+
+    def get_foreground(self) -> Hashable | None:
+        return self.__foreground_key
+
+    def get_stats(self) -> SchedulerStats:
+        with self.__condition:
+            stats = {}
+            for priority, queue_stats in self.__stats.items():
+                started = queue_stats.started
+                mean_wait = self.__total_wait[priority] / started if started else 0
+                stats[priority] = replace(queue_stats, mean_wait=mean_wait)
+        return SchedulerStats(
+            stats[SolvePriority.FOREGROUND], stats[SolvePriority.BACKGROUND]
+        )
+
+    def __start_thread(self):
+        if self.__idle == 0 and len(self.__threads) < self.__max_workers:
+            # threads start on demand, the solver is created before forking
+            thread = Thread(target=self.__work, daemon=True)
+            self.__threads.append(thread)
+            thread.start()
+
+    def __release_delayed(self) -> float | None:
+        # queues the due entries, returns the time until the next one
+        now = time.monotonic()
+        while self.__delayed and self.__delayed[0][0] <= now:
+            _, _, entry = heapq.heappop(self.__delayed)
+            self.__stats[self.__enqueue(entry)].submitted += 1
+        if self.__delayed:
+            return self.__delayed[0][0] - now
+        return None
+
+    def __enqueue(self, entry: _Entry) -> SolvePriority:
+        if self.__foreground_key is not None and self.__foreground_key in entry.keys:
+            priority = SolvePriority.FOREGROUND
+            self.__foreground.append(entry)
+        else:
+            priority = SolvePriority.BACKGROUND
+            self.__background.setdefault(entry.keys, deque()).append(entry)
+        stats = self.__stats[priority]
+        stats.depth += 1
+        stats.max_depth = max(stats.max_depth, stats.depth)
+        return priority
+
+    def __next(self) -> tuple[_Entry, SolvePriority] | None:
+        if self.__foreground:
+            return self.__foreground.popleft(), SolvePriority.FOREGROUND
+        # background work leaves workers free for the foreground
+        limit = self.__max_workers
+        if self.__foreground_key is not None:
+            limit = max(limit - self.__foreground_reserve, 1)
+        if self.__background and self.__running_background < limit:
+            keys, queue = self.__background.popitem(last=False)
+            entry = queue.popleft()
+            if queue:
+                self.__background[keys] = queue
+            self.__running_background += 1
+            return entry, SolvePriority.BACKGROUND
+        return None
+
+    def __work(self):
+        while True:
+            with self.__condition:
+                self.__idle += 1
+                while True:
+                    timeout = self.__release_delayed()
+                    if (item := self.__next()) is not None:
+                        break
+                    self.__condition.wait(timeout)
+                self.__idle -= 1
+                entry, priority = item
+                wait = time.monotonic() - entry.time
+                stats = self.__stats[priority]
+                stats.depth -= 1
+                stats.started += 1
+                stats.max_wait = max(stats.max_wait, wait)
+                self.__total_wait[priority] += wait
+
+            if entry.future.set_running_or_notify_cancel():
+                try:
+                    result = entry.func(*entry.args)
+                except BaseException as e:
+                    entry.future.set_exception(e)
+                else:
+                    entry.future.set_result(result)
+
+            with self.__condition:
+                stats.completed += 1
+                if priority == SolvePriority.BACKGROUND:
+                    self.__running_background -= 1
+                    self.__condition.notify()
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+from threading import Lock
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class SharedArrayHandle:
+    name: str
+    offset: int
+    shape: tuple[int, ...]
+    dtype: str
+
+
+class SharedBufferPool:
+    __segment_size: int
+    __min_slot_size: int
+    __segments: dict[str, SharedMemory]
+    __free_slots: dict[int, list[tuple[str, int]]]
+    __slot_sizes: dict[tuple[str, int], int]
+    __refs: dict[tuple[str, int], int]
+    __lock: Lock
+
+    def __init__(self, segment_size: int = 2**26, min_slot_size: int = 2**12):
+        self.__segment_size = segment_size
+        self.__min_slot_size = min_slot_size
+        self.__segments = {}
+        self.__free_slots = {}
+        self.__slot_sizes = {}
+        self.__refs = {}
+        self.__lock = Lock()
+
+    def write(self, array: np.ndarray) -> SharedArrayHandle:
+        array = np.ascontiguousarray(array)
+        with self.__lock:
+            name, offset = self.__allocate(array.nbytes)
+            self.__refs[(name, offset)] = 1
+            segment = self.__segments[name]
+        handle = SharedArrayHandle(name, offset, array.shape, array.dtype.str)
+        view = np.ndarray(
+            array.shape, dtype=array.dtype, buffer=segment.buf, offset=offset
+        )
+        view[...] = array
+        return handle
+
+    def acquire(self, handle: SharedArrayHandle):
+        with self.__lock:
+            self.__refs[(handle.name, handle.offset)] += 1
+
+    def release(self, handle: SharedArrayHandle):
+        slot = (handle.name, handle.offset)
+        with self.__lock:
+            self.__refs[slot] -= 1
+            if self.__refs[slot] > 0:
+                return
+            del self.__refs[slot]
+            self.__free_slots[self.__slot_sizes[slot]].append(slot)
+
+    def get_nbytes(self) -> int:
+        with self.__lock:
+            return sum(segment.size for segment in self.__segments.values())
+
+    def get_used_slots(self) -> int:
+        with self.__lock:
+            return len(self.__refs)
+
+    def close(self):
+        with self.__lock:
+            for segment in self.__segments.values():
+                segment.close()
+                segment.unlink()
+            self.__segments = {}
+            self.__free_slots = {}
+            self.__slot_sizes = {}
+            self.__refs = {}
+
+    def __allocate(self, nbytes: int) -> tuple[str, int]:
+        slot_size = self.__min_slot_size
+        while slot_size < nbytes:
+            slot_size *= 2
+        free_slots = self.__free_slots.setdefault(slot_size, [])
+        if not free_slots:
+            self.__add_segment(slot_size)
+        return free_slots.pop()
+
+    def __add_segment(self, slot_size: int):
+        segment = SharedMemory(create=True, size=max(self.__segment_size, slot_size))
+        self.__segments[segment.name] = segment
+        slots = [
+            (segment.name, offset)
+            for offset in range(0, segment.size - slot_size + 1, slot_size)
+        ]
+        for slot in slots:
+            self.__slot_sizes[slot] = slot_size
+        self.__free_slots[slot_size].extend(reversed(slots))
+
+
+_attached_segments: dict[str, SharedMemory] = {}
+
+
+def _attach(name: str) -> SharedMemory:
+    try:
+        return SharedMemory(name=name, track=False)  # type: ignore
+    except TypeError:
+        # python < 3.13 always tracks the attached segment
+        return SharedMemory(name=name)
+
+
+def open_shared_array(handle: SharedArrayHandle) -> np.ndarray:
+    if handle.name not in _attached_segments:
+        _attached_segments[handle.name] = _attach(handle.name)
+    segment = _attached_segments[handle.name]
+    array = np.ndarray(
+        handle.shape,
+        dtype=np.dtype(handle.dtype),
+        buffer=segment.buf,
+        offset=handle.offset,
+    )
+    array.flags.writeable = False
+    return array
@@ -1,9 +1,15 @@
 from .async_pipe import AsyncConnection, AsyncPipe, AsyncQueue
+from .func_batch import BatchSender, FuncBatch
+from .func_codec import CodecError, FuncCodec
 from .function_data import FuncData
 
 __all__ = [
     "AsyncConnection",
     "AsyncPipe",
     "AsyncQueue",
+    "BatchSender",
+    "CodecError",
+    "FuncBatch",
+    "FuncCodec",
     "FuncData",
 ]
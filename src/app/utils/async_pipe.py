@@ -1,21 +1,71 @@
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Pipe, Queue
 from multiprocessing.connection import Connection
-from typing import Any
+from multiprocessing.reduction import ForkingPickler
+from threading import Thread
+from typing import Any, Callable
+
+
+class _AsyncReader:
+    __read: Callable[[], Any]
+    __queue: asyncio.Queue | None
+    __error: BaseException | None
+
+    def __init__(self, read: Callable[[], Any]):
+        self.__read = read
+        self.__queue = None
+        self.__error = None
+
+    async def get(self):
+        if self.__queue is None:
+            self.__start(asyncio.get_running_loop())
+        value = await self.__queue.get()  # type: ignore
+        if self.__error is not None and value is self.__error:
+            self.__queue.put_nowait(value)  # type: ignore
+            raise value
+        return value
+
+    def qsize(self) -> int:
+        # values already moved from the pipe by the reader thread
+        return 0 if self.__queue is None else self.__queue.qsize()
+
+    def __start(self, loop: asyncio.AbstractEventLoop):
+        # one blocking reader per endpoint for the whole process lifetime
+        self.__queue = asyncio.Queue()
+        Thread(target=self.__run, args=(loop, self.__queue), daemon=True).start()
+
+    def __run(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        while True:
+            try:
+                value = self.__read()
+            except (EOFError, OSError) as e:
+                self.__error = e
+                value = e
+            try:
+                loop.call_soon_threadsafe(queue.put_nowait, value)
+            except RuntimeError:
+                # event loop closed
+                return
+            if self.__error is not None:
+                return
 
 
 class AsyncConnection:
     def __init__(self, conn: Connection):
         self.__conn = conn
+        self.__reader = _AsyncReader(conn.recv_bytes)
 
     def send(self, value: Any):
-        self.__conn.send(value)
+        self.send_bytes(ForkingPickler.dumps(value))
+
+    def send_bytes(self, data: bytes):
+        self.__conn.send_bytes(data)
 
     async def recv(self):
-        executor = ThreadPoolExecutor(max_workers=1)
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(executor, self.__conn.recv)
+        return ForkingPickler.loads(await self.recv_bytes())
+
+    async def recv_bytes(self) -> bytes:
+        return await self.__reader.get()
 
 
 def AsyncPipe():
@@ -26,17 +76,16 @@ def AsyncPipe():
 class AsyncQueue:
     def __init__(self):
         self.__queue = Queue()
+        self.__reader = _AsyncReader(self.__queue.get)
 
     def put(self, value: Any):
         self.__queue.put(value)
 
     async def get(self):
-        executor = ThreadPoolExecutor(max_workers=1)
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(executor, self.__queue.get)
+        return await self.__reader.get()
 
     def empty(self):
-        return self.__queue.empty()
+        return self.__queue.empty() and self.__reader.qsize() == 0
 
     def qsize(self):
-        return self.__queue.qsize()
+        return self.__queue.qsize() + self.__reader.qsize()
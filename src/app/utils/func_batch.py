@@ -0,0 +1,67 @@
+import asyncio
+from typing import Hashable, Iterable
+
+from .async_pipe import AsyncConnection
+from .func_codec import FuncCodec
+from .function_data import FuncData
+
+
+class FuncBatch:
+    __funcs: dict[Hashable, FuncData]
+    __count: int
+
+    def __init__(self):
+        self.__funcs = {}
+        self.__count = 0
+
+    def add(self, func: FuncData):
+        # calls to the same function with the same key replace each other
+        if func.key is None:
+            key = self.__count
+            self.__count += 1
+        else:
+            key = (func.func, func.key)
+            self.__funcs.pop(key, None)
+        self.__funcs[key] = func
+
+    def extend(self, funcs: Iterable[FuncData]):
+        for func in funcs:
+            self.add(func)
+
+    def pop_all(self) -> list[FuncData]:
+        funcs = list(self.__funcs.values())
+        self.__funcs = {}
+        return funcs
+
+    def __len__(self) -> int:
+        return len(self.__funcs)
+
+
+class BatchSender:
+    __conn: AsyncConnection
+    __codec: FuncCodec
+    __batch: FuncBatch
+    __scheduled: bool
+
+    def __init__(self, conn: AsyncConnection, codec: FuncCodec):
+        self.__conn = conn
+        self.__codec = codec
+        self.__batch = FuncBatch()
+        self.__scheduled = False
+
+    def send(self, func: FuncData):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.__conn.send_bytes(self.__codec.encode([func]))
+            return
+        self.__batch.add(func)
+        if not self.__scheduled:
+            self.__scheduled = True
+            loop.call_soon(self.flush)
+
+    def flush(self):
+        self.__scheduled = False
+        funcs = self.__batch.pop_all()
+        if funcs:
+            self.__conn.send_bytes(self.__codec.encode(funcs))
@@ -0,0 +1,405 @@
+import pickle
+import struct
+from datetime import datetime
+from types import FunctionType
+from typing import Any, Callable
+
+import numpy as np
+
+from ...algorithm import PlotData, RasterFigure
+from ...algorithm.param import (
+    FloatType,
+    IntType,
+    NotSpecificChecker,
+    Param,
+    RangeChecker,
+    SpecificChecker,
+    StepChecker,
+    StrType,
+)
+from ...clients.message_manager import Message, MessageLevel
+from .function_data import FuncData
+
+CODEC_MAGIC = b"FC"
+CODEC_VERSION = 1
+
+_HEADER = struct.Struct("<2sBI")  # magic, version, record count
+_RECORD = struct.Struct("<HI")  # opcode, payload size
+_TAG = struct.Struct("<B")
+_INT = struct.Struct("<q")
+_FLOAT = struct.Struct("<d")
+_SIZE = struct.Struct("<I")
+_OPCODE = struct.Struct("<H")
+_RASTER = struct.Struct("<II")
+_MESSAGE_HEADER = struct.Struct("<BdI")  # level, timestamp, text size
+
+# value tags, never renumber
+_NONE = 0
+_FALSE = 1
+_TRUE = 2
+_INT_TAG = 3
+_FLOAT_TAG = 4
+_STR = 5
+_BYTES = 6
+_NDARRAY = 7
+_LIST = 8
+_TUPLE = 9
+_DICT = 10
+_FUNC = 11
+_MESSAGE = 12
+_RASTER_FIGURE = 13
+_PLOT_DATA = 14
+_SET = 15
+_PARAM = 16
+_MESSAGE_LIST = 17
+_PICKLE = 255
+
+# param types and checkers with a schema, never renumber
+_PARAM_TYPES = {IntType: 1, FloatType: 2, StrType: 3}
+_PARAM_CHECKERS = {
+    RangeChecker: 1,
+    StepChecker: 2,
+    SpecificChecker: 3,
+    NotSpecificChecker: 4,
+}
+_MESSAGE_LEVELS = {
+    MessageLevel.INFO: 0,
+    MessageLevel.WARNING: 1,
+    MessageLevel.ERROR: 2,
+    MessageLevel.CRITICAL: 3,
+}
+_MESSAGE_LEVEL_VALUES = {code: level for level, code in _MESSAGE_LEVELS.items()}
+_PARAM_TYPE_CLASSES = {code: cls for cls, code in _PARAM_TYPES.items()}
+_PARAM_CHECKER_CLASSES = {code: cls for cls, code in _PARAM_CHECKERS.items()}
+
+
+class CodecError(ValueError):
+    pass
+
+
+class _UnknownOpcodeError(CodecError):
+    pass
+
+
+class FuncCodec:
+    __funcs: dict[int, Callable]
+    __opcodes: dict[Callable, int]
+    __readers: dict[int, Callable[[memoryview, int], tuple[Any, int]]]
+
+    def __init__(self, funcs: dict[int, Callable]):
+        if not all(0 < opcode < 2**16 for opcode in funcs):
+            raise ValueError("Opcodes must be in range 1-65535")
+        self.__funcs = dict(funcs)
+        self.__opcodes = {func: opcode for opcode, func in funcs.items()}
+        if len(self.__opcodes) != len(self.__funcs):
+            raise ValueError("Function registered with multiple opcodes")
+        self.__readers = {
+            _BYTES: self.__read_bytes,
+            _NDARRAY: self.__read_array,
+            _LIST: self.__read_items,
+            _TUPLE: self.__read_tuple,
+            _SET: self.__read_set,
+            _DICT: self.__read_dict,
+            _FUNC: self.__read_func,
+            _MESSAGE: self.__read_message,
+            _MESSAGE_LIST: self.__read_messages,
+            _RASTER_FIGURE: self.__read_raster_figure,
+            _PLOT_DATA: self.__read_plot_data,
+            _PARAM: self.__read_param,
+            _PICKLE: self.__read_pickle,
+        }
+
+    def encode(self, funcs: list[FuncData]) -> bytes:
+        parts: list[bytes] = [_HEADER.pack(CODEC_MAGIC, CODEC_VERSION, len(funcs))]
+        for func in funcs:
+            payload: list[bytes] = []
+            self.__write(payload, func.args)
+            self.__write(payload, func.key)
+            self.__write(payload, func.kwargs)
+            size = sum(len(part) for part in payload)
+            parts.append(_RECORD.pack(self.__get_opcode(func.func), size))
+            parts.extend(payload)
+        return b"".join(parts)
+
+    def decode(self, data: bytes) -> list[FuncData]:
+        view = memoryview(data)
+        if len(view) < _HEADER.size:
+            raise CodecError("Message is shorter than the header")
+        magic, version, count = _HEADER.unpack_from(view)
+        if magic != CODEC_MAGIC:
+            raise CodecError(f"Invalid message magic {magic!r}")
+        if version > CODEC_VERSION:
+            raise CodecError(f"Unsupported codec version {version}")
+
+        funcs = []
+        offset = _HEADER.size
+        for _ in range(count):
+            end = offset + _RECORD.size
+            if end <= len(view):
+                opcode, size = _RECORD.unpack_from(view, offset)
+                offset, end = end, end + size
+            if end > len(view):
+                # a truncated message, the records after it cannot be found
+                break
+            record = view[:end]
+            try:
+                func = self.__get_func(opcode)
+                args, position = self.__read(record, offset)
+                key, position = self.__read(record, position)
+                kwargs, position = self.__read(record, position)
+                funcs.append(FuncData(func, args, kwargs, key))
+            except (CodecError, struct.error):
+                # e.g. an opcode or value tag of a newer peer, records are
+                # size-prefixed so the rest of the batch is still readable
+                pass
+            offset = end
+        return funcs
+
+    def __get_opcode(self, func: Callable) -> int:
+        if func not in self.__opcodes:
+            raise CodecError(f"Function {func!r} has no opcode")
+        return self.__opcodes[func]
+
+    def __get_func(self, opcode: int) -> Callable:
+        if opcode not in self.__funcs:
+            raise _UnknownOpcodeError(f"Unknown opcode {opcode}")
+        return self.__funcs[opcode]
+
+    def __write(self, parts: list[bytes], value: Any):
+        if value is None:
+            parts.append(_TAG.pack(_NONE))
+        elif value is True or value is False:
+            parts.append(_TAG.pack(_TRUE if value else _FALSE))
+        elif type(value) is int and -(2**63) <= value < 2**63:
+            parts.append(_TAG.pack(_INT_TAG) + _INT.pack(value))
+        elif type(value) is float:
+            parts.append(_TAG.pack(_FLOAT_TAG) + _FLOAT.pack(value))
+        elif type(value) is str:
+            self.__write_buffer(parts, _STR, value.encode())
+        elif type(value) is bytes:
+            self.__write_buffer(parts, _BYTES, value)
+        elif type(value) is np.ndarray and not value.dtype.hasobject:
+            self.__write_array(parts, value)
+        elif (
+            type(value) is list
+            and value
+            and all(type(item) is Message for item in value)
+        ):
+            self.__write_messages(parts, value)
+        elif type(value) in (list, tuple):
+            tag = _LIST if type(value) is list else _TUPLE
+            parts.append(_TAG.pack(tag) + _SIZE.pack(len(value)))
+            for item in value:
+                self.__write(parts, item)
+        elif type(value) is set:
+            parts.append(_TAG.pack(_SET) + _SIZE.pack(len(value)))
+            for item in value:
+                self.__write(parts, item)
+        elif type(value) is dict:
+            parts.append(_TAG.pack(_DICT) + _SIZE.pack(len(value)))
+            for key, item in value.items():
+                self.__write(parts, key)
+                self.__write(parts, item)
+        elif type(value) is FunctionType and value in self.__opcodes:
+            parts.append(_TAG.pack(_FUNC) + _OPCODE.pack(self.__opcodes[value]))
+        elif type(value) is Message:
+            # messages come in hundreds, one fixed header instead of tagged fields
+            text = value.text.encode()
+            level = _MESSAGE_LEVELS[value.level]
+            header = _MESSAGE_HEADER.pack(level, value.time.timestamp(), len(text))
+            parts.append(_TAG.pack(_MESSAGE) + header)
+            parts.append(text)
+        elif type(value) is RasterFigure:
+            parts.append(_TAG.pack(_RASTER_FIGURE))
+            self.__write(parts, value.format)
+            parts.append(_RASTER.pack(value.width, value.height))
+            self.__write(parts, value.data)
+        elif type(value) is PlotData:
+            parts.append(_TAG.pack(_PLOT_DATA))
+            self.__write(parts, value.lines)
+            self.__write(parts, value.image)
+        elif type(value) is Param and self.__has_param_schema(value):
+            self.__write_param(parts, value)
+        else:
+            # objects without a schema, e.g. matplotlib figures
+            self.__write_buffer(parts, _PICKLE, pickle.dumps(value, protocol=5))
+
+    @staticmethod
+    def __write_messages(parts: list[bytes], messages: list[Message]):
+        # message logs come in hundreds, the headers are packed back to back
+        texts = [message.text.encode() for message in messages]
+        parts.append(_TAG.pack(_MESSAGE_LIST) + _SIZE.pack(len(messages)))
+        parts.extend(
+            _MESSAGE_HEADER.pack(
+                _MESSAGE_LEVELS[message.level], message.time.timestamp(), len(text)
+            )
+            for message, text in zip(messages, texts)
+        )
+        parts.extend(texts)
+
+    @staticmethod
+    def __has_param_schema(param: Param) -> bool:
+        return type(param.get_type()) in _PARAM_TYPES and all(
+            type(checker) in _PARAM_CHECKERS for checker in param.get_checkers()
+        )
+
+    def __write_param(self, parts: list[bytes], param: Param):
+        checkers = param.get_checkers()
+        parts.append(
+            _TAG.pack(_PARAM) + _TAG.pack(_PARAM_TYPES[type(param.get_type())])
+        )
+        self.__write(parts, param.get_value())
+        parts.append(_SIZE.pack(len(checkers)))
+        for checker in checkers:
+            parts.append(_TAG.pack(_PARAM_CHECKERS[type(checker)]))
+            self.__write(parts, checker.get_args())
+
+    @staticmethod
+    def __write_buffer(parts: list[bytes], tag: int, buffer: bytes):
+        parts.append(_TAG.pack(tag) + _SIZE.pack(len(buffer)))
+        parts.append(buffer)
+
+    def __write_array(self, parts: list[bytes], array: np.ndarray):
+        array = np.ascontiguousarray(array)
+        parts.append(_TAG.pack(_NDARRAY))
+        self.__write(parts, array.dtype.str)
+        self.__write(parts, array.shape)
+        parts.append(_SIZE.pack(array.nbytes))
+        parts.append(memoryview(array).cast("B"))  # type: ignore
+
+    def __read(self, view: memoryview, offset: int) -> tuple[Any, int]:
+        (tag,) = _TAG.unpack_from(view, offset)
+        offset += _TAG.size
+        # scalars inline, everything else through the reader table
+        if tag == _INT_TAG:
+            return _INT.unpack_from(view, offset)[0], offset + _INT.size
+        if tag == _STR:
+            buffer, offset = self.__read_buffer(view, offset)
+            return str(buffer, "utf-8"), offset
+        if tag == _NONE:
+            return None, offset
+        if tag == _FALSE or tag == _TRUE:
+            return tag == _TRUE, offset
+        if tag == _FLOAT_TAG:
+            return _FLOAT.unpack_from(view, offset)[0], offset + _FLOAT.size
+        reader = self.__readers.get(tag)
+        if reader is None:
+            raise CodecError(f"Unknown value tag {tag}")
+        return reader(view, offset)
+
+    def __read_bytes(self, view: memoryview, offset: int) -> tuple[bytes, int]:
+        buffer, offset = self.__read_buffer(view, offset)
+        return bytes(buffer), offset
+
+    def __read_pickle(self, view: memoryview, offset: int) -> tuple[Any, int]:
+        buffer, offset = self.__read_buffer(view, offset)
+        return pickle.loads(buffer), offset
+
+    def __read_array(self, view: memoryview, offset: int) -> tuple[np.ndarray, int]:
+        dtype, offset = self.__read(view, offset)
+        shape, offset = self.__read(view, offset)
+        buffer, offset = self.__read_buffer(view, offset)
+        return np.frombuffer(buffer, dtype=np.dtype(dtype)).reshape(shape), offset
+
+    def __read_items(self, view: memoryview, offset: int) -> tuple[list, int]:
+        (size,) = _SIZE.unpack_from(view, offset)
+        offset += _SIZE.size
+        items = []
+        for _ in range(size):
+            item, offset = self.__read(view, offset)
+            items.append(item)
+        return items, offset
+
+    def __read_tuple(self, view: memoryview, offset: int) -> tuple[tuple, int]:
+        items, offset = self.__read_items(view, offset)
+        return tuple(items), offset
+
+    def __read_set(self, view: memoryview, offset: int) -> tuple[set, int]:
+        items, offset = self.__read_items(view, offset)
+        return set(items), offset
+
+    def __read_dict(self, view: memoryview, offset: int) -> tuple[dict, int]:
+        (size,) = _SIZE.unpack_from(view, offset)
+        offset += _SIZE.size
+        result = {}
+        for _ in range(size):
+            key, offset = self.__read(view, offset)
+            result[key], offset = self.__read(view, offset)
+        return result, offset
+
+    def __read_func(self, view: memoryview, offset: int) -> tuple[Callable, int]:
+        (opcode,) = _OPCODE.unpack_from(view, offset)
+        return self.__get_func(opcode), offset + _OPCODE.size
+
+    def __read_message(self, view: memoryview, offset: int) -> tuple[Message, int]:
+        level, time, size = _MESSAGE_HEADER.unpack_from(view, offset)
+        offset += _MESSAGE_HEADER.size
+        if offset + size > len(view):
+            raise CodecError("Value exceeds the message size")
+        if level not in _MESSAGE_LEVEL_VALUES:
+            raise CodecError(f"Unknown message level {level}")
+        text = str(view[offset : offset + size], "utf-8")
+        message = Message(
+            text, _MESSAGE_LEVEL_VALUES[level], datetime.fromtimestamp(time)
+        )
+        return message, offset + size
+
+    def __read_messages(
+        self, view: memoryview, offset: int
+    ) -> tuple[list[Message], int]:
+        (count,) = _SIZE.unpack_from(view, offset)
+        offset += _SIZE.size
+        end = offset + count * _MESSAGE_HEADER.size
+        if end > len(view):
+            raise CodecError("Value exceeds the message size")
+        messages = []
+        for level, time, size in _MESSAGE_HEADER.iter_unpack(view[offset:end]):
+            if level not in _MESSAGE_LEVEL_VALUES:
+                raise CodecError(f"Unknown message level {level}")
+            if end + size > len(view):
+                raise CodecError("Value exceeds the message size")
+            text = str(view[end : end + size], "utf-8")
+            end += size
+            messages.append(
+                Message(
+                    text, _MESSAGE_LEVEL_VALUES[level], datetime.fromtimestamp(time)
+                )
+            )
+        return messages, end
+
+    def __read_raster_figure(
+        self, view: memoryview, offset: int
+    ) -> tuple[RasterFigure, int]:
+        format, offset = self.__read(view, offset)
+        width, height = _RASTER.unpack_from(view, offset)
+        data, offset = self.__read(view, offset + _RASTER.size)
+        return RasterFigure(format, width, height, data), offset
+
+    def __read_plot_data(self, view: memoryview, offset: int) -> tuple[PlotData, int]:
+        lines, offset = self.__read(view, offset)
+        image, offset = self.__read(view, offset)
+        return PlotData(lines, image), offset
+
+    def __read_param(self, view: memoryview, offset: int) -> tuple[Param, int]:
+        (type_code,) = _TAG.unpack_from(view, offset)
+        value, offset = self.__read(view, offset + _TAG.size)
+        (count,) = _SIZE.unpack_from(view, offset)
+        offset += _SIZE.size
+        checkers = []
+        for _ in range(count):
+            (checker_code,) = _TAG.unpack_from(view, offset)
+            args, offset = self.__read(view, offset + _TAG.size)
+            if checker_code not in _PARAM_CHECKER_CLASSES:
+                raise CodecError(f"Unknown param checker {checker_code}")
+            checkers.append(_PARAM_CHECKER_CLASSES[checker_code](*args))
+        if type_code not in _PARAM_TYPE_CLASSES:
+            raise CodecError(f"Unknown param type {type_code}")
+        return Param(_PARAM_TYPE_CLASSES[type_code](), value, checkers), offset
+
+    @staticmethod
+    def __read_buffer(view: memoryview, offset: int) -> tuple[memoryview, int]:
+        (size,) = _SIZE.unpack_from(view, offset)
+        offset += _SIZE.size
+        if offset + size > len(view):
+            raise CodecError("Value exceeds the message size")
+        return view[offset : offset + size], offset + size
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Callable
+from typing import Callable, Hashable
 
 
 @dataclass
@@ -7,6 +7,7 @@ class FuncData:
     func: Callable
     args: tuple = field(default_factory=tuple)
     kwargs: dict = field(default_factory=dict)
+    key: Hashable | None = None
 
     def __call__(self, *args, **kwargs):
         self.func(*args, **kwargs)
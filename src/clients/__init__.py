@@ -1,13 +1,16 @@
 from .client import Client
 from .client_manager import ClientExistError, ClientManager
-from .message_manager import MessageManager
+from .message_manager import Message, MessageManager
+from .sample_buffer import SampleRingBuffer
 from .utils.observer import ConditionalObserver, Observer
 
 __all__ = [
     "Client",
     "ClientExistError",
     "ClientManager",
+    "Message",
     "MessageManager",
+    "SampleRingBuffer",
     "ConditionalObserver",
     "Observer",
 ]
@@ -1,5 +1,5 @@
-from copy import deepcopy
-from dataclasses import asdict, dataclass, field
+from copy import copy
+from dataclasses import dataclass, field, fields
 
 from ..algorithm import AlgorithmData, AlgorithmResult
 from ..algorithm.interface import Algorithm, AlgorithmFactory
@@ -23,7 +23,6 @@ class Client(Observable):
     )
 
     # gui parameters
-    msg: str = ""
     algorithm_name: str = ""
     above_figure_name: str | None = None
     below_figure_name: str | None = None
@@ -34,6 +33,7 @@ class Client(Observable):
     need_update: bool = False
 
     __observers = []
+    __frozen = False
 
     @staticmethod
     def __to_list(obj):
@@ -54,25 +54,49 @@ class Client(Observable):
     def detach_all(self):
         self.__observers = []
 
+    def snapshot(self) -> "Client":
+        client = copy(self)
+        object.__setattr__(client, "_Client__observers", [])
+        object.__setattr__(client, "_Client__frozen", True)
+        return client
+
     def notify(self, keys):
+        client = self.snapshot()
+        changed_keys = frozenset(self.__to_list(keys))
         for observer in self.__observers:
-            for key in self.__to_list(keys):
-                client = deepcopy(self)
-                client.detach_all()
-                observer.update(client, key)
+            observer.update(client, changed_keys)
 
     def notify_all(self):
-        for observer in self.__observers:
-            for key in list(asdict(self).keys()):
-                client = deepcopy(self)
-                client.detach_all()
-                observer.update(client, key)
+        self.notify([f.name for f in fields(self)])
+
+    def update(self, data: dict):
+        if self.__frozen:
+            raise AttributeError("Client snapshot is read-only")
+        changed_keys = []
+        for key, value in data.items():
+            if not hasattr(self, key):
+                raise AttributeError(f"Client has no attribute {key}")
+            if self.__is_changed(getattr(self, key), value):
+                object.__setattr__(self, key, value)
+                changed_keys.append(key)
+        if changed_keys:
+            self.notify(changed_keys)
+
+    @staticmethod
+    def __is_changed(old, new) -> bool:
+        try:
+            return bool(old != new)
+        except ValueError:
+            # numpy arrays can not be compared as a whole
+            return True
 
     def __setattr__(self, key, value):
+        if self.__frozen:
+            raise AttributeError("Client snapshot is read-only")
         if not hasattr(self, key) or "__observers" in key:
             super().__setattr__(key, value)
             return
-        if getattr(self, key) != value:
+        if self.__is_changed(getattr(self, key), value):
             super().__setattr__(key, value)
             self.notify(key)
 
@@ -1,5 +1,6 @@
 from copy import deepcopy
-from typing import Any, Callable
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
 
 from .client import Client
 from .utils.observer import Observer
@@ -41,8 +42,7 @@ class ClientManager:
 
     def set_client_data(self, client_id: int, data: dict):
         self.__check_client_exist(client_id)
-        for key, value in data.items():
-            self.__client_map[client_id][key] = value
+        self.__client_map[client_id].update(data)
 
     def get_client_data(self, client_id: int, key: str):
         self.__check_client_exist(client_id)
@@ -54,6 +54,15 @@ class ClientManager:
         client.detach_all()
         return client
 
+    def get_client_snapshot(self, client_id: int) -> Client:
+        self.__check_client_exist(client_id)
+        return self.__client_map[client_id].snapshot()
+
+    def get_client_fields(self, client_id: int, keys: list[str]) -> Mapping[str, Any]:
+        self.__check_client_exist(client_id)
+        client = self.__client_map[client_id]
+        return MappingProxyType({key: client[key] for key in keys})
+
     def is_client_exists(self, client_id: int) -> bool:
         return client_id in self.__client_map
 
@@ -1,5 +1,10 @@
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
 from enum import Enum
-from .client_manager import ClientManager
+from typing import Any, Callable
+
+from .client_manager import ClientExistError, ClientManager
 
 
 class MessageLevel(Enum):
@@ -9,34 +14,58 @@ class MessageLevel(Enum):
     CRITICAL = "CRITICAL"
 
 
+@dataclass(frozen=True)
+class Message:
+    text: str
+    level: MessageLevel = MessageLevel.INFO
+    time: datetime = field(default_factory=datetime.now)
+
+    def __str__(self) -> str:
+        return f"[{self.level.name}] {self.text}"
+
+
 class MessageManager:
     __client_manager: ClientManager | None
     __max_lines: int
+    __messages: dict[int, deque[Message]]
+    __add_message_hook: Callable[[int, Message], Any]
 
     def __init__(
-        self, client_manager: ClientManager | None = None, max_lines: int = 500
+        self,
+        client_manager: ClientManager | None = None,
+        max_lines: int = 500,
+        add_message_hook: Callable[[int, Message], Any] = lambda client_id, msg: None,
     ):
         self.__client_manager = client_manager
         self.__max_lines = max_lines
+        self.__messages = {}
+        self.__add_message_hook = add_message_hook
 
     def set_client_manager(self, client_manager: ClientManager):
         self.__client_manager = client_manager
 
+    def set_add_message_hook(self, hook: Callable[[int, Message], Any]):
+        self.__add_message_hook = hook
+
     def add_message(
         self, client_id: int, msg: str, level: MessageLevel = MessageLevel.INFO
     ):
         if self.__client_manager is None:
             raise ValueError("Client manager is not set")
+        if not self.__client_manager.is_client_exists(client_id):
+            raise ClientExistError("Client does not exist")
+
+        if client_id not in self.__messages:
+            self.__messages[client_id] = deque(maxlen=self.__max_lines)
+        message = Message(msg, level)
+        self.__messages[client_id].append(message)
+        self.__add_message_hook(client_id, message)
+
+    def get_messages(self, client_id: int) -> list[Message]:
+        return list(self.__messages.get(client_id, ()))
+
+    def get_max_lines(self) -> int:
+        return self.__max_lines
 
-        old_msg = self.__client_manager.get_client_data(client_id, "msg")
-        new_msg = self.__generate_msg(level, old_msg, msg)
-        self.__client_manager.set_client_data(client_id, {"msg": new_msg})
-
-    def __generate_msg(self, level: MessageLevel, old_msg: str, new_msg: str) -> str:
-        new_msg = f"[{level.name}] {new_msg}"
-        if old_msg == "":
-            return new_msg
-        split_msg = old_msg.split("\n")
-        if len(split_msg) >= self.__max_lines:
-            split_msg = split_msg[1:]
-        return "\n".join(split_msg) + "\n" + new_msg
+    def remove_client(self, client_id: int):
+        self.__messages.pop(client_id, None)
@@ -0,0 +1,76 @@
+import numpy as np
+
+
+class SampleRingBuffer:
+    __buffer: np.ndarray
+    __window_length: int
+    __hop: int
+    __head: int
+    __size: int
+    __pending: int
+    __total: int
+
+    def __init__(self, window_length: int, hop: int, dtype: np.dtype):
+        self.resize(window_length, hop, dtype)
+
+    def resize(self, window_length: int, hop: int, dtype: np.dtype):
+        if window_length <= 0 or hop <= 0:
+            raise ValueError("Window length and hop must be positive")
+        # samples are written twice, so any window is a contiguous slice
+        self.__buffer = np.zeros(2 * window_length, dtype=dtype)
+        self.__window_length = window_length
+        self.__hop = hop
+        self.clear()
+
+    def clear(self):
+        self.__head = 0
+        self.__size = 0
+        self.__pending = 0
+        self.__total = 0
+
+    def append(self, samples: np.ndarray) -> bool:
+        capacity = self.__window_length
+        count = len(samples)
+        if count > capacity:
+            raise ValueError(
+                f"{count} samples do not fit in a window of {capacity} samples"
+            )
+        self.__total += count
+        self.__pending += count
+
+        first = min(count, capacity - self.__head)
+        rest = count - first
+        head = self.__head
+        self.__buffer[head : head + first] = samples[:first]
+        self.__buffer[head + capacity : head + capacity + first] = samples[:first]
+        self.__buffer[:rest] = samples[first:]
+        self.__buffer[capacity : capacity + rest] = samples[first:]
+
+        self.__head = (head + count) % capacity
+        self.__size = min(self.__size + count, capacity)
+        return self.is_window_ready()
+
+    def is_window_ready(self) -> bool:
+        return self.__size == self.__window_length and self.__pending >= self.__hop
+
+    def get_window(self) -> np.ndarray:
+        if self.__size < self.__window_length:
+            raise ValueError("Not enough samples for a window")
+        self.__pending = 0
+        end = self.__head + self.__window_length
+        # a copy, appends that do not publish would overwrite a view
+        window = self.__buffer[end - self.__window_length : end].copy()
+        window.flags.writeable = False
+        return window
+
+    def get_window_length(self) -> int:
+        return self.__window_length
+
+    def get_hop(self) -> int:
+        return self.__hop
+
+    def get_total(self) -> int:
+        return self.__total
+
+    def get_nbytes(self) -> int:
+        return self.__buffer.nbytes
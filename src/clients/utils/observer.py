@@ -17,7 +17,7 @@ class Observable(metaclass=ABCMeta):
 
 class Observer(metaclass=ABCMeta):
     @abstractmethod
-    def update(self, observable, key):
+    def update(self, observable, keys: frozenset):
         pass
 
 
@@ -26,6 +26,6 @@ class ConditionalObserver(Observer):
         self.__condition = condition
         self.__update = update
 
-    def update(self, observable, key):
-        if self.__condition(observable, key):
-            self.__update(observable, key)
+    def update(self, observable, keys: frozenset):
+        if self.__condition(observable, keys):
+            self.__update(observable, keys)
@@ -0,0 +1,206 @@
+from typing import Any, Callable
+
+import numpy as np
+from PySide6.QtGui import QImage, QPainter
+from matplotlib.axes import Axes
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+from matplotlib.image import AxesImage
+from matplotlib.lines import Line2D
+
+from ..algorithm import PlotData, PlotLayout, RasterFigure
+
+
+def _decimate(x: np.ndarray, y: np.ndarray, columns: int):
+    # keep the min and max of every pixel column, which draws the same line
+    count = len(y) // columns
+    if count < 4:
+        return x, y
+    size = count * columns
+    xs = x[:size].reshape(columns, count)
+    ys = y[:size].reshape(columns, count)
+    low, high = ys.argmin(axis=1), ys.argmax(axis=1)
+    order = np.sort(np.stack([low, high], axis=1), axis=1)
+    rows = np.arange(columns)[:, None]
+    return (
+        np.concatenate([xs[rows, order].ravel(), x[size:]]),
+        np.concatenate([ys[rows, order].ravel(), y[size:]]),
+    )
+
+
+class ResultCanvas(FigureCanvas):
+    __raster: QImage | None
+    # a figure drawn into __raster, redrawn when the canvas is resized
+    __result_figure: Figure | None
+    __resize_hook: Callable[[int, int, float], Any]
+    __plot_figure: Figure | None
+    __plot_layout: PlotLayout | None
+    __plot_axes: Axes | None
+    __plot_lines: list[Line2D]
+    __plot_image: AxesImage | None
+    __background: Any
+    __plot_scaled: bool
+
+    def __init__(self):
+        super().__init__()
+        self.__raster = None
+        self.__result_figure = None
+        self.__resize_hook = lambda width, height, dpi: None
+        self.__plot_figure = None
+        self.__plot_layout = None
+        self.__plot_axes = None
+        self.__plot_lines = []
+        self.__plot_image = None
+        self.__background = None
+        self.__plot_scaled = False
+
+    def set_resize_hook(self, hook: Callable[[int, int, float], Any]):
+        self.__resize_hook = hook
+
+    def get_physical_size(self) -> tuple[int, int]:
+        ratio = self.device_pixel_ratio
+        return int(self.width() * ratio), int(self.height() * ratio)
+
+    def set_raster(self, raster: RasterFigure | None):
+        self.__result_figure = None
+        if raster is None:
+            self.__raster = None
+        elif raster.format == "png":
+            self.__raster = QImage.fromData(raster.data, "PNG")
+        else:
+            self.__raster = QImage(
+                raster.data,
+                raster.width,
+                raster.height,
+                QImage.Format.Format_RGBA8888,
+            ).copy()
+        self.update()
+
+    def set_figure(self, figure: Figure):
+        # drawn like a raster, the figure is not attached to this canvas,
+        # so one figure can be shown on both canvases without a copy
+        self.__result_figure = figure
+        self.__raster = self.__draw_figure(figure)
+        self.update()
+
+    def set_plot(self, layout: PlotLayout, data: PlotData):
+        self.__raster = None
+        self.__result_figure = None
+        if self.figure is not self.__plot_figure or layout != self.__plot_layout:
+            self.__build_plot(layout)
+        columns = max(int(self.__plot_axes.bbox.width), 1)  # type: ignore
+        for line, (x, y) in zip(self.__plot_lines, data.lines):
+            line.set_data(*_decimate(np.asarray(x), np.asarray(y), columns))
+        if self.__plot_image is not None and data.image is not None:
+            self.__plot_image.set_data(data.image)
+            if layout.image_clim is None:
+                self.__plot_image.autoscale()
+        if self.__expand_limits(layout) or self.__background is None:
+            self.draw_idle()
+            return
+        # only the artists are redrawn on top of the cached axes background
+        self.restore_region(self.__background)
+        self.__draw_plot_artists()
+        self.blit(self.__plot_axes.bbox)  # type: ignore
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        width, height = self.get_physical_size()
+        if self.__result_figure is not None:
+            self.__raster = self.__draw_figure(self.__result_figure)
+        self.__resize_hook(width, height, self.figure.dpi)
+
+    def paintEvent(self, event):
+        if self.__raster is None:
+            super().paintEvent(event)
+            return
+        painter = QPainter(self)
+        painter.drawImage(self.rect(), self.__raster)
+        painter.end()
+
+    def __draw_figure(self, figure: Figure) -> QImage:
+        width, height = self.get_physical_size()
+        figure.set_size_inches(width / figure.dpi, height / figure.dpi)
+        canvas = FigureCanvasAgg(figure)
+        canvas.draw()
+        width, height = canvas.get_width_height(physical=True)
+        return QImage(
+            canvas.buffer_rgba(), width, height, QImage.Format.Format_RGBA8888
+        ).copy()
+
+    def __build_plot(self, layout: PlotLayout):
+        figure = Figure()
+        width, height = self.get_physical_size()
+        figure.set_size_inches(width / figure.dpi, height / figure.dpi, forward=False)
+        figure.set_canvas(self)
+        self.figure = figure
+
+        axes = figure.subplots()
+        axes.set_title(layout.title)
+        axes.set_xlabel(layout.xlabel)
+        axes.set_ylabel(layout.ylabel)
+        if layout.xlim is not None:
+            axes.set_xlim(*layout.xlim)
+        if layout.ylim is not None:
+            axes.set_ylim(*layout.ylim)
+        lines = [
+            axes.plot([], [], label=label, animated=True)[0] for label in layout.lines
+        ]
+        if any(layout.lines):
+            axes.legend()
+        image = None
+        if layout.image:
+            image = axes.imshow(
+                np.zeros((1, 1)),
+                extent=layout.image_extent,
+                cmap=layout.image_cmap,
+                aspect="auto",
+                origin="lower",
+                animated=True,
+            )
+            if layout.image_clim is not None:
+                image.set_clim(*layout.image_clim)
+        self.mpl_connect("draw_event", self.__on_plot_draw)
+
+        self.__plot_figure = figure
+        self.__plot_layout = layout
+        self.__plot_axes = axes
+        self.__plot_lines = lines
+        self.__plot_image = image
+        self.__background = None
+        self.__plot_scaled = False
+
+    def __expand_limits(self, layout: PlotLayout) -> bool:
+        scalex = layout.xlim is None
+        scaley = layout.ylim is None
+        if not (scalex or scaley) or not self.__plot_lines:
+            return False
+        axes: Axes = self.__plot_axes  # type: ignore
+        axes.relim()
+        data, view = axes.dataLim, axes.viewLim
+        if not np.isfinite(data.bounds).all():
+            return False
+        # grow only, so a steady signal keeps blitting instead of redrawing
+        inside_x = not scalex or view.x0 <= data.x0 and data.x1 <= view.x1
+        inside_y = not scaley or view.y0 <= data.y0 and data.y1 <= view.y1
+        if self.__plot_scaled and inside_x and inside_y:
+            return False
+        if self.__plot_scaled:
+            axes.update_datalim(view.get_points())
+        axes.autoscale_view(scalex=scalex, scaley=scaley)
+        self.__plot_scaled = True
+        return True
+
+    def __on_plot_draw(self, event):
+        if self.figure is not self.__plot_figure:
+            return
+        self.__background = self.copy_from_bbox(self.figure.bbox)
+        self.__draw_plot_artists()
+
+    def __draw_plot_artists(self):
+        axes: Axes = self.__plot_axes  # type: ignore
+        if self.__plot_image is not None:
+            axes.draw_artist(self.__plot_image)
+        for line in self.__plot_lines:
+            axes.draw_artist(line)
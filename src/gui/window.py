@@ -1,23 +1,29 @@
-from copy import deepcopy
 from typing import Any, Callable
 
 from PySide6.QtCore import QTimer, Qt
 from PySide6.QtWidgets import QComboBox, QDialog, QMainWindow, QMessageBox
-from matplotlib.backends.backend_qtagg import FigureCanvasQTAgg as FigureCanvas
 from matplotlib.figure import Figure
 
+from ..algorithm import PlotData, PlotLayout, RasterFigure
 from ..algorithm.param import Param, ParamError
+from ..clients import Message
+from ..clients.message_manager import MessageLevel
+from .canvas import ResultCanvas
 from .param import ParamsWidget
 from .window_ui import Ui_MainWindow
 
 
 class MainWindow(QMainWindow):
-    __aboveFigureCanvas: FigureCanvas
-    __belowFigureCanvas: FigureCanvas
+    __aboveFigureCanvas: ResultCanvas
+    __belowFigureCanvas: ResultCanvas
     __params_widget: ParamsWidget
+    __plot_layouts: dict[str, PlotLayout]
+    # figure names without a layout that were already reported
+    __missing_layouts: set[str]
 
     __client: int | None
     __magnet_distance: int = 1
+    __max_msg_lines: int = 500
 
     __client_change_hook: Callable[[int | None], Any]
     __algorithm_change_hook: Callable[[str], Any]
@@ -25,6 +31,7 @@ class MainWindow(QMainWindow):
     __stop_calculation_hook: Callable[[bool], Any]
     __above_figure_change_hook: Callable[[str], Any]
     __below_figure_change_hook: Callable[[str], Any]
+    __figure_size_change_hook: Callable[[int, int, float], Any]
 
     def __init__(
         self,
@@ -34,28 +41,37 @@ class MainWindow(QMainWindow):
         stop_calculation_hook: Callable[[bool], Any] = lambda state: None,
         above_figure_change_hook: Callable[[str], Any] = lambda figure_name: None,
         below_figure_change_hook: Callable[[str], Any] = lambda figure_name: None,
+        figure_size_change_hook: Callable[
+            [int, int, float], Any
+        ] = lambda width, height, dpi: None,
         magnet_distance: int = 1,
+        max_msg_lines: int = 500,
     ):
 
         super().__init__()
         self.ui = Ui_MainWindow()
         self.__client = None
+        self.__plot_layouts = {}
+        self.__missing_layouts = set()
         self.__magnet_distance = magnet_distance
+        self.__max_msg_lines = max_msg_lines
         self.__client_change_hook = client_change_hook
         self.__algorithm_change_hook = algorithm_change_hook
         self.__backend_calculation_hook = backend_calculation_hook
         self.__stop_calculation_hook = stop_calculation_hook
         self.__above_figure_change_hook = above_figure_change_hook
         self.__below_figure_change_hook = below_figure_change_hook
+        self.__figure_size_change_hook = figure_size_change_hook
 
         self.__init_ui()
         self.__connect()
 
     def __init_ui(self):
         self.ui.setupUi(self)
-        self.__aboveFigureCanvas = FigureCanvas()
-        self.__belowFigureCanvas = FigureCanvas()
+        self.__aboveFigureCanvas = ResultCanvas()
+        self.__belowFigureCanvas = ResultCanvas()
         self.__params_widget = ParamsWidget()
+        self.ui.msgPlainTextEdit.setMaximumBlockCount(self.__max_msg_lines)
         self.ui.centerVerticalLayout.replaceWidget(
             self.ui.aboveFigure, self.__aboveFigureCanvas
         )
@@ -91,6 +107,11 @@ class MainWindow(QMainWindow):
         self.ui.resetParamButton.clicked.connect(
             self.__params_widget.reset_params_widget
         )
+        self.__aboveFigureCanvas.set_resize_hook(
+            lambda width, height, dpi: self.__figure_size_change_hook(
+                width, height, dpi
+            )
+        )
 
     # event handlers
     def __on_client_change(self, index: int):
@@ -133,18 +154,22 @@ class MainWindow(QMainWindow):
 
     def __on_above_figure_change(self, index: int):
         if index == -1:
-            self.__set_above_figure(Figure())
+            self.__set_above_figure("", Figure())
             return
         figure_name = self.ui.aboveFigureComboBox.itemText(index)
-        self.__set_above_figure(self.ui.aboveFigureComboBox.itemData(index))
+        figure = self.ui.aboveFigureComboBox.itemData(index)
+        if figure is not None:
+            self.__set_above_figure(figure_name, figure)
         self.__above_figure_change_hook(figure_name)
 
     def __on_below_figure_change(self, index: int):
         if index == -1:
-            self.__set_below_figure(Figure())
+            self.__set_below_figure("", Figure())
             return
         figure_name = self.ui.belowFigureComboBox.itemText(index)
-        self.__set_below_figure(self.ui.belowFigureComboBox.itemData(index))
+        figure = self.ui.belowFigureComboBox.itemData(index)
+        if figure is not None:
+            self.__set_below_figure(figure_name, figure)
         self.__below_figure_change_hook(figure_name)
 
     def __on_params_change_button_click(self):
@@ -189,22 +214,24 @@ class MainWindow(QMainWindow):
     def set_params_change_hook(self, hook: Callable[[dict[str, Param]], Any]):
         self.__params_change_hook = hook
 
+    def set_figure_size_change_hook(self, hook: Callable[[int, int, float], Any]):
+        self.__figure_size_change_hook = hook
+        width, height = self.__aboveFigureCanvas.get_physical_size()
+        hook(width, height, self.__aboveFigureCanvas.figure.dpi)
+
     # setters
-    def set_msg(self, msg: str, scroll_to_bottom: bool = False):
-        check_distance = (
-            self.ui.msgPlainTextEdit.verticalScrollBar().maximum()
-            - self.ui.msgPlainTextEdit.verticalScrollBar().value()
-            < MainWindow.__magnet_distance
-        )
-        if scroll_to_bottom or check_distance:
-            self.ui.msgPlainTextEdit.setPlainText(msg)
-            self.ui.msgPlainTextEdit.verticalScrollBar().setValue(
-                self.ui.msgPlainTextEdit.verticalScrollBar().maximum()
-            )
-        else:
-            value = self.ui.msgPlainTextEdit.verticalScrollBar().value()
-            self.ui.msgPlainTextEdit.setPlainText(msg)
-            self.ui.msgPlainTextEdit.verticalScrollBar().setValue(value)
+    def set_msg(self, messages: list[Message]):
+        self.ui.msgPlainTextEdit.setPlainText("\n".join(map(str, messages)))
+        scroll_bar = self.ui.msgPlainTextEdit.verticalScrollBar()
+        scroll_bar.setValue(scroll_bar.maximum())
+
+    def append_msg(self, messages: list[Message]):
+        scroll_bar = self.ui.msgPlainTextEdit.verticalScrollBar()
+        value = scroll_bar.value()
+        at_bottom = scroll_bar.maximum() - value < self.__magnet_distance
+        for message in messages:
+            self.ui.msgPlainTextEdit.appendPlainText(str(message))
+        scroll_bar.setValue(scroll_bar.maximum() if at_bottom else value)
 
     def set_stop_calculation_state(self, state: bool):
         if state:
@@ -223,61 +250,49 @@ class MainWindow(QMainWindow):
 
     def set_figure_combo_box(
         self,
-        figures: dict[str, Figure],
+        names: list[str],
+        figures: dict[str, Figure | RasterFigure | PlotData],
         above_figure_name: str,
         below_figure_name: str,
         reset: bool = False,
     ):
-        def check_names(figures: dict[str, Figure], names: list[str]) -> bool:
-            new_names = set(figures.keys())
-            old_names = set(names)
-            return new_names == old_names
-
         def get_names(combo_box: QComboBox) -> list[str]:
             return [combo_box.itemText(i) for i in range(combo_box.count())]
 
-        def reset_combo_box(
-            combo_box: QComboBox,
-            figures: dict[str, Figure],
-            figure_name: str,
-        ):
-            combo_box.clear()
-            for name in figures.keys():
-                combo_box.addItem(name, figures[name])
+        def set_combo_box(combo_box: QComboBox, figure_name: str):
+            # figures not on screen are fetched when they are picked
+            combo_box.blockSignals(True)
+            if reset or set(names) != set(get_names(combo_box)):
+                combo_box.clear()
+                for name in names:
+                    combo_box.addItem(name, figures.get(name))
+            else:
+                for index in range(combo_box.count()):
+                    name = combo_box.itemText(index)
+                    combo_box.setItemData(index, figures.get(name))
             combo_box.setCurrentIndex(combo_box.findText(figure_name))
-
-        def update_combo_box(
-            combo_box: QComboBox,
-            figures: dict[str, Figure],
-            figure_name: str,
-            old_figure_name: str,
-        ):
-            for name in figures.keys():
-                combo_box.setItemData(combo_box.findText(name), figures[name])
-            if old_figure_name != figure_name:
-                combo_box.setCurrentIndex(combo_box.findText(figure_name))
-
-        if check_names(figures, get_names(self.ui.aboveFigureComboBox)) and not reset:
-            update_combo_box(
-                self.ui.aboveFigureComboBox,
-                figures,
-                above_figure_name,
-                self.ui.aboveFigureComboBox.currentText(),
-            )
-            self.__refresh_above_figure()
-        else:
-            reset_combo_box(self.ui.aboveFigureComboBox, figures, above_figure_name)
-
-        if check_names(figures, get_names(self.ui.belowFigureComboBox)) and not reset:
-            update_combo_box(
-                self.ui.belowFigureComboBox,
-                figures,
-                below_figure_name,
-                self.ui.belowFigureComboBox.currentText(),
-            )
-            self.__refresh_below_figure()
-        else:
-            reset_combo_box(self.ui.belowFigureComboBox, figures, below_figure_name)
+            combo_box.blockSignals(False)
+
+        set_combo_box(self.ui.aboveFigureComboBox, above_figure_name)
+        self.__refresh_above_figure()
+        set_combo_box(self.ui.belowFigureComboBox, below_figure_name)
+        self.__refresh_below_figure()
+
+    def set_figure(self, name: str, figure: Figure | RasterFigure | PlotData):
+        for combo_box, refresh in [
+            (self.ui.aboveFigureComboBox, self.__refresh_above_figure),
+            (self.ui.belowFigureComboBox, self.__refresh_below_figure),
+        ]:
+            index = combo_box.findText(name)
+            if index == -1:
+                continue
+            combo_box.setItemData(index, figure)
+            if combo_box.currentIndex() == index:
+                refresh()
+
+    def set_plot_layouts(self, layouts: dict[str, PlotLayout]):
+        self.__plot_layouts = layouts
+        self.__missing_layouts = set()
 
     def clear_figure_combo_box(self):
         self.ui.aboveFigureComboBox.clear()
@@ -327,31 +342,39 @@ class MainWindow(QMainWindow):
             self.__client_change_hook(client_id)
 
     def __refresh_above_figure(self):
-        self.__set_above_figure(self.ui.aboveFigureComboBox.currentData())
+        combo_box = self.ui.aboveFigureComboBox
+        self.__set_above_figure(
+            combo_box.currentText(), combo_box.currentData() or Figure()
+        )
 
     def __refresh_below_figure(self):
-        self.__set_below_figure(self.ui.belowFigureComboBox.currentData())
-
-    def __set_above_figure(self, figure: Figure):
-        self.__aboveFigureCanvas.figure = deepcopy(figure)
-        self.__set_figure_size(
-            self.__aboveFigureCanvas.figure,
-            self.__aboveFigureCanvas,
+        combo_box = self.ui.belowFigureComboBox
+        self.__set_below_figure(
+            combo_box.currentText(), combo_box.currentData() or Figure()
         )
-        self.__aboveFigureCanvas.draw_idle()
 
-    def __set_below_figure(self, figure: Figure):
-        self.__belowFigureCanvas.figure = deepcopy(figure)
-        self.__set_figure_size(
-            self.__belowFigureCanvas.figure,
-            self.__belowFigureCanvas,
-        )
-        self.__belowFigureCanvas.draw_idle()
-
-    def __set_figure_size(self, figure: Figure, canvas: FigureCanvas):
-        size = canvas.size()
-        pixel_ratio = canvas.device_pixel_ratio
-        dpi = figure.dpi
-        w = size.width() * pixel_ratio
-        h = size.height() * pixel_ratio
-        figure.set_size_inches(w / dpi, h / dpi, forward=False)
+    def __set_above_figure(self, name: str, figure: Figure | RasterFigure | PlotData):
+        self.__set_canvas_figure(self.__aboveFigureCanvas, name, figure)
+
+    def __set_below_figure(self, name: str, figure: Figure | RasterFigure | PlotData):
+        self.__set_canvas_figure(self.__belowFigureCanvas, name, figure)
+
+    def __set_canvas_figure(
+        self,
+        canvas: ResultCanvas,
+        name: str,
+        figure: Figure | RasterFigure | PlotData,
+    ):
+        if isinstance(figure, PlotData):
+            if name in self.__plot_layouts:
+                canvas.set_plot(self.__plot_layouts[name], figure)
+                return
+            if name not in self.__missing_layouts:
+                self.__missing_layouts.add(name)
+                text = f"Figure {name} has no plot layout and is not shown."
+                self.append_msg([Message(text, MessageLevel.WARNING)])
+            figure = Figure()
+        if isinstance(figure, RasterFigure):
+            canvas.set_raster(figure)
+        else:
+            canvas.set_figure(figure)
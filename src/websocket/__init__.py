@@ -1,4 +1,10 @@
-from .callback import JSONWebSocketCallback, WebSocketCallback, WebSocketData
+from .callback import (
+    FrameWebSocketCallback,
+    JSONWebSocketCallback,
+    WebSocketCallback,
+    WebSocketData,
+)
+from .frame import FrameError, pack_binary_frame, parse_binary_frame
 from .server import WebSocket, WebSocketCallback, WebSocketServer
 
 __all__ = [
@@ -7,4 +13,8 @@ __all__ = [
     "WebSocketCallback",
     "WebSocketServer",
     "JSONWebSocketCallback",
+    "FrameWebSocketCallback",
+    "FrameError",
+    "pack_binary_frame",
+    "parse_binary_frame",
 ]
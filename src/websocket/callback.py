@@ -3,6 +3,8 @@ import json
 
 from websockets import Data as WebSocketData, WebSocketServerProtocol as WebSocket
 
+from .frame import parse_binary_frame
+
 
 class WebSocketCallback(metaclass=ABCMeta):
     @abstractmethod
@@ -28,3 +30,19 @@ class JSONWebSocketCallback(WebSocketCallback):
         if isinstance(data, str):
             return json.loads(data)
         raise ValueError("Data is not a string")
+
+
+class FrameWebSocketCallback(JSONWebSocketCallback):
+    @abstractmethod
+    async def on_receive(self, websocket: WebSocket, data: WebSocketData):
+        pass
+
+    @abstractmethod
+    async def on_close(self, websocket: WebSocket):
+        pass
+
+    @staticmethod
+    def _parse_frame(data: WebSocketData):
+        if isinstance(data, str):
+            return JSONWebSocketCallback._parse_json(data)
+        return parse_binary_frame(data)
@@ -0,0 +1,85 @@
+import json
+import struct
+
+import numpy as np
+
+
+class FrameError(ValueError):
+    pass
+
+
+FRAME_MAGIC = b"BF"
+FRAME_VERSION = 1
+
+# magic, version, dtype code, device_type, cfg length, sample count
+FRAME_HEADER = struct.Struct("<2sBB16sHI")
+# cfg is padded with spaces so the samples start at an aligned offset
+FRAME_ALIGNMENT = 8
+
+FRAME_DTYPES: dict[int, np.dtype] = {
+    0: np.dtype("<u1"),
+    1: np.dtype("<i1"),
+    2: np.dtype("<u2"),
+    3: np.dtype("<i2"),
+    4: np.dtype("<u4"),
+    5: np.dtype("<i4"),
+    6: np.dtype("<f4"),
+    7: np.dtype("<f8"),
+}
+
+
+def _get_dtype_code(dtype: np.dtype) -> int:
+    for code, frame_dtype in FRAME_DTYPES.items():
+        if frame_dtype == dtype:
+            return code
+    raise FrameError(f"Unsupported sample dtype {dtype}")
+
+
+def parse_binary_frame(frame: bytes) -> dict:
+    if len(frame) < FRAME_HEADER.size:
+        raise FrameError("Frame is shorter than header")
+    header = FRAME_HEADER.unpack_from(frame)
+    magic, version, dtype_code, device_type, cfg_len, count = header
+    if magic != FRAME_MAGIC:
+        raise FrameError("Invalid frame magic")
+    if version != FRAME_VERSION:
+        raise FrameError(f"Unsupported frame version {version}")
+    if dtype_code not in FRAME_DTYPES:
+        raise FrameError(f"Unknown sample dtype code {dtype_code}")
+
+    dtype = FRAME_DTYPES[dtype_code]
+    cfg_offset = FRAME_HEADER.size
+    data_offset = cfg_offset + cfg_len
+    if len(frame) != data_offset + count * dtype.itemsize:
+        raise FrameError("Frame length does not match header")
+
+    cfg = frame[cfg_offset:data_offset]
+    try:
+        msg = json.loads(cfg) if cfg.strip() else {}
+        device_type = device_type.rstrip(b"\x00").decode("ascii")
+    except ValueError as e:
+        raise FrameError(f"Invalid frame text: {e}") from e
+    if not isinstance(msg, dict):
+        raise FrameError("Frame config is not an object")
+    msg["device_type"] = device_type
+    msg["data"] = np.frombuffer(frame, dtype=dtype, count=count, offset=data_offset)
+    return msg
+
+
+def pack_binary_frame(device_type: str, cfg: dict, data: np.ndarray) -> bytes:
+    device_type_bytes = device_type.encode("ascii")
+    if len(device_type_bytes) > 16:
+        raise FrameError("Device type is longer than 16 bytes")
+    samples = np.ascontiguousarray(data, dtype=data.dtype.newbyteorder("<"))
+    cfg_bytes = json.dumps(cfg).encode()
+    padding = -(FRAME_HEADER.size + len(cfg_bytes)) % FRAME_ALIGNMENT
+    cfg_bytes += b" " * padding
+    header = FRAME_HEADER.pack(
+        FRAME_MAGIC,
+        FRAME_VERSION,
+        _get_dtype_code(samples.dtype),
+        device_type_bytes,
+        len(cfg_bytes),
+        samples.size,
+    )
+    return header + cfg_bytes + samples.tobytes()
@@ -8,21 +8,37 @@ from .callback import WebSocketCallback
 class WebSocketServer:
     __path: str
     __port: int
+    __max_size: int | None
 
-    def __init__(self, path: str, port: int, callback: WebSocketCallback):
+    def __init__(
+        self,
+        path: str,
+        port: int,
+        callback: WebSocketCallback,
+        max_size: int | None = 2**24,
+    ):
         self.__path = path
         self.__port = port
         self.__callback = callback
+        self.__max_size = max_size
 
     async def run(self):
-        async with websockets.serve(self.__handler, self.__path, self.__port):
+        async with websockets.serve(
+            self.__handler,
+            self.__path,
+            self.__port,
+            max_size=self.__max_size,
+        ):
             await asyncio.Future()
 
     async def __handler(self, websocket: WebSocket):
-        while True:
-            try:
-                message = await websocket.recv()
-            except websockets.ConnectionClosed:
-                await self.__callback.on_close(websocket)
-                break
-            await self.__callback.on_receive(websocket, message)
+        try:
+            while True:
+                try:
+                    message = await websocket.recv()
+                except websockets.ConnectionClosed:
+                    break
+                await self.__callback.on_receive(websocket, message)
+        finally:
+            # an error raised by the callback closes the connection as well
+            await self.__callback.on_close(websocket)
@@ -0,0 +1,49 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Process
+
+from src.app.utils import AsyncConnection, AsyncPipe, FuncData
+
+
+class LegacyAsyncConnection:
+    def __init__(self, conn: AsyncConnection):
+        self.__conn = conn._AsyncConnection__conn  # type: ignore
+
+    async def recv(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(executor, self.__conn.recv)
+
+
+def send(conn: AsyncConnection, count: int):
+    for i in range(count):
+        conn.send(FuncData(print, (i, "message")))
+
+
+async def recv(conn, count: int) -> float:
+    start = time.perf_counter()
+    for _ in range(count):
+        await conn.recv()
+    return time.perf_counter() - start
+
+
+def bench(count: int, legacy: bool) -> float:
+    receiver, sender = AsyncPipe()
+    process = Process(target=send, args=(sender, count))
+    process.start()
+    conn = LegacyAsyncConnection(receiver) if legacy else receiver
+    elapsed = asyncio.run(recv(conn, count))
+    process.join()
+    return count / elapsed
+
+
+if __name__ == "__main__":
+    for count in [1_000, 10_000, 50_000]:
+        legacy = bench(count, True)
+        current = bench(count, False)
+        print(
+            f"{count:>6} messages | "
+            f"executor per recv {legacy:9.0f} msg/s | "
+            f"persistent reader {current:9.0f} msg/s"
+        )
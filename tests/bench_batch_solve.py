@@ -0,0 +1,100 @@
+import time
+from concurrent.futures import Future
+from threading import Event, Lock
+
+import numpy as np
+
+from src.algorithm import Algorithm, AlgorithmData, AlgorithmResult
+from src.algorithm.device.icm20948 import ICM20948AlgorithmFactory
+from src.algorithm.param import Param
+from src.app.solver import AlgorithmSolver
+from src.clients import Client
+
+
+class FeatureAlgorithm(Algorithm):
+    batch_size: int = 1
+
+    def solve(self, data: AlgorithmData, params: dict[str, Param]) -> AlgorithmResult:
+        return self.solve_batch([data], params)[0]
+
+    def solve_batch(
+        self, data: list[AlgorithmData], params: dict[str, Param]
+    ) -> list[AlgorithmResult]:
+        # (clients, axes, samples)
+        frames = np.stack([item.data["data"].T for item in data])
+        centered = frames - frames.mean(axis=2, keepdims=True)
+        power = np.square(centered)
+        rms = np.sqrt(np.mean(power, axis=2))
+        peak = np.abs(centered).max(axis=2)
+        crest = peak / rms
+        kurtosis = np.mean(np.square(power), axis=2) / np.square(np.square(rms))
+        spectrum = np.abs(np.fft.rfft(centered, axis=2))
+        peak_bin = spectrum[..., 1:].argmax(axis=2) + 1
+        bins = spectrum.shape[2]
+        edges = [0, bins // 8, bins // 4, bins // 2]
+        bands = np.add.reduceat(np.square(spectrum), edges, axis=2)
+        features = np.concatenate(
+            [rms, crest, kurtosis, peak_bin, bands.reshape(len(data), -1)], axis=1
+        )
+        return [AlgorithmResult({}, str(row.tolist())) for row in features]
+
+    def get_default_params(self) -> dict[str, Param]:
+        return {}
+
+    def get_batch_size(self) -> int:
+        return self.batch_size
+
+
+def bench(batch_size: int, clients: int, samples: int, rounds: int) -> float:
+    # every window is batched, to show where batching stops paying off
+    solver = AlgorithmSolver(cache_size=0, batch_max_samples=samples)
+    rng = np.random.default_rng(0)
+    client_list = []
+    for client_id in range(1, clients + 1):
+        algorithm = FeatureAlgorithm()
+        algorithm.batch_size = batch_size
+        client_list.append(
+            Client(
+                client_id=client_id,
+                client_name=f"client {client_id}",
+                algorithm_factory=ICM20948AlgorithmFactory(),
+                algorithm=algorithm,
+                algorithm_params={},
+            )
+        )
+
+    lock = Lock()
+    done = Event()
+    remaining = 0
+
+    def callback(future: Future):
+        nonlocal remaining
+        future.result()
+        with lock:
+            remaining -= 1
+            if remaining == 0:
+                done.set()
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        remaining = clients
+        done.clear()
+        for client in client_list:
+            client.algorithm_data = AlgorithmData(
+                {}, {"data": rng.random((samples, 3))}
+            )
+            solver.solve(client, callback)
+        done.wait()
+    return clients * rounds / (time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    for samples in [64, 256, 1_024, 8_192]:
+        single = bench(1, 40, samples, 50)
+        batched = bench(40, 40, samples, 50)
+        print(
+            f"40 clients, {samples:>5} samples | "
+            f"per client {single:9.0f} solves/s | "
+            f"batched {batched:9.0f} solves/s | "
+            f"{batched / single:4.1f}x"
+        )
@@ -0,0 +1,77 @@
+import timeit
+from copy import deepcopy
+
+import numpy as np
+from matplotlib.figure import Figure
+
+from src.algorithm import AlgorithmData, AlgorithmResult
+from src.algorithm.device.icm20948 import (
+    ICM20948AlgorithmFactory,
+    ICM20948TestAlgorithm,
+)
+from src.clients import Client, ClientManager, ConditionalObserver
+
+
+def get_figure(points: int) -> Figure:
+    figure = Figure()
+    x = np.arange(points)
+    figure.subplots().plot(x, np.sin(x / 100))
+    return figure
+
+
+def get_client_manager(observer_count: int) -> ClientManager:
+    observers = [
+        ConditionalObserver(lambda c, keys: "algorithm_data" in keys, lambda c, _: None)
+        for _ in range(observer_count)
+    ]
+    client_manager = ClientManager(default_observers=observers)
+    algorithm = ICM20948TestAlgorithm()
+    client_manager.add_client(
+        Client(
+            client_id=1,
+            client_name="bench",
+            algorithm_factory=ICM20948AlgorithmFactory(),
+            algorithm=algorithm,
+            algorithm_params=algorithm.get_default_params(),
+            algorithm_result=AlgorithmResult(
+                {"spectrum": get_figure(2048), "waveform": get_figure(4000)},
+                "result",
+            ),
+        )
+    )
+    return client_manager
+
+
+def get_algorithm_data(sample_dots: int) -> AlgorithmData:
+    return AlgorithmData(
+        cfg={"accelerate_range": 2, "sample_rate": 4000, "sample_dots": sample_dots},
+        data={"data": np.random.randint(0, 2**16, sample_dots, dtype="<u4")},
+    )
+
+
+def bench(observer_count: int, sample_dots: int, number: int):
+    client_manager = get_client_manager(observer_count)
+    data = [get_algorithm_data(sample_dots) for _ in range(2)]
+    index = iter(range(number * 2))
+
+    def set_client_data():
+        client_manager.set_client_data(1, {"algorithm_data": data[next(index) % 2]})
+
+    client = client_manager.get_client(1)
+
+    def legacy_notify():
+        for _ in range(observer_count):
+            deepcopy(client)
+
+    current = timeit.timeit(set_client_data, number=number) / number * 1000
+    legacy = timeit.timeit(legacy_notify, number=number) / number * 1000
+    print(
+        f"{observer_count} observers, {sample_dots:>6} samples | "
+        f"deepcopy per observer {legacy:8.3f} ms | "
+        f"shared snapshot {current:8.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    for sample_dots in [4_000, 40_000]:
+        bench(5, sample_dots, 50)
@@ -0,0 +1,68 @@
+import timeit
+
+import numpy as np
+
+from src.algorithm.dsp import (
+    FAULTS,
+    BearingGeometry,
+    get_fault_band_index,
+    get_fault_frequencies,
+    get_frequencies,
+)
+
+GEOMETRY = BearingGeometry(ball_count=9, ball_diameter=7.94, pitch_diameter=39.04)
+SAMPLE_RATE = 4000.0
+RPM = 1800.0
+HARMONICS = 5
+SIDEBANDS = 2
+BANDWIDTH = 2.0
+
+
+def masked_fault_energy(power: np.ndarray) -> np.ndarray:
+    # bins and band masks rebuilt for every frame
+    length = (power.shape[-1] - 1) * 2
+    frequencies = get_frequencies(length, SAMPLE_RATE)
+    fault_frequencies = get_fault_frequencies(GEOMETRY, RPM)
+    energy = np.zeros(len(FAULTS))
+    for i, fault in enumerate(FAULTS):
+        fundamental = fault_frequencies.get(fault)
+        spacing = fault_frequencies.get_sideband_spacing(fault)
+        for harmonic in range(1, HARMONICS + 1):
+            for sideband in range(-SIDEBANDS, SIDEBANDS + 1):
+                center = harmonic * fundamental + sideband * spacing
+                mask = np.abs(frequencies - center) <= BANDWIDTH / 2
+                energy[i] += power[mask].sum()
+    return energy
+
+
+def indexed_fault_energy(power: np.ndarray) -> np.ndarray:
+    length = (power.shape[-1] - 1) * 2
+    index = get_fault_band_index(
+        GEOMETRY, RPM, SAMPLE_RATE, length, HARMONICS, SIDEBANDS, BANDWIDTH
+    )
+    return index.get_fault_energy(power)
+
+
+def bench(length: int, number: int):
+    power = np.random.default_rng(0).random(length // 2 + 1)
+    masked = timeit.timeit(lambda: masked_fault_energy(power), number=number)
+    indexed_fault_energy(power)
+    indexed = timeit.timeit(lambda: indexed_fault_energy(power), number=number)
+    masked_us = masked / number * 1e6
+    indexed_us = indexed / number * 1e6
+    print(
+        f"{length:>7} samples | "
+        f"masks per frame {masked_us:9.1f} us | "
+        f"cached index {indexed_us:7.1f} us | "
+        f"x{masked_us / indexed_us:.0f}"
+    )
+
+
+if __name__ == "__main__":
+    for length, number in [
+        (8_192, 50),
+        (32_768, 20),
+        (131_072, 10),
+        (262_144, 5),
+    ]:
+        bench(length, number)
@@ -0,0 +1,49 @@
+import timeit
+
+import numpy as np
+
+from src.adapter import ICM20948Adapter
+
+
+def legacy_convert_from_hex(hex_str: str) -> list[int]:
+    byte_array = bytearray.fromhex(hex_str)
+    return [
+        int.from_bytes(byte_array[i : i + 4], "little")
+        for i in range(0, len(byte_array), 4)
+    ]
+
+
+def get_msg(sample_dots: int) -> dict:
+    samples = np.random.randint(0, 2**16, sample_dots, dtype="<u4")
+    return {
+        "acc_range": 2,
+        "acc_sample_rate": 4000,
+        "acc_sample_dots": sample_dots,
+        "data": samples.tobytes().hex(),
+    }
+
+
+def bench(sample_dots: int, number: int):
+    adapter = ICM20948Adapter()
+    msg = get_msg(sample_dots)
+    legacy = timeit.timeit(lambda: legacy_convert_from_hex(msg["data"]), number=number)
+    vectorized = timeit.timeit(lambda: adapter.get_algorithm_data(msg), number=number)
+    legacy_ms = legacy / number * 1000
+    vectorized_ms = vectorized / number * 1000
+    print(
+        f"{sample_dots:>9} samples | "
+        f"legacy {legacy_ms:9.3f} ms ({sample_dots / legacy_ms / 1000:8.2f} M/s) | "
+        f"vectorized {vectorized_ms:9.3f} ms "
+        f"({sample_dots / vectorized_ms / 1000:8.2f} M/s) | "
+        f"x{legacy_ms / vectorized_ms:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    for sample_dots, number in [
+        (1_000, 200),
+        (10_000, 50),
+        (100_000, 10),
+        (1_000_000, 3),
+    ]:
+        bench(sample_dots, number)
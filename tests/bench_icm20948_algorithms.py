@@ -0,0 +1,49 @@
+import timeit
+
+import numpy as np
+
+from src.adapter import ICM20948Adapter
+from src.algorithm.device.icm20948 import ICM20948AlgorithmFactory
+
+
+def get_msg(sample_dots: int, sample_rate: int = 4000) -> dict:
+    # 1.5 kHz resonance modulated at 37 Hz plus 120 Hz imbalance and noise
+    t = np.arange(sample_dots) / sample_rate
+    rng = np.random.default_rng(0)
+    signal = (
+        (1 + 0.5 * np.sin(2 * np.pi * 37 * t)) * np.sin(2 * np.pi * 1500 * t) * 6000
+        + 2000 * np.sin(2 * np.pi * 120 * t)
+        + rng.normal(0, 500, sample_dots)
+    )
+    samples = signal.astype(np.int16).astype(np.uint16).astype("<u4")
+    return {
+        "acc_range": 2,
+        "acc_sample_rate": sample_rate,
+        "acc_sample_dots": sample_dots,
+        "data": samples,
+    }
+
+
+def bench(sample_dots: int, number: int):
+    data = ICM20948Adapter().get_algorithm_data(get_msg(sample_dots))
+    results = []
+    for name in ICM20948AlgorithmFactory.get_algorithm_names():
+        if name == "Test":
+            continue
+        algorithm = ICM20948AlgorithmFactory.get_algorithm(name)
+        params = algorithm.get_default_params()
+        seconds = timeit.timeit(lambda: algorithm.solve(data, params), number=number)
+        ms = seconds / number * 1000
+        results.append(f"{name} {ms:8.2f} ms ({sample_dots / ms / 1000:6.1f} M/s)")
+    print(f"{sample_dots:>7} samples | " + " | ".join(results))
+
+
+if __name__ == "__main__":
+    for sample_dots, number in [
+        (8_192, 50),
+        (32_768, 20),
+        (65_536, 10),
+        (131_072, 5),
+        (262_144, 3),
+    ]:
+        bench(sample_dots, number)
@@ -0,0 +1,64 @@
+import pickle
+import timeit
+
+import numpy as np
+
+from src.algorithm import PlotData, RasterFigure
+from src.algorithm.device.icm20948 import ICM20948TestAlgorithm
+from src.app.process.process_func import FUNC_CODEC, DataFunc, UIFunc
+from src.app.utils import FuncData
+from src.clients import Message
+
+
+def get_result_batch(points: int) -> list[FuncData]:
+    x = np.linspace(0, 2000, points)
+    figures = {
+        "waveform": RasterFigure("png", 1600, 900, np.random.bytes(60_000)),
+        "spectrum": PlotData(lines=[(x, np.random.rand(points))]),
+    }
+    return [
+        FuncData(
+            UIFunc.set_figure_combo_box,
+            (list(figures.keys()), figures, "waveform", "spectrum"),
+            key=1,
+        ),
+        FuncData(UIFunc.set_result_label, ("RMS 0.12 g, peak 1.3 g",), key=1),
+        FuncData(UIFunc.append_msg, ([Message("Test calculated.")],)),
+    ]
+
+
+def get_control_batch() -> list[FuncData]:
+    params = ICM20948TestAlgorithm().get_default_params()
+    return [
+        FuncData(UIFunc.set_params, (params,), key=1),
+        FuncData(
+            DataFunc.get_client_data,
+            (1, "stop_calculation", UIFunc.set_stop_calculation_state),
+        ),
+        FuncData(
+            UIFunc.append_msg, ([Message(f"Data received {i}.") for i in range(10)],)
+        ),
+    ]
+
+
+def bench(name: str, batch: list[FuncData], number: int):
+    pickled = pickle.dumps(batch)
+    encoded = FUNC_CODEC.encode(batch)
+    pickle_dumps = timeit.timeit(lambda: pickle.dumps(batch), number=number)
+    pickle_loads = timeit.timeit(lambda: pickle.loads(pickled), number=number)
+    codec_encode = timeit.timeit(lambda: FUNC_CODEC.encode(batch), number=number)
+    codec_decode = timeit.timeit(lambda: FUNC_CODEC.decode(encoded), number=number)
+    us = 1_000_000 / number
+    print(
+        f"{name:<22} | pickle {len(pickled):>8} B "
+        f"{pickle_dumps * us:7.1f}/{pickle_loads * us:7.1f} us | "
+        f"codec {len(encoded):>8} B "
+        f"{codec_encode * us:7.1f}/{codec_decode * us:7.1f} us"
+    )
+
+
+if __name__ == "__main__":
+    print("sizes and encode/decode time per batch")
+    bench("control", get_control_batch(), 2_000)
+    for points in [2_048, 65_536]:
+        bench(f"result {points} points", get_result_batch(points), 2_000)
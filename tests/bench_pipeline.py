@@ -0,0 +1,43 @@
+import timeit
+
+from src.adapter import ICM20948Adapter
+from src.algorithm.device.icm20948 import ICM20948DiagnosticsAlgorithm
+from tests.bench_icm20948_algorithms import get_msg
+
+
+def bench(sample_dots: int, number: int):
+    data = ICM20948Adapter().get_algorithm_data(get_msg(sample_dots))
+    composite = ICM20948DiagnosticsAlgorithm()
+    algorithms = composite.get_algorithms()
+    params = {
+        name: algorithm.get_default_params() for name, algorithm in algorithms.items()
+    }
+    composite_params = composite.get_default_params()
+
+    def solve_separately():
+        for name, algorithm in algorithms.items():
+            algorithm.solve(data, params[name])
+
+    solve_separately()
+    separate = timeit.timeit(solve_separately, number=number) / number * 1000
+    shared = (
+        timeit.timeit(lambda: composite.solve(data, composite_params), number=number)
+        / number
+        * 1000
+    )
+    print(
+        f"{sample_dots:>7} samples, {len(algorithms)} algorithms | "
+        f"separate {separate:8.2f} ms | "
+        f"shared stages {shared:8.2f} ms | "
+        f"x{separate / shared:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    for sample_dots, number in [
+        (8_192, 50),
+        (32_768, 20),
+        (131_072, 5),
+        (262_144, 3),
+    ]:
+        bench(sample_dots, number)
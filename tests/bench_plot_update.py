@@ -0,0 +1,72 @@
+import os
+import timeit
+from copy import deepcopy
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+from PySide6.QtWidgets import QApplication
+from matplotlib.figure import Figure
+
+from src.algorithm import PlotData, PlotLayout
+from src.gui.canvas import ResultCanvas
+
+WIDTH, HEIGHT = 3840, 1080
+
+
+def get_spectrum(points: int) -> tuple[np.ndarray, np.ndarray]:
+    x = np.linspace(0, 2000, points)
+    y = 0.05 * np.abs(np.random.randn(points))
+    for peak in [120, 240, 360, 870]:
+        y += 2 * np.exp(-(((x - peak) / 4) ** 2))
+    return x, y
+
+
+def get_canvas(app: QApplication) -> ResultCanvas:
+    canvas = ResultCanvas()
+    canvas.resize(WIDTH, HEIGHT)
+    canvas.show()
+    app.processEvents()
+    return canvas
+
+
+def bench_figure(app: QApplication, points: int, number: int) -> float:
+    canvas = get_canvas(app)
+
+    def update():
+        figure = Figure()
+        figure.subplots().plot(*get_spectrum(points))
+        canvas.figure = deepcopy(figure)
+        canvas.figure.set_size_inches(
+            WIDTH / figure.dpi, HEIGHT / figure.dpi, forward=False
+        )
+        canvas.draw()
+        canvas.repaint()
+
+    update()
+    return timeit.timeit(update, number=number) / number * 1000
+
+
+def bench_plot(app: QApplication, points: int, number: int) -> float:
+    canvas = get_canvas(app)
+    layout = PlotLayout(title="spectrum", xlim=(0, 2000), ylim=(0, 5), lines=("x",))
+
+    def update():
+        canvas.set_plot(layout, PlotData(lines=[get_spectrum(points)]))
+        app.processEvents()
+
+    update()
+    update()
+    return timeit.timeit(update, number=number) / number * 1000
+
+
+if __name__ == "__main__":
+    app = QApplication([])
+    for points in [2_048, 16_384, 131_072]:
+        figure = bench_figure(app, points, 10)
+        plot = bench_plot(app, points, 10)
+        print(
+            f"{points:>7} points, {WIDTH}x{HEIGHT} | "
+            f"new figure {figure:8.2f} ms | "
+            f"blitted plot {plot:8.2f} ms"
+        )
@@ -0,0 +1,86 @@
+import time
+from concurrent.futures import Future
+from dataclasses import replace
+from threading import Lock
+
+import numpy as np
+
+from src.adapter import ICM20948Adapter
+from src.algorithm import SolverBackend
+from src.algorithm.device.icm20948 import (
+    ICM20948AlgorithmFactory,
+    ICM20948StatisticsAlgorithm,
+)
+from src.app.solver import AlgorithmSolver
+from src.clients import Client
+from tests.bench_icm20948_algorithms import get_msg
+
+
+class ProcessStatisticsAlgorithm(ICM20948StatisticsAlgorithm):
+    def get_backend(self) -> SolverBackend | None:
+        return SolverBackend.PROCESS
+
+
+def bench(
+    solver: AlgorithmSolver, clients: int, samples: int, rate: float, seconds: float
+) -> str:
+    data = ICM20948Adapter().get_algorithm_data(get_msg(samples))
+    window = data.data["data"]
+    client_list = [
+        Client(
+            client_id=client_id,
+            client_name=f"client {client_id}",
+            algorithm_factory=ICM20948AlgorithmFactory(),
+            algorithm=ProcessStatisticsAlgorithm(),
+            algorithm_params=ProcessStatisticsAlgorithm().get_default_params(),
+        )
+        for client_id in range(1, clients + 1)
+    ]
+
+    lock = Lock()
+    latencies = []
+    submits = []
+
+    def get_callback(start: float):
+        def callback(future: Future):
+            future.result()
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+        return callback
+
+    dropped = solver.get_stats().dropped
+    ticks = int(seconds * rate)
+    begin = time.perf_counter()
+    for tick in range(ticks):
+        # a new window every tick, the result cache never hits
+        frame = window.copy()
+        frame[0] = tick
+        for client in client_list:
+            client.algorithm_data = replace(data, data={**data.data, "data": frame})
+            start = time.perf_counter()
+            solver.solve(client, get_callback(start))
+            submits.append(time.perf_counter() - start)
+        time.sleep(max(begin + (tick + 1) / rate - time.perf_counter(), 0))
+    time.sleep(0.5)
+
+    latencies_ms = np.array(latencies) * 1000
+    dropped = solver.get_stats().dropped - dropped
+    return (
+        f"{clients:>3} clients x {rate:.0f} Hz, {samples} samples | "
+        f"solved {len(latencies) / seconds:6.1f}/{clients * rate:6.1f} per s | "
+        f"dropped {dropped:>4} | "
+        f"latency mean {latencies_ms.mean():7.1f} ms "
+        f"p95 {np.percentile(latencies_ms, 95):7.1f} ms | "
+        f"submit {np.mean(submits) * 1000:5.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    print("process backend, windows passed through shared memory")
+    solver = AlgorithmSolver(cache_size=0)
+    solver.start_process_pool(warm_up_modules=["src.algorithm.device.icm20948"])
+    # the first solves build the DSP cache in each worker
+    bench(solver, 1, 100_000, 10, 1)
+    for clients in [1, 2, 4, 8, 16]:
+        print(bench(solver, clients, 100_000, 10, 5))
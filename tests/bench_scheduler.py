@@ -0,0 +1,90 @@
+import time
+from concurrent.futures import Future
+from threading import Event
+
+import numpy as np
+
+from src.algorithm import Algorithm, AlgorithmData, AlgorithmResult
+from src.algorithm.device.icm20948 import ICM20948AlgorithmFactory
+from src.algorithm.param import Param
+from src.app.solver import AlgorithmSolver
+from src.clients import Client
+
+
+class SleepAlgorithm(Algorithm):
+    # stands for solves that release the GIL, numpy kernels or process workers
+    duration: float = 0.01
+
+    def solve(self, data: AlgorithmData, params: dict[str, Param]) -> AlgorithmResult:
+        time.sleep(self.duration)
+        return AlgorithmResult({}, "")
+
+    def get_default_params(self) -> dict[str, Param]:
+        return {}
+
+
+def bench(background: int, workers: int, prioritize: bool, seconds: float):
+    solver = AlgorithmSolver(cache_size=0, max_workers=workers)
+    rng = np.random.default_rng(0)
+    clients = [
+        Client(
+            client_id=client_id,
+            client_name=f"client {client_id}",
+            algorithm_factory=ICM20948AlgorithmFactory(),
+            algorithm=SleepAlgorithm(),
+            algorithm_params={},
+        )
+        for client_id in range(background + 1)
+    ]
+    foreground = clients[0]
+    solver.set_foreground_client(foreground.client_id if prioritize else None)
+    stop = Event()
+    background_solves = 0
+
+    def solve(client: Client, callback):
+        client.algorithm_data = AlgorithmData({}, {"data": rng.random(16)})
+        solver.solve(client, callback)
+
+    def background_callback(client: Client):
+        def callback(future: Future):
+            nonlocal background_solves
+            future.result()
+            background_solves += 1
+            # background clients keep the queue full
+            if not stop.is_set():
+                solve(client, callback)
+
+        return callback
+
+    for client in clients[1:]:
+        solve(client, background_callback(client))
+
+    latencies = []
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        done = Event()
+        start = time.perf_counter()
+        solve(foreground, lambda _: done.set())
+        done.wait()
+        latencies.append(time.perf_counter() - start)
+        time.sleep(0.02)
+    stop.set()
+
+    latencies_ms = np.array(latencies) * 1000
+    stats = solver.get_scheduler_stats()
+    print(
+        f"{'priority' if prioritize else 'fifo':>8} | "
+        f"foreground mean {latencies_ms.mean():7.1f} ms "
+        f"p95 {np.percentile(latencies_ms, 95):7.1f} ms | "
+        f"background {background_solves / seconds:6.0f} solves/s | "
+        f"queue fg {stats.foreground.max_depth:>3} "
+        f"bg {stats.background.max_depth:>3} | "
+        f"wait fg {stats.foreground.mean_wait * 1000:6.1f} ms "
+        f"bg {stats.background.mean_wait * 1000:6.1f} ms"
+    )
+
+
+if __name__ == "__main__":
+    print("39 background clients, 10 ms solves, 4 workers")
+    bench(39, 4, False, 3)
+    bench(39, 4, True, 3)
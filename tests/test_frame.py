@@ -0,0 +1,82 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.websocket import FrameError, pack_binary_frame, parse_binary_frame
+from src.websocket.frame import FRAME_ALIGNMENT, FRAME_DTYPES, FRAME_HEADER
+
+CFG = {"acc_range": 2, "acc_sample_rate": 1000, "acc_sample_dots": 5}
+
+
+def get_frame(**fields) -> bytes:
+    header = {
+        "magic": b"BF",
+        "version": 1,
+        "dtype_code": 5,
+        "device_type": b"ICM20948",
+        "cfg": b"{}",
+        "count": 2,
+        "data": np.arange(2, dtype="<i4").tobytes(),
+    }
+    header.update(fields)
+    return (
+        FRAME_HEADER.pack(
+            header["magic"],
+            header["version"],
+            header["dtype_code"],
+            header["device_type"],
+            len(header["cfg"]),
+            header["count"],
+        )
+        + header["cfg"]
+        + header["data"]
+    )
+
+
+@pytest.mark.parametrize("dtype", FRAME_DTYPES.values(), ids=str)
+def test_round_trip(dtype: np.dtype):
+    samples = np.arange(5).astype(dtype)
+    msg = parse_binary_frame(pack_binary_frame("ICM20948", CFG, samples))
+    assert msg.pop("device_type") == "ICM20948"
+    data = msg.pop("data")
+    assert msg == CFG
+    assert data.dtype == dtype
+    np.testing.assert_array_equal(data, samples)
+
+
+def test_round_trip_without_cfg():
+    msg = parse_binary_frame(pack_binary_frame("Test", {}, np.zeros(3, "<f8")))
+    assert msg["device_type"] == "Test"
+    np.testing.assert_array_equal(msg["data"], np.zeros(3))
+
+
+@pytest.mark.parametrize("cfg_size", range(FRAME_ALIGNMENT))
+def test_samples_are_aligned(cfg_size: int):
+    frame = pack_binary_frame("ICM20948", {"k": "x" * cfg_size}, np.zeros(4, "<f8"))
+    cfg_len = FRAME_HEADER.unpack_from(frame)[4]
+    assert (FRAME_HEADER.size + cfg_len) % FRAME_ALIGNMENT == 0
+    assert parse_binary_frame(frame)["k"] == "x" * cfg_size
+
+
+@pytest.mark.parametrize(
+    "fields, match",
+    [
+        ({"magic": b"XX"}, "magic"),
+        ({"version": 2}, "version"),
+        ({"dtype_code": 99}, "dtype"),
+        ({"count": 3}, "length"),
+        ({"data": b"\x00"}, "length"),
+        ({"cfg": json.dumps([1, 2]).encode()}, "object"),
+        ({"cfg": b"{"}, "text"),
+        ({"device_type": b"\xff"}, "text"),
+    ],
+)
+def test_invalid_frame(fields: dict, match: str):
+    with pytest.raises(FrameError, match=match):
+        parse_binary_frame(get_frame(**fields))
+
+
+def test_short_frame():
+    with pytest.raises(FrameError, match="shorter"):
+        parse_binary_frame(get_frame()[: FRAME_HEADER.size - 1])
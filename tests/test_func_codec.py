@@ -0,0 +1,78 @@
+import struct
+
+import pytest
+
+from src.algorithm.param import (
+    IntType,
+    Param,
+    ParamError,
+    RangeChecker,
+    SpecificChecker,
+    StrType,
+)
+from src.app.utils import FuncCodec, FuncData
+from src.clients import Message
+
+
+def set_params(params):
+    pass
+
+
+def append_msg(messages):
+    pass
+
+
+CODEC = FuncCodec({1: set_params, 2: append_msg})
+
+
+def test_params_keep_their_checkers():
+    params = {
+        "count": Param(IntType(), 10, [RangeChecker(0, 100)]),
+        "window": Param(StrType(), "hann", [SpecificChecker({"hann", "rect"})]),
+    }
+    (func,) = CODEC.decode(CODEC.encode([FuncData(set_params, (params,))]))
+    decoded = func.args[0]
+    assert decoded["count"].get_value() == 10
+    assert isinstance(decoded["window"].get_type(), StrType)
+    with pytest.raises(ParamError):
+        decoded["count"].set_value(101)
+    with pytest.raises(ParamError):
+        decoded["window"].set_value("blackman")
+
+
+def test_messages_round_trip():
+    messages = [Message("connected"), Message("Spectrum calculated.")]
+    (func,) = CODEC.decode(CODEC.encode([FuncData(append_msg, (messages,))]))
+    assert func.args[0] == messages
+
+
+def test_unknown_value_tag_skips_only_its_record():
+    data = bytearray(
+        CODEC.encode(
+            [
+                FuncData(set_params, ({},)),
+                FuncData(append_msg, ([Message("kept")],)),
+            ]
+        )
+    )
+    # the args tag of the first record, as if sent by a newer peer
+    data[struct.calcsize("<2sBI") + struct.calcsize("<HI")] = 200
+    (func,) = CODEC.decode(bytes(data))
+    assert func.func is append_msg
+    assert func.args[0][0].text == "kept"
+
+
+@pytest.mark.parametrize("cut", ["payload", "record", "header"])
+def test_truncated_message_keeps_complete_records(cut: str):
+    kept = FuncData(append_msg, ([Message("kept")],))
+    truncated = FuncData(append_msg, ([Message("truncated")],))
+    data = CODEC.encode([kept, truncated])
+    # payload of the last record, then its size prefix
+    size = len(CODEC.encode([truncated])) - struct.calcsize("<2sBI")
+    end = {
+        "payload": len(data) - 1,
+        "record": len(data) - size + struct.calcsize("<HI"),
+        "header": len(data) - size + 3,
+    }[cut]
+    (func,) = CODEC.decode(data[:end])
+    assert [message.text for message in func.args[0]] == ["kept"]
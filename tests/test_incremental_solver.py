@@ -0,0 +1,157 @@
+import time
+from concurrent.futures import Future
+from threading import Event
+
+import numpy as np
+
+from src.algorithm import AlgorithmData, AlgorithmResult, IncrementalAlgorithm
+from src.algorithm.device.icm20948 import (
+    ICM20948AlgorithmFactory,
+    ICM20948RunningStatisticsAlgorithm,
+)
+from src.algorithm.dsp import get_statistics
+from src.algorithm.param import IntType, Param
+from src.app.solver import AlgorithmSolver
+from src.clients import Client
+
+
+class RecordingAlgorithm(IncrementalAlgorithm):
+    def __init__(self):
+        self.chunks = []
+        self.resets = 0
+
+    def init_state(self, params: dict[str, Param]) -> list:
+        self.resets += 1
+        return []
+
+    def update(self, state: list, chunk: AlgorithmData, params: dict[str, Param]):
+        self.chunks.append(chunk.data["data"])
+        return state + chunk.data["data"].tolist()
+
+    def render(self, state: list, params: dict[str, Param]) -> AlgorithmResult:
+        return AlgorithmResult({}, str(len(state)))
+
+    def get_default_params(self) -> dict[str, Param]:
+        return {"gain": Param(IntType(), 1)}
+
+
+def get_client(algorithm: IncrementalAlgorithm) -> Client:
+    return Client(
+        client_id=1,
+        client_name="client",
+        algorithm_factory=ICM20948AlgorithmFactory(),
+        algorithm=algorithm,
+        algorithm_params=algorithm.get_default_params(),
+    )
+
+
+def get_window(total: int, length: int = 8) -> AlgorithmData:
+    # the window of a stream after total samples
+    window = np.arange(total - length, total)
+    window.flags.writeable = False
+    return AlgorithmData({"sample_dots": 4}, {"data": window}, sequence=total)
+
+
+def solve(solver: AlgorithmSolver, client: Client, data: AlgorithmData):
+    client.algorithm_data = data
+    done = Event()
+    results: list[Future] = []
+
+    def callback(future: Future):
+        results.append(future)
+        done.set()
+
+    solver.solve(client, callback)
+    assert done.wait(5)
+    return results[0].result()
+
+
+def test_only_new_samples_are_updated():
+    solver = AlgorithmSolver()
+    algorithm = RecordingAlgorithm()
+    client = get_client(algorithm)
+    first = get_window(8)
+    solve(solver, client, first)
+    solve(solver, client, get_window(12))
+    assert algorithm.resets == 1
+    np.testing.assert_array_equal(algorithm.chunks[0], np.arange(8))
+    np.testing.assert_array_equal(algorithm.chunks[1], np.arange(8, 12))
+    # the published window is immutable, the solver does not copy it
+    assert np.shares_memory(algorithm.chunks[0], first.data["data"])
+
+
+def test_repeated_window_is_not_updated():
+    solver = AlgorithmSolver()
+    algorithm = RecordingAlgorithm()
+    client = get_client(algorithm)
+    solve(solver, client, get_window(8))
+    result = solve(solver, client, get_window(8))
+    assert len(algorithm.chunks) == 1
+    assert result.text == "8"
+
+
+def test_gap_longer_than_window_rebuilds_state():
+    solver = AlgorithmSolver()
+    algorithm = RecordingAlgorithm()
+    client = get_client(algorithm)
+    solve(solver, client, get_window(8))
+    result = solve(solver, client, get_window(30))
+    assert algorithm.resets == 2
+    np.testing.assert_array_equal(algorithm.chunks[1], np.arange(22, 30))
+    assert result.text == "8"
+
+
+def test_param_change_rebuilds_state():
+    solver = AlgorithmSolver()
+    algorithm = RecordingAlgorithm()
+    client = get_client(algorithm)
+    solve(solver, client, get_window(8))
+    client.algorithm_params = {"gain": Param(IntType(), 2)}
+    result = solve(solver, client, get_window(12))
+    assert algorithm.resets == 2
+    assert result.text == "8"
+
+
+def test_running_statistics_match_the_whole_stream():
+    rng = np.random.default_rng(0)
+    stream = rng.integers(-3000, 3000, 64).astype(np.int16)
+    solver = AlgorithmSolver()
+    client = get_client(ICM20948RunningStatisticsAlgorithm())
+    for total in range(16, 65, 16):
+        data = AlgorithmData(
+            {"sample_dots": 16, "accelerate_range": 2},
+            {"data": stream[total - 32 if total > 32 else 0 : total]},
+            sequence=total,
+        )
+        result = solve(solver, client, data)
+    statistics = get_statistics(stream * 2 / 2**15)
+    assert result.text.startswith("Samples: 64, ")
+    assert f"kurtosis: {float(statistics.kurtosis):.3f}" in result.text
+
+
+class SlowAlgorithm(RecordingAlgorithm):
+    def __init__(self):
+        super().__init__()
+        self.started = Event()
+
+    def update(self, state: list, chunk: AlgorithmData, params: dict[str, Param]):
+        self.started.set()
+        time.sleep(0.5)
+        return super().update(state, chunk, params)
+
+
+def test_remove_client_does_not_wait_for_the_running_solve():
+    solver = AlgorithmSolver()
+    algorithm = SlowAlgorithm()
+    client = get_client(algorithm)
+    client.algorithm_data = get_window(8)
+    done = Event()
+    solver.solve(client, lambda _: done.set())
+    assert algorithm.started.wait(5)
+    start = time.perf_counter()
+    solver.remove_client(client.client_id)
+    assert time.perf_counter() - start < 0.1
+    assert done.wait(5)
+    # the running solve did not keep the state of the removed client
+    solve(solver, client, get_window(12))
+    assert algorithm.resets == 2
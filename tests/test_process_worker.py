@@ -0,0 +1,14 @@
+import subprocess
+import sys
+
+
+def test_worker_does_not_import_the_gui():
+    # spawn workers import the worker module in a fresh interpreter
+    code = (
+        "import sys, src.app.solver.process_worker\n"
+        "print(sorted(m for m in sys.modules if m.startswith(('PySide6', 'src.gui'))))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
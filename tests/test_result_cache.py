@@ -0,0 +1,75 @@
+from concurrent.futures import Future
+from threading import Event
+
+import numpy as np
+import pytest
+
+from src.algorithm import Algorithm, AlgorithmData, AlgorithmResult
+from src.algorithm.device.icm20948 import ICM20948AlgorithmFactory
+from src.algorithm.param import Param
+from src.app.solver import AlgorithmSolver, ResultCache
+from src.clients import Client
+
+
+class CountingAlgorithm(Algorithm):
+    def __init__(self):
+        self.solves = 0
+
+    def solve(self, data: AlgorithmData, params: dict[str, Param]) -> AlgorithmResult:
+        self.solves += 1
+        return AlgorithmResult({}, str(data.data["data"].sum()))
+
+    def get_default_params(self) -> dict[str, Param]:
+        return {}
+
+
+def get_client(algorithm: Algorithm, samples: np.ndarray) -> Client:
+    return Client(
+        client_id=1,
+        client_name="client",
+        algorithm_factory=ICM20948AlgorithmFactory(),
+        algorithm=algorithm,
+        algorithm_params={},
+        algorithm_data=AlgorithmData({}, {"data": samples}),
+    )
+
+
+def solve(solver: AlgorithmSolver, client: Client) -> list[Future]:
+    # the callback is not called for a result the client already has,
+    # wait until the solver is idle instead
+    results: list[Future] = []
+    solver.solve(client, results.append)
+    idle = Event()
+    for _ in range(500):
+        stats = solver.get_stats()
+        if stats.completed == stats.submitted:
+            idle.set()
+            break
+        idle.wait(0.01)
+    assert idle.is_set()
+    return results
+
+
+def test_same_result_is_not_sent_again():
+    solver = AlgorithmSolver()
+    algorithm = CountingAlgorithm()
+    client = get_client(algorithm, np.arange(8))
+    (first,) = solve(solver, client)
+    assert first.result().text == "28"
+    assert solve(solver, client) == []
+    assert algorithm.solves == 1
+    assert solver.get_cache_stats().hits == 1
+
+
+def test_disabled_cache_does_not_hash_data(monkeypatch: pytest.MonkeyPatch):
+    def get_data_digest(data: AlgorithmData) -> bytes:
+        raise AssertionError("data hashed")
+
+    monkeypatch.setattr(ResultCache, "get_data_digest", get_data_digest)
+    solver = AlgorithmSolver(cache_size=0)
+    algorithm = CountingAlgorithm()
+    client = get_client(algorithm, np.arange(8))
+    (first,) = solve(solver, client)
+    (second,) = solve(solver, client)
+    assert second.result().text == "28"
+    assert algorithm.solves == 2
@@ -0,0 +1,35 @@
+import numpy as np
+import pytest
+
+from src.clients.sample_buffer import SampleRingBuffer
+
+
+def test_window_is_not_overwritten_by_later_appends():
+    buffer = SampleRingBuffer(8, 4, np.dtype(np.int64))
+    assert buffer.append(np.arange(8))
+    window = buffer.get_window()
+    # hop is not reached, the window is not published again
+    assert not buffer.append(np.arange(8, 10))
+    np.testing.assert_array_equal(window, np.arange(8))
+    assert not window.flags.writeable
+
+
+def test_window_follows_hop():
+    buffer = SampleRingBuffer(8, 4, np.dtype(np.int64))
+    assert not buffer.append(np.arange(6))
+    assert buffer.append(np.arange(6, 10))
+    np.testing.assert_array_equal(buffer.get_window(), np.arange(2, 10))
+    assert not buffer.append(np.arange(10, 13))
+    assert buffer.append(np.arange(13, 14))
+    np.testing.assert_array_equal(buffer.get_window(), np.arange(6, 14))
+    assert buffer.get_total() == 14
+
+
+def test_frame_longer_than_window_is_rejected():
+    buffer = SampleRingBuffer(8, 4, np.dtype(np.int64))
+    assert buffer.append(np.arange(8))
+    with pytest.raises(ValueError):
+        buffer.append(np.arange(8, 17))
+    # the buffer is unchanged
+    assert buffer.get_total() == 8
+    np.testing.assert_array_equal(buffer.get_window(), np.arange(8))